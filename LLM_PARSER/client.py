@@ -0,0 +1,487 @@
+import os
+import json
+import time
+import random
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+import metrics
+from LLM_PARSER.json_stream import JSONObjectScanner
+from LLM_PARSER.preflight import count_message_tokens, count_tokens
+from LLM_PARSER.response_cache import LLM_CACHE_ENABLED, ResponseCache, get_response_cache
+from LLM_PARSER.schemas import conforms, response_schema as schema_of
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+LLM_MODEL = os.getenv("LLM_MODEL", "mistralai/Mistral-7B-Instruct-v0.2")
+
+# "huggingface" uses the Hugging Face Inference API; "openai" talks to any
+# OpenAI-compatible chat-completions server at LLM_BASE_URL (e.g. a local stub).
+LLM_BACKEND = os.getenv("LLM_BACKEND", "huggingface")
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "http://127.0.0.1:8080")
+
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "16"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "8"))
+# Stream JSON-returning calls and close the request once the object is complete.
+LLM_STREAMING = os.getenv("LLM_STREAMING", "1") == "1"
+# Pass the expected JSON schema to backends that constrain generation to it.
+LLM_CONSTRAINED_OUTPUT = os.getenv("LLM_CONSTRAINED_OUTPUT", "1") == "1"
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class LLMHTTPError(Exception):
+
+    def __init__(self, status_code: int, message: str, retry_after: float = None):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    pass
+
+
+# Monotonic time by which LLM calls in the current context must finish.
+_call_deadline = contextvars.ContextVar("llm_call_deadline", default=None)
+
+
+@contextmanager
+def call_deadline(seconds: float):
+    """
+    Bound every LLM call made inside the block, retries and backoff
+    included, to `seconds` from now. Nested deadlines keep the earlier one.
+    """
+    deadline = time.monotonic() + seconds
+    current = _call_deadline.get()
+    token = _call_deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _call_deadline.reset(token)
+
+
+def _remaining() -> float:
+    deadline = _call_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _request_timeout() -> float:
+    """
+    HTTP timeout for the next request: LLM_TIMEOUT_SECONDS, cut down to
+    what is left of the call deadline.
+    """
+    remaining = _remaining()
+    if remaining is None:
+        return LLM_TIMEOUT_SECONDS
+    if remaining <= 0:
+        raise LLMDeadlineExceeded("LLM call deadline passed")
+    return min(LLM_TIMEOUT_SECONDS, remaining)
+
+
+def _pooled_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=LLM_POOL_SIZE, pool_maxsize=LLM_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _retry_after(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class HuggingFaceBackend:
+    """
+    Hugging Face Inference API through `InferenceClient`, with the hub's
+    HTTP layer pointed at one pooled keep-alive session.
+    """
+
+    def __init__(self, model: str = LLM_MODEL, token: str = None):
+        from huggingface_hub import InferenceClient
+
+        token = token or os.getenv("HF_TOKEN")
+        if not token:
+            raise RuntimeError("HF_TOKEN not loaded. Check your .env file.")
+
+        try:
+            from huggingface_hub import configure_http_backend
+            session = _pooled_session()
+            configure_http_backend(backend_factory=lambda: session)
+        except ImportError:
+            # Newer hub releases already share one pooled httpx client.
+            pass
+
+        self.model = model
+        self._token = token
+        self._client = InferenceClient(model=model, token=token, timeout=LLM_TIMEOUT_SECONDS)
+
+    def _create(self, messages: list, **params):
+        timeout = _request_timeout()
+        client = self._client
+        if timeout < LLM_TIMEOUT_SECONDS:
+            # The timeout is fixed per client, and clients hold no
+            # connections of their own, so a short one is cheap to build.
+            client = type(self._client)(model=self.model, token=self._token, timeout=timeout)
+        try:
+            return client.chat.completions.create(messages=messages, **params)
+        except Exception as e:
+            response = getattr(e, "response", None)
+            status = getattr(response, "status_code", None)
+            if status is None:
+                raise
+            raise LLMHTTPError(
+                status,
+                str(e),
+                _retry_after(response.headers.get("Retry-After"))
+            ) from e
+
+    def chat(self, messages: list, **params) -> str:
+        return self._create(messages, **params).choices[0].message.content
+
+    def response_format(self, name: str, schema: dict) -> dict:
+        # Text Generation Inference grammar format.
+        return {"type": "json", "value": schema}
+
+    def stream(self, messages: list, **params):
+        """
+        Yield content deltas. Closing the generator closes the response,
+        which cancels generation on the server.
+        """
+        chunks = self._create(messages, stream=True, **params)
+        try:
+            for chunk in chunks:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+
+
+class OpenAICompatibleBackend:
+    """
+    Plain OpenAI-style `/v1/chat/completions` over a pooled session.
+    Used for local inference servers and the load-test stub.
+    """
+
+    def __init__(self, base_url: str = LLM_BASE_URL, model: str = LLM_MODEL, token: str = None):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.token = token or os.getenv("LLM_API_KEY") or os.getenv("HF_TOKEN")
+        self._session = _pooled_session()
+
+    def _post(self, messages: list, stream: bool = False, **params):
+        headers = {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        body = {"model": self.model, "messages": messages, **params}
+        if stream:
+            body["stream"] = True
+
+        response = self._session.post(
+            f"{self.base_url}/v1/chat/completions",
+            json=body,
+            headers=headers,
+            timeout=_request_timeout(),
+            stream=stream
+        )
+        if response.status_code >= 400:
+            try:
+                raise LLMHTTPError(
+                    response.status_code,
+                    response.text[:200],
+                    _retry_after(response.headers.get("Retry-After"))
+                )
+            finally:
+                response.close()
+        return response
+
+    def chat(self, messages: list, **params) -> str:
+        return self._post(messages, **params).json()["choices"][0]["message"]["content"]
+
+    def response_format(self, name: str, schema: dict) -> dict:
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": name, "schema": schema}
+        }
+
+    def stream(self, messages: list, **params):
+        """
+        Yield content deltas from the server-sent event stream. Closing
+        the generator drops the connection, which cancels generation.
+        """
+        response = self._post(messages, stream=True, **params)
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
+        finally:
+            response.close()
+
+
+BACKENDS = {
+    "huggingface": HuggingFaceBackend,
+    "openai": OpenAICompatibleBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    Build the configured backend on first use. Importing the LLM modules
+    therefore needs neither a token nor network access.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if LLM_BACKEND not in BACKENDS:
+                    raise RuntimeError(f"Unknown LLM_BACKEND '{LLM_BACKEND}'.")
+                _backend = BACKENDS[LLM_BACKEND]()
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """
+    Replace the shared backend, e.g. with a stub in tests. Any object with
+    a `model` attribute and a `chat(messages, **params) -> str` method works;
+    an optional `stream(messages, **params)` yielding text enables streaming,
+    and an optional `response_format(name, schema)` constrained output.
+    """
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, LLMHTTPError):
+        return exc.status_code in RETRYABLE_STATUS
+
+    try:
+        import requests
+    except ImportError:
+        return False
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+def _backoff(exc: Exception, attempt: int, stage: str) -> None:
+    metrics.llm_retries.inc(stage=stage)
+    delay = getattr(exc, "retry_after", None)
+    if delay is None:
+        delay = min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt))
+        delay *= random.uniform(0.5, 1.0)
+    else:
+        # A server asking for minutes must not park a request thread that long.
+        delay = min(LLM_BACKOFF_MAX, max(0.0, delay))
+    remaining = _remaining()
+    if remaining is not None and delay >= remaining:
+        # The retry could not finish in time; fail now, not at the deadline.
+        raise exc
+    time.sleep(delay)
+
+
+def _call_with_retry(backend, messages: list, stage: str, **params) -> str:
+
+    attempt = 0
+    while True:
+        try:
+            return backend.chat(messages, **params)
+        except Exception as e:
+            if attempt >= LLM_MAX_RETRIES or not _is_retryable(e):
+                raise
+            _backoff(e, attempt, stage)
+            attempt += 1
+
+
+def _stream_with_retry(backend, messages: list, stage: str, **params) -> JSONObjectScanner:
+    """
+    Stream until the first top-level JSON object is complete, then close
+    the stream. Failures before any output are retried like `chat`; a
+    failure mid-stream keeps what has arrived when any of it is usable.
+    """
+    attempt = 0
+    while True:
+        scanner = JSONObjectScanner()
+        chunks = backend.stream(messages, **params)
+        try:
+            for chunk in chunks:
+                if scanner.feed(chunk):
+                    break
+                remaining = _remaining()
+                if remaining is not None and remaining <= 0:
+                    raise LLMDeadlineExceeded("LLM call deadline passed mid-stream")
+            return scanner
+        except Exception as e:
+            if scanner.partial() is not None:
+                logger.warning(
+                    "LLM stream failed after %d chars (%s); keeping partial result",
+                    len(scanner.text), e
+                )
+                return scanner
+            if attempt >= LLM_MAX_RETRIES or not _is_retryable(e):
+                raise
+            _backoff(e, attempt, stage)
+            attempt += 1
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+
+
+def _complete(backend, messages: list, stage: str, stream_json: bool, **params) -> tuple:
+    """
+    One call through the backend: (content, whether it is complete).
+    """
+    if stream_json and LLM_STREAMING and hasattr(backend, "stream"):
+        scanner = _stream_with_retry(backend, messages, stage, **params)
+        if not scanner.complete:
+            metrics.llm_truncated.inc(stage=stage)
+            logger.warning(
+                "LLM stream ended before the JSON object closed (%d chars); using partial result",
+                len(scanner.text)
+            )
+        return scanner.result(), scanner.complete
+    return _call_with_retry(backend, messages, stage, **params), True
+
+
+def _generate(backend, messages: list, stage: str, stream_json: bool, response_schema, **params) -> tuple:
+    """
+    `_complete`, constrained to `response_schema` where the backend
+    supports it.
+    """
+    if (
+        response_schema
+        and hasattr(backend, "response_format")
+        and getattr(backend, "supports_response_format", True)
+    ):
+        try:
+            return _complete(
+                backend, messages, stage, stream_json,
+                response_format=backend.response_format(*response_schema),
+                **params
+            )
+        except LLMHTTPError as e:
+            if e.status_code not in (400, 422):
+                raise
+            result = _complete(backend, messages, stage, stream_json, **params)
+            # The same request went through without the format, so the
+            # format was what the backend rejected.
+            logger.warning("backend rejected response_format (%s); generating unconstrained", e)
+            backend.supports_response_format = False
+            return result
+    return _complete(backend, messages, stage, stream_json, **params)
+
+
+def _cacheable_reply(content: str, response_model) -> bool:
+    return response_model is None or conforms(content, response_model)
+
+
+def chat_completion(
+    messages: list,
+    max_tokens: int,
+    temperature: float,
+    stop: list = None,
+    cache_nondeterministic: bool = False,
+    stream_json: bool = False,
+    response_schema: tuple = None,
+    response_model: type = None,
+    stage: str = "unknown"
+) -> str:
+    """
+    Single entry point for every LLM call: response cache, shared
+    backend, retry with exponential backoff on 429/5xx.
+
+    Only temperature-0 calls are cached unless the caller explicitly
+    opts in with `cache_nondeterministic`.
+
+    With `stream_json` the response is streamed and the request closed
+    as soon as the first top-level JSON object is complete and valid;
+    only that object is returned. If the stream ends first (max_tokens
+    reached, connection lost) the object is returned cut back to its
+    last complete entry, and is not cached.
+
+    `response_schema` is a (name, JSON schema) pair; backends with a
+    `response_format` method constrain generation to it. A backend that
+    rejects the format is used without it from then on.
+
+    `response_model` is the pydantic model the reply is meant to fill;
+    it supplies `response_schema` when that is not given. Replies that
+    do not conform to it are neither cached nor served from the cache,
+    so a bad generation is not replayed until it expires.
+
+    `stage` labels the call's latency, token, retry and failure metrics.
+    """
+    if response_model is not None and response_schema is None:
+        response_schema = schema_of(response_model)
+
+    params = {"max_tokens": max_tokens, "temperature": temperature}
+    if stop:
+        params["stop"] = stop
+
+    # Cache hits must not need the backend, so take the model name
+    # without constructing it.
+    model = getattr(_backend, "model", LLM_MODEL)
+    cacheable = LLM_CACHE_ENABLED and (temperature == 0 or cache_nondeterministic)
+
+    constrained = bool(response_schema) and LLM_CONSTRAINED_OUTPUT
+    if cacheable:
+        cache = get_response_cache()
+        key_params = dict(params, response_schema=response_schema) if constrained else params
+        key = ResponseCache.make_key(model, messages, **key_params)
+        validate = None
+        if response_model is not None:
+            validate = lambda content: conforms(content, response_model)
+        cached = cache.get(key, validate=validate)
+        if cached is not None:
+            metrics.llm_cache_hits.inc(stage=stage)
+            return cached
+
+    start = time.perf_counter()
+    try:
+        content, complete = _generate(
+            get_backend(),
+            messages,
+            stage,
+            stream_json,
+            response_schema if constrained else None,
+            **params
+        )
+    except Exception as e:
+        metrics.llm_failures.inc(stage=stage, error=type(e).__name__)
+        raise
+
+    metrics.llm_call_seconds.observe(time.perf_counter() - start, stage=stage)
+    if metrics.METRICS_ENABLED:
+        metrics.llm_prompt_tokens.observe(count_message_tokens(messages), stage=stage)
+        metrics.llm_completion_tokens.observe(count_tokens(content), stage=stage)
+
+    if cacheable and content and complete and _cacheable_reply(content, response_model):
+        cache.put(key, model, content)
+
+    return content
@@ -0,0 +1,155 @@
+import ast
+import json
+import logging
+
+from LLM_PARSER.json_stream import _CLOSERS, JSONObjectScanner
+
+
+logger = logging.getLogger(__name__)
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """
+    Drop commas directly before a closing bracket, outside strings.
+    """
+    out = []
+    in_string = escape = False
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "}]":
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+        out.append(ch)
+    return "".join(out)
+
+
+def _repair_closers(text: str) -> str:
+    """
+    Fix brackets outside strings the way the scanner reads them: a
+    closer for an outer bracket first closes the inner ones left open,
+    a closer with no opener is dropped, and whatever is still open at
+    the end is closed.
+    """
+    out = []
+    stack = []
+    in_string = escape = False
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(ch)
+        elif ch in "}]":
+            opener = "{" if ch == "}" else "["
+            if opener not in stack:
+                continue
+            while stack[-1] != opener:
+                out.append(_CLOSERS[stack.pop()])
+            stack.pop()
+        out.append(ch)
+    out.extend(_CLOSERS[c] for c in reversed(stack))
+    return "".join(out)
+
+
+def _lenient_loads(candidate: str):
+    """
+    Parse an object that is balanced but not strict JSON: trailing
+    commas, mismatched closers, or a Python-style literal with single
+    quotes.
+    """
+    for repair in (_strip_trailing_commas, lambda text: _strip_trailing_commas(_repair_closers(text))):
+        try:
+            return json.loads(repair(candidate))
+        except ValueError:
+            pass
+    try:
+        data = ast.literal_eval(candidate)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _matches(data, schema) -> bool:
+    if not isinstance(data, dict):
+        return False
+    if schema is None:
+        return True
+    return any(isinstance(data.get(key), kind) for key, kind in schema.items())
+
+
+def _conform(data, schema, required=()) -> dict:
+    data = dict(data) if isinstance(data, dict) else {}
+    for key, kind in (schema or {}).items():
+        if key not in required and not isinstance(data.get(key), kind):
+            data[key] = kind()
+    return data
+
+
+def recover_json(text, schema: dict = None, required: tuple = ()) -> dict:
+    """
+    The JSON object in an LLM response, as leniently as is safe.
+
+    Objects are found by a string-aware brace scan, so prose, code
+    fences or braces inside values do not matter. The first object with
+    at least one `schema` key of the right type wins. Otherwise the first
+    object is used; if none parses, a balanced object is tried with
+    trailing commas removed and then as a Python literal, and a truncated
+    object is cut back to its last complete value.
+
+    The result has every `schema` key, with an empty value of the
+    expected type where the response had none, except keys listed in
+    `required`, which are left as the response gave them. Returns {}
+    (or the empty schema) when nothing is recoverable.
+    """
+    if isinstance(text, dict):
+        return _conform(text, schema, required)
+    if not isinstance(text, str) or not text.strip():
+        return _conform({}, schema, required)
+
+    first = None
+    rest = text
+    while True:
+        scanner = JSONObjectScanner()
+        scanner.feed(rest)
+        if not scanner.complete:
+            break
+        data = json.loads(scanner.result())
+        if _matches(data, schema):
+            return _conform(data, schema, required)
+        if first is None:
+            first = data
+        rest = rest[scanner.end:]
+
+    if first is not None:
+        return _conform(first, schema, required)
+
+    data = None
+    if scanner.candidate is not None:
+        how = "non-strict object"
+        data = _lenient_loads(scanner.candidate)
+    if data is None and scanner.partial() is not None:
+        how = "truncated object"
+        data = _lenient_loads(scanner.partial())
+
+    if data is None:
+        logger.warning("no JSON object recoverable from LLM output (%d chars)", len(text))
+        return _conform({}, schema, required)
+
+    logger.info("recovered JSON from %s in LLM output", how)
+    return _conform(data, schema, required)
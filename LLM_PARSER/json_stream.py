@@ -0,0 +1,135 @@
+import json
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class JSONObjectScanner:
+    """
+    Incremental scanner for the first top-level JSON object in streamed
+    model output. Prose or code fences around the object are skipped,
+    braces inside strings are ignored, and `feed` reports as soon as the
+    object closes and parses, so the caller can stop the stream there.
+
+    If the stream ends first, `result` returns the object cut back to the
+    last complete nested value or string value with its open brackets
+    closed, so extraction calls keep the entries that did arrive.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.start = None
+        self.end = None
+        self._stack = []
+        self._in_string = False
+        self._string_is_value = False
+        self._escape = False
+        # Last non-space character outside strings, to tell keys from values.
+        self._last = ""
+        # First balanced object that was not valid JSON.
+        self.candidate = None
+        # (index just past the last complete nested value, closers needed there)
+        self._safe = None
+
+    @property
+    def complete(self) -> bool:
+        return self.end is not None
+
+    def feed(self, chunk: str) -> bool:
+        if self.complete:
+            return True
+
+        offset = len(self.text)
+        self.text += chunk
+
+        for i in range(offset, len(self.text)):
+            ch = self.text[i]
+
+            if not self._stack:
+                if ch == "{":
+                    self.start = i
+                    self._stack.append(ch)
+                    self._safe = None
+                    self._last = ch
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._string_is_value:
+                        self._mark_safe(i + 1)
+                continue
+
+            if not ch.isspace():
+                last, self._last = self._last, ch
+
+            if ch == '"':
+                self._in_string = True
+                # A cut after a string value is only safe outside nested
+                # objects, so a half-received entry is dropped whole.
+                self._string_is_value = (
+                    (self._stack[-1] == "[" or last == ":")
+                    and "{" not in self._stack[1:]
+                )
+            elif ch in _CLOSERS:
+                self._stack.append(ch)
+            elif ch in "}]":
+                opener = "{" if ch == "}" else "["
+                # A closer for an outer bracket also closes the inner ones
+                # left open; a closer with no opener at all is ignored.
+                if opener not in self._stack:
+                    continue
+                while self._stack.pop() != opener:
+                    pass
+                if not self._stack:
+                    if self._close_object(i + 1):
+                        return True
+                else:
+                    self._mark_safe(i + 1)
+
+        return False
+
+    def _mark_safe(self, index: int) -> None:
+        closers = "".join(_CLOSERS[c] for c in reversed(self._stack))
+        self._safe = (index, closers)
+
+    def _close_object(self, end: int) -> bool:
+        candidate = self.text[self.start:end]
+        try:
+            json.loads(candidate)
+        except ValueError:
+            # Not valid JSON (e.g. single quotes): keep it as a fallback
+            # and look for a valid object after it.
+            if self.candidate is None:
+                self.candidate = candidate
+            self._safe = None
+            return False
+        self.end = end
+        return True
+
+    def partial(self):
+        """
+        The unfinished object repaired at its last complete value, or
+        None when nothing usable has arrived.
+        """
+        if not self._stack or self._safe is None:
+            return None
+        index, closers = self._safe
+        return self.text[self.start:index] + closers
+
+    def result(self) -> str:
+        """
+        The first valid object; else the first complete candidate; else
+        the repaired partial object; else everything received.
+        """
+        if self.complete:
+            return self.text[self.start:self.end]
+        if self.candidate is not None:
+            return self.candidate
+        partial = self.partial()
+        if partial is not None:
+            return partial
+        return self.text
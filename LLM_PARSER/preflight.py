@@ -0,0 +1,172 @@
+import os
+import math
+import logging
+import threading
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+LLM_TOKENIZER = os.getenv("LLM_TOKENIZER", os.getenv("LLM_MODEL", "mistralai/Mistral-7B-Instruct-v0.2"))
+# Mistral-7B-Instruct-v0.2 has a 32k context window.
+LLM_CONTEXT_TOKENS = int(os.getenv("LLM_CONTEXT_TOKENS", "32768"))
+LLM_MIN_OUTPUT_TOKENS = int(os.getenv("LLM_MIN_OUTPUT_TOKENS", "64"))
+LLM_MAX_OUTPUT_TOKENS = int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "4096"))
+# Headroom on top of the output estimate; max_tokens is only a ceiling,
+# so erring high costs nothing while truncation costs a failed call.
+LLM_OUTPUT_MARGIN = float(os.getenv("LLM_OUTPUT_MARGIN", "1.3"))
+
+# Used while the tokenizer loads, or when it cannot be loaded.
+CHARS_PER_TOKEN = 4
+# Chat template tokens ([INST], role markers) per message.
+MESSAGE_OVERHEAD_TOKENS = 8
+
+# JSON keys and punctuation per extracted entry.
+ENTRY_OVERHEAD_TOKENS = 30
+# The decision schema admits only the object itself: no preamble or fences.
+DECISION_OUTPUT_TOKENS = 120
+NAME_OUTPUT_TOKENS = 16
+
+_tokenizer = None
+_tokenizer_thread = None
+_tokenizer_lock = threading.Lock()
+# Fast tokenizers are not safe to call from several threads at once.
+_encode_lock = threading.Lock()
+
+
+def load_tokenizer():
+    """
+    Load LLM_TOKENIZER now; None when it cannot be loaded. May download
+    from the hub, so it runs on a background thread, never a request.
+    """
+    global _tokenizer
+    try:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(LLM_TOKENIZER, token=os.getenv("HF_TOKEN"))
+    except Exception as e:
+        logger.warning(
+            "tokenizer %s unavailable (%s); estimating %d chars per token",
+            LLM_TOKENIZER, e, CHARS_PER_TOKEN
+        )
+        return None
+    _tokenizer = tokenizer
+    return tokenizer
+
+
+def start_tokenizer_load() -> threading.Thread:
+    """
+    Load the tokenizer on a daemon thread, once per process.
+    """
+    global _tokenizer_thread
+    with _tokenizer_lock:
+        if _tokenizer_thread is None:
+            _tokenizer_thread = threading.Thread(target=load_tokenizer, name="tokenizer-load", daemon=True)
+            _tokenizer_thread.start()
+        return _tokenizer_thread
+
+
+def _get_tokenizer():
+    # Never waits: until the load finishes, callers use the estimate.
+    if _tokenizer_thread is None:
+        start_tokenizer_load()
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    with _encode_lock:
+        return len(tokenizer.encode(text, add_special_tokens=False))
+
+
+def count_message_tokens(messages: list) -> int:
+    return sum(
+        count_tokens(message.get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+def estimate_parse_output(resume_text: str) -> int:
+    """
+    The full parse copies most of the resume verbatim into JSON, so its
+    output tracks the input plus per-line JSON overhead.
+    """
+    lines = sum(1 for line in (resume_text or "").split("\n") if line.strip())
+    return count_tokens(resume_text) + ENTRY_OVERHEAD_TOKENS * math.ceil(lines / 3)
+
+
+def estimate_projects_output(project_section_text: str, project_count: int) -> int:
+    """
+    Every project carries its description verbatim plus name, tech stack
+    and JSON overhead.
+    """
+    return count_tokens(project_section_text) + ENTRY_OVERHEAD_TOKENS * max(project_count, 1)
+
+
+def estimate_names_output(project_count: int) -> int:
+    return NAME_OUTPUT_TOKENS * max(project_count, 1) + 20
+
+
+def estimate_decision_output() -> int:
+    return DECISION_OUTPUT_TOKENS
+
+
+def fits_context(messages: list, expected_output: int) -> bool:
+    """
+    Whether one request can return the expected output: within
+    LLM_MAX_OUTPUT_TOKENS, and with the prompt inside the context window.
+    """
+    needed = max(LLM_MIN_OUTPUT_TOKENS, math.ceil(expected_output * LLM_OUTPUT_MARGIN))
+    if needed > LLM_MAX_OUTPUT_TOKENS:
+        return False
+    return count_message_tokens(messages) + needed <= LLM_CONTEXT_TOKENS
+
+
+def size_max_tokens(stage: str, messages: list, expected_output: int) -> int:
+    """
+    max_tokens for one request: the output estimate plus margin, clamped
+    to LLM_MIN/MAX_OUTPUT_TOKENS and to what the context window has left
+    after the prompt.
+    """
+    prompt_tokens = count_message_tokens(messages)
+    wanted = math.ceil(expected_output * LLM_OUTPUT_MARGIN)
+    wanted = max(LLM_MIN_OUTPUT_TOKENS, min(LLM_MAX_OUTPUT_TOKENS, wanted))
+    available = LLM_CONTEXT_TOKENS - prompt_tokens
+
+    if wanted > available:
+        logger.warning(
+            "preflight %s: prompt %d tokens leaves %d of the %d wanted for output",
+            stage, prompt_tokens, available, wanted
+        )
+    max_tokens = max(1, min(wanted, available))
+
+    logger.debug(
+        "preflight %s: prompt=%d expected_output=%d max_tokens=%d",
+        stage, prompt_tokens, expected_output, max_tokens
+    )
+    return max_tokens
+
+
+def split_at_sections(text: str, is_header) -> tuple:
+    """
+    Split text in two at the header line closest to its middle, or at
+    the middle line when no header is near it. Returns () when the
+    text cannot be split further.
+    """
+    lines = [line for line in (text or "").split("\n") if line.strip()]
+    if len(lines) < 2:
+        return ()
+
+    # Only headers in the middle half, so each split roughly halves the work.
+    middle = len(lines) / 2
+    headers = [
+        i for i, line in enumerate(lines)
+        if len(lines) / 4 <= i <= 3 * len(lines) / 4 and i > 0 and is_header(line.strip())
+    ]
+    cut = min(headers, key=lambda i: abs(i - middle)) if headers else len(lines) // 2
+    return "\n".join(lines[:cut]), "\n".join(lines[cut:])
@@ -0,0 +1,226 @@
+import os
+import re
+import json
+import logging
+import textwrap
+from dotenv import load_dotenv
+
+from LLM_PARSER.preflight import CHARS_PER_TOKEN, count_tokens
+from NLP_PARSER.section_detector import match_section_header
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Input token budget per LLM stage. Over budget, parts are trimmed
+# section by section (see build_prompt).
+PROMPT_BUDGETS = {
+    "parse_resume": int(os.getenv("PROMPT_BUDGET_PARSE_RESUME", "3000")),
+    "extract_projects": int(os.getenv("PROMPT_BUDGET_EXTRACT_PROJECTS", "1500")),
+    "refine_projects": int(os.getenv("PROMPT_BUDGET_REFINE_PROJECTS", "1500")),
+    "examine_projects": int(os.getenv("PROMPT_BUDGET_EXAMINE_PROJECTS", "2500")),
+    "examine_resume": int(os.getenv("PROMPT_BUDGET_EXAMINE_RESUME", "3500"))
+}
+
+# Sections the parsers extract; the rest is dropped first when trimming.
+EXTRACTED_SECTIONS = ("experience", "projects", "skills", "achievements")
+
+# Shortest a JSON string value is cut down to.
+MIN_STRING_CHARS = 60
+
+SAME_AS_NLP = "<same as NLP output>"
+
+_RULE_LINE = re.compile(r"^\s*[-=]{5,}\s*$")
+
+
+def compact_json(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def template(text: str) -> str:
+    """
+    Prepare a prompt template once at import: dedent, drop trailing
+    spaces, decorative rule lines and repeated blank lines.
+    """
+    lines = []
+    for line in textwrap.dedent(text).strip().split("\n"):
+        line = line.rstrip()
+        if _RULE_LINE.match(line):
+            continue
+        if not line and (not lines or not lines[-1]):
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class TextPart:
+    """
+    Free text, trimmed from the end one line at a time.
+    """
+
+    def __init__(self, text: str, priority: int = 1):
+        self.lines = [l.strip() for l in (text or "").split("\n") if l.strip()]
+        self.priority = priority
+
+    def render(self) -> str:
+        return "\n".join(self.lines)
+
+    def trim(self, excess: int) -> int:
+        removed = 0
+        while removed < excess and len(self.lines) > 1:
+            removed += len(self.lines.pop()) + 1
+        if removed < excess and self.lines and len(self.lines[0]) > MIN_STRING_CHARS:
+            keep = max(MIN_STRING_CHARS, len(self.lines[0]) - (excess - removed))
+            removed += len(self.lines[0]) - keep
+            self.lines[0] = self.lines[0][:keep]
+        return removed
+
+
+class ResumeTextPart:
+    """
+    Resume text split into header-led blocks. Sections outside `keep`
+    (summary, education, the contact preamble) can be dropped whole;
+    the kept sections are never cut, since the parser has to return
+    them. Callers split oversized resumes instead (see fits_budget).
+    """
+
+    def __init__(self, text: str, keep: tuple = EXTRACTED_SECTIONS, priority: int = 0):
+        self.keep = keep
+        self.base_priority = priority
+        self.blocks = [[None, []]]
+        for line in (l.strip() for l in (text or "").split("\n")):
+            if not line:
+                continue
+            section = match_section_header(line)
+            if section:
+                self.blocks.append([section, [line]])
+            else:
+                self.blocks[-1][1].append(line)
+
+    @property
+    def priority(self) -> int:
+        if any(self._droppable(block) for block in self.blocks):
+            return self.base_priority
+        return self.base_priority + 2
+
+    def _droppable(self, block) -> bool:
+        # Without any recognised section the text is not a preamble.
+        if not any(section in self.keep for section, _ in self.blocks):
+            return False
+        return block[0] not in self.keep and bool(block[1])
+
+    def render(self) -> str:
+        return "\n".join(line for _, lines in self.blocks for line in lines)
+
+    def trim(self, excess: int) -> int:
+        removed = 0
+        for block in self.blocks:
+            if removed >= excess:
+                break
+            if self._droppable(block):
+                removed += sum(len(line) + 1 for line in block[1])
+                block[1] = []
+        return removed
+
+
+class JsonPart:
+    """
+    A JSON value, serialized compactly. Trimming shortens its longest
+    string values, which are usually text copied from the resume.
+    """
+
+    def __init__(self, data, priority: int = 1):
+        self.data = json.loads(json.dumps(data, ensure_ascii=False))
+        self.priority = priority
+
+    def render(self) -> str:
+        return compact_json(self.data)
+
+    def _strings(self, node, out):
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            return
+        for key, value in items:
+            if isinstance(value, str):
+                out.append((len(value), node, key))
+            else:
+                self._strings(value, out)
+
+    def trim(self, excess: int) -> int:
+        removed = 0
+        while removed < excess:
+            strings = []
+            self._strings(self.data, strings)
+            length, node, key = max(strings, default=(0, None, None), key=lambda s: s[0])
+            if length <= MIN_STRING_CHARS + 1:
+                break
+            keep = max(MIN_STRING_CHARS, length // 2)
+            node[key] = node[key][:keep] + "…"
+            removed += length - keep - 1
+        return removed
+
+
+def dedupe_against(reference: dict, other: dict) -> dict:
+    """
+    Copy of `other` with every top-level value equal to the one in
+    `reference` replaced by SAME_AS_NLP, so it is sent only once.
+    """
+    if not isinstance(reference, dict) or not isinstance(other, dict):
+        return other
+    return {
+        key: SAME_AS_NLP if key in reference and reference[key] == value and value else value
+        for key, value in other.items()
+    }
+
+
+def fits_budget(stage: str, prompt: str) -> bool:
+    """
+    Whether `prompt` is within the stage's budget without any trimming.
+    """
+    return count_tokens(prompt) <= PROMPT_BUDGETS[stage]
+
+
+def build_prompt(stage: str, prompt_template: str, **parts) -> str:
+    """
+    Fill `prompt_template` (str.format placeholders) with `parts` and
+    keep the result within the stage's token budget. Plain strings are
+    inserted as-is; TextPart / ResumeTextPart / JsonPart values are
+    trimmed lowest priority first until the prompt fits.
+    """
+    budget = PROMPT_BUDGETS[stage]
+    trimmable = [p for p in parts.values() if hasattr(p, "trim")]
+
+    def render() -> str:
+        return prompt_template.format(**{
+            name: part.render() if hasattr(part, "render") else part
+            for name, part in parts.items()
+        })
+
+    prompt = render()
+    original = tokens = count_tokens(prompt)
+
+    while tokens > budget:
+        excess = (tokens - budget) * CHARS_PER_TOKEN
+        for part in sorted(trimmable, key=lambda p: p.priority):
+            if part.trim(excess):
+                break
+        else:
+            logger.warning(
+                "prompt for %s is %d tokens, over its %d budget, and cannot be trimmed "
+                "further; sending it whole",
+                stage, tokens, budget
+            )
+            break
+        prompt = render()
+        tokens = count_tokens(prompt)
+
+    if tokens != original:
+        logger.info(
+            "prompt for %s trimmed from %d to %d tokens (budget %d)",
+            stage, original, tokens, budget
+        )
+    return prompt
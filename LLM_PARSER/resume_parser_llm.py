@@ -1,41 +1,99 @@
-import os
-import json
-from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
-
-
-
-load_dotenv()
-
-HF_TOKEN = os.getenv("HF_TOKEN")
-if not HF_TOKEN:
-    raise RuntimeError("HF_TOKEN not loaded. Check your .env file.")
-
-
-
-_client = InferenceClient(
-    model="mistralai/Mistral-7B-Instruct-v0.2",
-    token=HF_TOKEN
+import logging
+from LLM_PARSER.client import chat_completion
+from LLM_PARSER.preflight import (
+    estimate_parse_output,
+    fits_context,
+    size_max_tokens,
+    split_at_sections
 )
-
-
-def _safe_json(text: str) -> dict:
-    """
-    Extract valid JSON object only if complete and parsable.
-    """
-    if not text:
-        return {}
-
-    if text.count("{") != text.count("}") or text.count("[") != text.count("]"):
-        return {}
-
-    try:
-        start = text.index("{")
-        end = text.rindex("}") + 1
-        return json.loads(text[start:end])
-    except Exception:
-        return {}
-
+from LLM_PARSER.prompt_builder import ResumeTextPart, build_prompt, fits_budget, template
+from LLM_PARSER.schemas import ParsedResume, validate_response
+from NLP_PARSER.section_detector import match_section_header
+
+
+logger = logging.getLogger(__name__)
+
+
+PARSE_RESUME_TEMPLATE = template("""
+You are a STRICT resume information extraction engine.
+
+YOU MUST FOLLOW THESE RULES EXACTLY:
+
+GLOBAL RULES:
+- Use ONLY information explicitly present in the resume text.
+- DO NOT add, infer, guess, rewrite, or improve any content.
+- DO NOT merge, split, or fabricate entries.
+- DO NOT invent skills, companies, roles, metrics, or technologies.
+- If a field is missing, return an empty list.
+- Output MUST be valid JSON ONLY.
+- No explanations, comments, or extra text.
+
+--------------------------------------------------
+CORRECT OUTPUT SCHEMA (MANDATORY)
+--------------------------------------------------
+
+{{
+"experience": [
+    {{
+    "company": "",
+    "role": "",
+    "duration": "",
+    "description": ""
+    }}
+],
+"projects": [
+    {{
+    "name": "",
+    "description": "",
+    "techstack": []
+    }}
+],
+"skills": [],
+"achievements": []
+}}
+
+--------------------------------------------------
+SECTION-SPECIFIC RULES
+--------------------------------------------------
+
+EXPERIENCE:
+- Extract ONLY work/internship experience.
+- "description" must be copied verbatim from resume.
+- If company, role, or duration is not explicitly stated, leave it empty.
+
+PROJECTS:
+- Each bullet or numbered project = ONE project.
+- "description" MUST be copied verbatim.
+- "name" ONLY if explicitly stated.
+- "techstack" ONLY if explicitly mentioned.
+
+SKILLS:
+- Extract skills ONLY if listed explicitly.
+- No inferred or categorized skills.
+
+ACHIEVEMENTS:
+- Extract awards, recognitions, rankings, or accomplishments.
+- Copy text verbatim.
+
+--------------------------------------------------
+INPUT RESUME TEXT
+--------------------------------------------------
+<<<
+{resume_text}
+>>>
+""")
+
+
+def _merge_parsed(parts: list) -> dict:
+
+    merged = {"experience": [], "projects": [], "skills": [], "achievements": []}
+    for part in parts:
+        for key in ("experience", "projects", "achievements"):
+            merged[key].extend(part.get(key, []))
+        for skill in part.get("skills", []):
+            if skill not in merged["skills"]:
+                merged["skills"].append(skill)
+    return merged
 
 
 def parse_resume_with_llm(resume_text: str) -> dict:
@@ -48,95 +106,38 @@ def parse_resume_with_llm(resume_text: str) -> dict:
             "achievements": []
         }
 
-    prompt = f"""
-        You are a STRICT resume information extraction engine.
-
-        YOU MUST FOLLOW THESE RULES EXACTLY:
-
-        GLOBAL RULES:
-        - Use ONLY information explicitly present in the resume text.
-        - DO NOT add, infer, guess, rewrite, or improve any content.
-        - DO NOT merge, split, or fabricate entries.
-        - DO NOT invent skills, companies, roles, metrics, or technologies.
-        - If a field is missing, return an empty list.
-        - Output MUST be valid JSON ONLY.
-        - No explanations, comments, or extra text.
-
-        --------------------------------------------------
-        CORRECT OUTPUT SCHEMA (MANDATORY)
-        --------------------------------------------------
-
-        {{
-        "experience": [
-            {{
-            "company": "",
-            "role": "",
-            "duration": "",
-            "description": ""
-            }}
-        ],
-        "projects": [
-            {{
-            "name": "",
-            "description": "",
-            "techstack": []
-            }}
-        ],
-        "skills": [],
-        "achievements": []
-        }}
-
-        --------------------------------------------------
-        SECTION-SPECIFIC RULES
-        --------------------------------------------------
-
-        EXPERIENCE:
-        - Extract ONLY work/internship experience.
-        - "description" must be copied verbatim from resume.
-        - If company, role, or duration is not explicitly stated, leave it empty.
-
-        PROJECTS:
-        - Each bullet or numbered project = ONE project.
-        - "description" MUST be copied verbatim.
-        - "name" ONLY if explicitly stated.
-        - "techstack" ONLY if explicitly mentioned.
-
-        SKILLS:
-        - Extract skills ONLY if listed explicitly.
-        - No inferred or categorized skills.
-
-        ACHIEVEMENTS:
-        - Extract awards, recognitions, rankings, or accomplishments.
-        - Copy text verbatim.
-
-        --------------------------------------------------
-        INPUT RESUME TEXT
-        --------------------------------------------------
-        <<<
-        {resume_text}
-        >>>
-        """
+    expected_output = estimate_parse_output(resume_text)
+
+    # Too big for one request: parse each half separately and merge,
+    # rather than letting the JSON get cut off or trimming resume content
+    # to the prompt budget. Decided on the untrimmed text.
+    untrimmed = PARSE_RESUME_TEMPLATE.format(resume_text=resume_text)
+    fits = fits_budget("parse_resume", untrimmed) and fits_context(
+        [{"role": "user", "content": untrimmed}], expected_output
+    )
+    if not fits:
+        halves = split_at_sections(resume_text, match_section_header)
+        if halves:
+            return _merge_parsed([parse_resume_with_llm(half) for half in halves])
+
+    prompt = build_prompt("parse_resume", PARSE_RESUME_TEMPLATE, resume_text=ResumeTextPart(resume_text))
+    messages = [{"role": "user", "content": prompt}]
 
     try:
-        response = _client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=1200,
-            temperature=0.0  
+        response_text = chat_completion(
+            messages=messages,
+            max_tokens=size_max_tokens("parse_resume", messages, expected_output),
+            temperature=0.0,
+            stream_json=True,
+            response_model=ParsedResume,
+            stage="parse_resume"
         )
+        data = validate_response(response_text, ParsedResume)
 
-        response_text = response.choices[0].message.content
-        data = _safe_json(response_text)
-
-        
-        return {
-            "skills": data.get("skills", []) if isinstance(data.get("skills"), list) else [],
-            "experience": data.get("experience", []) if isinstance(data.get("experience"), list) else [],
-            "projects": data.get("projects", []) if isinstance(data.get("projects"), list) else [],
-            "achievements": data.get("achievements", []) if isinstance(data.get("achievements"), list) else []
-        }
+        return data if data else ParsedResume().model_dump()
 
-    except Exception:
-       
+    except Exception as e:
+        logger.warning("LLM resume parse failed: %s", e)
         return {
             "skills": [],
             "experience": [],
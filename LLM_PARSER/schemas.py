@@ -0,0 +1,146 @@
+import logging
+import typing
+from functools import lru_cache
+from typing import List, Literal, Union
+
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+
+from LLM_PARSER.json_recovery import recover_json
+
+
+logger = logging.getLogger(__name__)
+
+
+class Entry(BaseModel):
+    # Unexpected keys (e.g. "tech_stack" for "techstack") are kept, not dropped.
+    model_config = ConfigDict(extra="allow")
+
+
+class ExperienceEntry(Entry):
+    company: str = ""
+    role: str = ""
+    duration: str = ""
+    description: Union[str, List[str]] = ""
+
+
+class ProjectEntry(Entry):
+    name: str = ""
+    description: str = ""
+    techstack: List[str] = Field(
+        default=[],
+        validation_alias=AliasChoices("techstack", "tech_stack")
+    )
+
+
+class ParsedResume(BaseModel):
+    experience: List[ExperienceEntry] = []
+    projects: List[ProjectEntry] = []
+    skills: List[str] = []
+    achievements: List[str] = []
+
+
+class ProjectList(BaseModel):
+    projects: List[ProjectEntry] = []
+
+
+class ProjectNames(BaseModel):
+    names: List[str] = []
+
+
+class Decision(BaseModel):
+    selected_approach: Literal["nlp_heuristic", "llm_extraction"]
+    reason: str
+
+
+@lru_cache(maxsize=None)
+def type_adapter(model) -> TypeAdapter:
+    """
+    Validator compiled once per model and reused for every reply.
+    """
+    return TypeAdapter(model)
+
+
+@lru_cache(maxsize=None)
+def response_schema(model) -> tuple:
+    """
+    (name, JSON schema) of a model, for constrained generation.
+    """
+    return model.__name__, type_adapter(model).json_schema()
+
+
+@lru_cache(maxsize=None)
+def _recovery_schema(model) -> dict:
+    """
+    Top-level field types in the {key: type} form recover_json takes.
+    """
+    schema = {}
+    for name, field in model.model_fields.items():
+        origin = typing.get_origin(field.annotation)
+        schema[name] = list if origin in (list, List) else str
+    return schema
+
+
+@lru_cache(maxsize=None)
+def _required_fields(model) -> tuple:
+    return tuple(name for name, field in model.model_fields.items() if field.is_required())
+
+
+def validate_response(text, model) -> dict:
+    """
+    Validate an LLM reply against `model` and return it as a dict, or
+    None when it does not conform.
+
+    Constrained generation makes the strict parse the normal case; replies
+    from backends without it go through recover_json first.
+    """
+    adapter = type_adapter(model)
+    if isinstance(text, str):
+        try:
+            return adapter.validate_json(text).model_dump()
+        except ValidationError:
+            pass
+
+    # Required fields are never filled in: a reply without them is not a `model`.
+    data = recover_json(text, _recovery_schema(model), required=_required_fields(model))
+    try:
+        return adapter.validate_python(data).model_dump()
+    except ValidationError as e:
+        errors = e.errors()
+
+    # Drop the offending list entries rather than the whole reply.
+    bad = {
+        (error["loc"][0], error["loc"][1])
+        for error in errors
+        if len(error["loc"]) > 1 and isinstance(error["loc"][1], int)
+    }
+    if bad:
+        data = {
+            key: [item for i, item in enumerate(value) if (key, i) not in bad]
+            if isinstance(value, list) else value
+            for key, value in data.items()
+        }
+        try:
+            result = adapter.validate_python(data).model_dump()
+            logger.info("dropped %d invalid entries from %s reply", len(bad), model.__name__)
+            return result
+        except ValidationError as e:
+            errors = e.errors()
+
+    logger.warning("LLM reply does not match %s: %s", model.__name__, errors[:3])
+    return None
+
+
+def conforms(text, model) -> bool:
+    """
+    Whether an LLM reply is a usable `model` as it stands: it has at
+    least one of the model's fields and validates without the empty
+    values `validate_response` fills in for missing or mistyped keys.
+    """
+    data = recover_json(text)
+    if not any(name in data for name in model.model_fields):
+        return False
+    try:
+        type_adapter(model).validate_python(data)
+    except ValidationError:
+        return False
+    return True
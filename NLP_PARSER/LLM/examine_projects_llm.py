@@ -1,47 +1,17 @@
-import os
-import json
-from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
+import logging
+from LLM_PARSER.client import chat_completion
+from LLM_PARSER.preflight import estimate_decision_output, size_max_tokens
+from LLM_PARSER.prompt_builder import JsonPart, TextPart, build_prompt, template
+from LLM_PARSER.schemas import Decision, validate_response
+from NLP_PARSER.agreement import compare_projects, agreement_decision
+from NLP_PARSER.grounding import score_projects, grounding_decision
+from metrics import record_decision
 
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-HF_TOKEN = os.getenv("HF_TOKEN")
-if not HF_TOKEN:
-    raise RuntimeError("HF_TOKEN not loaded. Check your .env file.")
 
-_client = InferenceClient(
-    model="mistralai/Mistral-7B-Instruct-v0.2",
-    token=HF_TOKEN
-)
-
-
-def _safe_json(text: str) -> dict:
-   
-    if not text:
-        return {}
-
-    if text.count("{") != text.count("}") or text.count("[") != text.count("]"):
-        return {}
-
-    try:
-        start = text.index("{")
-        end = text.rindex("}") + 1
-        return json.loads(text[start:end])
-    except Exception:
-        return {}
-
-
-
-
-def examine_project_outputs(
-    raw_project_section: str,
-    nlp_projects: list,
-    llm_projects: list
-) -> dict:
-    
-
-    prompt = f"""
+EXAMINE_PROJECTS_TEMPLATE = template("""
 You are a strict resume parsing EXAMINER.
 
 You are NOT allowed to extract, rewrite, improve, or invent any data.
@@ -103,36 +73,66 @@ RAW PROJECT SECTION:
 
 NLP HEURISTIC OUTPUT:
 <<<
-{json.dumps(nlp_projects, indent=2)}
+{nlp_projects}
 >>>
 
 LLM EXTRACTION OUTPUT:
 <<<
-{json.dumps(llm_projects, indent=2)}
+{llm_projects}
 >>>
-"""
+""")
+
+
+def examine_project_outputs(
+    raw_project_section: str,
+    nlp_projects: list,
+    llm_projects: list
+) -> dict:
+
+    grounded_decision = grounding_decision(
+        "projects",
+        score_projects(raw_project_section, nlp_projects),
+        score_projects(raw_project_section, llm_projects)
+    )
+    if grounded_decision:
+        return record_decision("projects", grounded_decision, "grounding")
+
+    local_decision = agreement_decision(
+        "projects",
+        compare_projects(nlp_projects, llm_projects)
+    )
+    if local_decision:
+        return record_decision("projects", local_decision, "agreement")
+
+    prompt = build_prompt(
+        "examine_projects",
+        EXAMINE_PROJECTS_TEMPLATE,
+        raw_project_section=TextPart(raw_project_section, priority=2),
+        nlp_projects=JsonPart(nlp_projects),
+        llm_projects=JsonPart(llm_projects)
+    )
+
+    messages = [{"role": "user", "content": prompt}]
 
     try:
-        response = _client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=1000,
-            temperature=0.0
+        response_text = chat_completion(
+            messages=messages,
+            max_tokens=size_max_tokens("examine_projects", messages, estimate_decision_output()),
+            temperature=0.0,
+            stream_json=True,
+            response_model=Decision,
+            stage="examine_projects"
         )
+        decision = validate_response(response_text, Decision)
 
-        response_text = response.choices[0].message.content
-        decision = _safe_json(response_text)
-
-        if (
-            isinstance(decision, dict)
-            and decision.get("selected_approach") in {"nlp_heuristic", "llm_extraction"}
-        ):
-            return decision
+        if decision:
+            return record_decision("projects", decision, "llm")
 
-    except Exception:
-        pass
+    except Exception as e:
+        logger.warning("project examiner failed: %s", e)
 
 
-    return {
+    return record_decision("projects", {
         "selected_approach": "nlp_heuristic",
         "reason": "Examiner failed to produce a valid schema-aware decision."
-    }
+    }, "fallback")
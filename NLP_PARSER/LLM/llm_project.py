@@ -1,51 +1,20 @@
-import os
-import json
-from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
-
-
-load_dotenv()
-
-HF_TOKEN = os.getenv("HF_TOKEN")
-if not HF_TOKEN:
-    raise RuntimeError("HF_TOKEN not loaded. Check your .env file.")
-
-
-
-_client = InferenceClient(
-    model="mistralai/Mistral-7B-Instruct-v0.2",
-    token=HF_TOKEN
+import logging
+from LLM_PARSER.client import chat_completion
+from LLM_PARSER.preflight import (
+    estimate_projects_output,
+    fits_context,
+    size_max_tokens,
+    split_at_sections
 )
+from LLM_PARSER.prompt_builder import TextPart, build_prompt, fits_budget, template
+from LLM_PARSER.schemas import ProjectList, validate_response
+from NLP_PARSER.projects import is_project_title
 
 
-def _safe_json(text: str) -> dict:
-    """
-    Extract first valid JSON object from LLM output.
-    """
-    if not text:
-        return {}
-
-    try:
-        start = text.index("{")
-        end = text.rindex("}") + 1
-        return json.loads(text[start:end])
-    except Exception:
-        return {}
+logger = logging.getLogger(__name__)
 
 
-def extract_projects_with_llm(project_section_text: str) -> list:
-    """
-    STRICT project extractor.
-    Input:
-        project_section_text (str): Raw PROJECTS section text
-    Output:
-        List of project dictionaries (JSON-safe)
-    """
-
-    if not project_section_text or not project_section_text.strip():
-        return []
-
-    prompt = f"""
+EXTRACT_PROJECTS_TEMPLATE = template("""
 You are a strict resume information extraction engine.
 
 CRITICAL RULES:
@@ -79,23 +48,58 @@ INPUT (PROJECT SECTION):
 <<<
 {project_section_text}
 >>>
-"""
+""")
+
+
+def extract_projects_with_llm(project_section_text: str) -> list:
+    """
+    STRICT project extractor.
+    Input:
+        project_section_text (str): Raw PROJECTS section text
+    Output:
+        List of project dictionaries (JSON-safe)
+    """
+
+    if not project_section_text or not project_section_text.strip():
+        return []
+
+    project_count = sum(
+        1 for line in project_section_text.split("\n") if is_project_title(line.strip())
+    )
+    expected_output = estimate_projects_output(project_section_text, project_count)
+
+    # Extract each half of an oversized section separately instead of
+    # letting the JSON get cut off or trimming projects to the prompt
+    # budget. Decided before budget trimming.
+    untrimmed = EXTRACT_PROJECTS_TEMPLATE.format(project_section_text=project_section_text)
+    fits = fits_budget("extract_projects", untrimmed) and fits_context(
+        [{"role": "user", "content": untrimmed}], expected_output
+    )
+    if not fits:
+        halves = split_at_sections(project_section_text, is_project_title)
+        if halves:
+            return [project for half in halves for project in extract_projects_with_llm(half)]
+
+    prompt = build_prompt(
+        "extract_projects",
+        EXTRACT_PROJECTS_TEMPLATE,
+        project_section_text=TextPart(project_section_text)
+    )
+    messages = [{"role": "user", "content": prompt}]
 
     try:
-        response = _client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=800,
-            temperature=0.0
+        response_text = chat_completion(
+            messages=messages,
+            max_tokens=size_max_tokens("extract_projects", messages, expected_output),
+            temperature=0.0,
+            stream_json=True,
+            response_model=ProjectList,
+            stage="extract_projects"
         )
+        data = validate_response(response_text, ProjectList)
 
-        response_text = response.choices[0].message.content
-        data = _safe_json(response_text)
-       
-
-        projects = data.get("projects", [])
-        
-        return projects if isinstance(projects, list) else []
+        return data["projects"] if data else []
 
     except Exception as e:
-        
+        logger.warning("LLM project extraction failed: %s", e)
         return []
@@ -1,121 +1,125 @@
 
 import os
-import json
-import re
+import logging
 from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
+from LLM_PARSER.client import chat_completion
+from LLM_PARSER.preflight import estimate_names_output, size_max_tokens
+from LLM_PARSER.prompt_builder import TextPart, build_prompt, template
+from LLM_PARSER.schemas import ProjectNames, validate_response
 
 
 load_dotenv()
 
-HF_TOKEN = os.getenv("HF_TOKEN")
-if not HF_TOKEN:
-    raise RuntimeError("HF_TOKEN not loaded. Check your .env file.")
+logger = logging.getLogger(__name__)
 
+# The corrector samples at temperature 0.25, so caching it pins one sample
+# per input. Only do that when explicitly asked to.
+LLM_CACHE_CORRECTOR = os.getenv("LLM_CACHE_CORRECTOR", "0") == "1"
 
 
-client = InferenceClient(
-    model="mistralai/Mistral-7B-Instruct-v0.2",
-    token=HF_TOKEN
-)
 
+REFINE_PROJECTS_TEMPLATE = template("""
+SYSTEM ROLE:
+You are a resume-parsing assistant used in a production ATS system.
+You are NOT allowed to invent information.
 
+SOURCE OF TRUTH:
+The raw PROJECTS section text is the primary source for project names.
 
-def _safe_json(text: str) -> dict:
- 
-    if not text:
-        return {}
+TASK:
+Correct the names of the numbered projects below. Each is listed as
+"<number>. <current name> | <start of its description>".
 
-    match = re.search(r"\{.*\}", text, re.DOTALL)
-    if not match:
-        return {}
+HOW TO HANDLE PROJECT NAMES:
+- Derive or correct project names ONLY from the raw PROJECTS section text
+- If a name is implicit, derive it from described functionality
+- Do NOT invent unrelated names
+- Keep names concise, professional, and resume-ready
+- Ensure all project names are UNIQUE
 
-    try:
-        return json.loads(match.group())
-    except json.JSONDecodeError:
-        return {}
+STRICT RULES:
+- Return exactly one name per numbered project, in the same order
+- Do NOT add, remove, merge or split projects
+- If a name is already correct, return it unchanged
+- If unsure, make the MINIMAL change needed
 
+RAW PROJECTS SECTION:
+<<<
+{project_section_text}
+>>>
 
-def refine_projects_with_llm(project_section_text: str, projects: list) -> list:
- 
+PROJECTS:
+{projects}
+
+OUTPUT FORMAT (JSON ONLY):
+{{"names": ["<string>", "..."]}}
+""")
+
+# Characters of each description shown to identify the project.
+DESCRIPTION_PREVIEW_CHARS = 60
+
+
+def _project_lines(projects: list) -> str:
+
+    lines = []
+    for i, project in enumerate(projects, 1):
+        description = " ".join(str(project.get("description", "")).split())
+        lines.append(f"{i}. {project.get('name', '')} | {description[:DESCRIPTION_PREVIEW_CHARS]}")
+    return "\n".join(lines)
+
+
+def merge_project_names(projects: list, names) -> list:
+    """
+    Apply corrected names to the heuristic projects. Anything but one
+    non-empty name per project leaves the projects unchanged.
+    """
+    if not isinstance(names, list) or len(names) != len(projects):
+        return projects
+    if not all(isinstance(name, str) and name.strip() for name in names):
+        return projects
+
+    return [
+        dict(project, name=name.strip())
+        for project, name in zip(projects, names)
+    ]
 
+
+def refine_projects_with_llm(project_section_text: str, projects: list) -> list:
+    """
+    Ask the LLM for corrected project names only. The section is sent
+    once; descriptions and tech stacks stay as the heuristics found them
+    and the names are merged back locally.
+    """
     if not project_section_text or not projects:
         return projects
 
-    payload = {
-        "project_section_text": project_section_text,
-        "projects": projects
-    }
-
-    prompt = f"""
-        SYSTEM ROLE:
-        You are a resume-parsing assistant used in a production ATS system.
-        You are NOT allowed to invent information.
-
-        SOURCE OF TRUTH:
-        The raw PROJECTS section text is the primary source for project names.
-
-        TASK:
-        Correct and refine the project JSON.
-
-        HOW TO HANDLE PROJECT NAMES:
-        - Derive or correct project names ONLY from the raw PROJECTS section text
-        - If a name is implicit, derive it from described functionality
-        - Do NOT invent unrelated names
-        - Keep names concise, professional, and resume-ready
-        - Ensure all project names are UNIQUE
-
-
-        STRICT RULES:
-        - Do NOT add projects
-        - Do NOT remove projects
-        - Do NOT merge or split projects
-        - Do NOT add or infer technologies
-        - Do NOT change meanings
-        - Do NOT change project_type
-        - Do NOT rewrite descriptions (minor grammar fixes only)
-        - If unsure, make the MINIMAL change needed
-
-        INPUT:
-        {json.dumps(payload, indent=2)}
-
-        OUTPUT FORMAT (JSON ONLY):
-        {{
-        "projects": [
-            {{
-            "name": "<string>",
-            "description": "<string>",
-            "tech_stack": <list>,
-            "project_type": "<string>"
-            }}
-        ]
-        }}
-
-        FINAL CHECK:
-        - Project count must match input
-        - Every name must be justified by raw PROJECTS text
-        - No extra keys allowed
-        """
+    prompt = build_prompt(
+        "refine_projects",
+        REFINE_PROJECTS_TEMPLATE,
+        project_section_text=TextPart(project_section_text),
+        projects=_project_lines(projects)
+    )
+
+    messages = [{"role": "user", "content": prompt}]
 
     try:
-        response = client.chat.completions.create(
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=400,
-            temperature=0.25
+        response_text = chat_completion(
+            messages=messages,
+            max_tokens=size_max_tokens(
+                "refine_projects", messages, estimate_names_output(len(projects))
+            ),
+            temperature=0.25,
+            cache_nondeterministic=LLM_CACHE_CORRECTOR,
+            stream_json=True,
+            response_model=ProjectNames,
+            stage="refine_projects"
         )
+        data = validate_response(response_text, ProjectNames)
 
-        response_text = response.choices[0].message.content
-        data = _safe_json(response_text)
-
-        refined_projects = data.get("projects")
-
-        if isinstance(refined_projects, list):
-            return refined_projects
+        if data:
+            return merge_project_names(projects, data["names"])
 
     except Exception as e:
-        print("LLM ERROR:", str(e))
+        logger.warning("LLM project refinement failed: %s", e)
 
     return projects
-
@@ -1,12 +1,19 @@
 import re
+from NLP_PARSER.document import split_lines
 
 KEYWORDS = ["winner", "rank", "award", "certified", "top"]
 
 def extract_achievements(text: str) -> list:
+    return extract_achievements_lines(split_lines(text))[0]
+
+
+def extract_achievements_lines(lines: list) -> tuple:
     achievements = []
+    spans = []
 
-    for line in text.split("\n"):
-        if any(k in line.lower() for k in KEYWORDS):
-            achievements.append(line.strip())
+    for line in lines:
+        if any(k in line.text.lower() for k in KEYWORDS):
+            achievements.append(line.text)
+            spans.append([line.span])
 
-    return achievements
+    return achievements, spans
@@ -0,0 +1,193 @@
+import os
+import re
+import json
+import logging
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Agreement score (0..1) at or above which the examiner LLM is skipped.
+EXAMINER_AGREEMENT_THRESHOLD = float(os.getenv("EXAMINER_AGREEMENT_THRESHOLD", "0.9"))
+
+RESUME_WEIGHTS = {
+    "skills": 0.2,
+    "experience": 0.3,
+    "projects": 0.3,
+    "achievements": 0.2
+}
+
+
+def _normalize(text) -> str:
+    if isinstance(text, list):
+        text = " ".join(str(t) for t in text)
+    text = str(text or "").lower()
+    text = re.sub(r"[^a-z0-9+#./ ]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _tokens(text) -> set:
+    tokens = (t.strip("./") for t in _normalize(text).split())
+    return {t for t in tokens if t}
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _count_ratio(a: list, b: list) -> float:
+    if not a and not b:
+        return 1.0
+    return min(len(a), len(b)) / max(len(a), len(b))
+
+
+def _match_entries(nlp_entries: list, llm_entries: list, similarity) -> float:
+    """
+    Greedily pair entries by similarity and return the mean similarity
+    over the larger list, so missing or extra entries count as zero.
+    """
+    if not nlp_entries and not llm_entries:
+        return 1.0
+
+    pairs = sorted(
+        (
+            (similarity(a, b), i, j)
+            for i, a in enumerate(nlp_entries)
+            for j, b in enumerate(llm_entries)
+        ),
+        reverse=True
+    )
+
+    used_nlp, used_llm = set(), set()
+    total = 0.0
+    for score, i, j in pairs:
+        if i in used_nlp or j in used_llm:
+            continue
+        used_nlp.add(i)
+        used_llm.add(j)
+        total += score
+
+    return total / max(len(nlp_entries), len(llm_entries))
+
+
+def _project_fields(project) -> tuple:
+    if not isinstance(project, dict):
+        return _tokens(project), set(), set()
+
+    tech = project.get("tech_stack", project.get("techstack", [])) or []
+    return (
+        _tokens(project.get("name", "")),
+        _tokens(project.get("description", "")),
+        {_normalize(t) for t in tech if _normalize(t)}
+    )
+
+
+def _project_similarity(a, b) -> float:
+    name_a, desc_a, tech_a = _project_fields(a)
+    name_b, desc_b, tech_b = _project_fields(b)
+    return 0.3 * jaccard(name_a, name_b) + 0.5 * jaccard(desc_a, desc_b) + 0.2 * jaccard(tech_a, tech_b)
+
+
+def _experience_fields(entry) -> tuple:
+    if not isinstance(entry, dict):
+        return set(), _tokens(entry)
+
+    description = entry.get("description") or entry.get("responsibilities", "")
+    return (
+        _tokens([entry.get("role", ""), entry.get("company", ""), entry.get("duration", "")]),
+        _tokens(description)
+    )
+
+
+def _experience_similarity(a, b) -> float:
+    header_a, desc_a = _experience_fields(a)
+    header_b, desc_b = _experience_fields(b)
+    return 0.4 * jaccard(header_a, header_b) + 0.6 * jaccard(desc_a, desc_b)
+
+
+def _text_similarity(a, b) -> float:
+    return jaccard(_tokens(a), _tokens(b))
+
+
+def compare_projects(nlp_projects: list, llm_projects: list) -> dict:
+
+    nlp_projects = nlp_projects or []
+    llm_projects = llm_projects or []
+
+    count = _count_ratio(nlp_projects, llm_projects)
+    content = _match_entries(nlp_projects, llm_projects, _project_similarity)
+
+    return {
+        "score": round(count * content, 4),
+        "count_ratio": round(count, 4),
+        "content": round(content, 4)
+    }
+
+
+def compare_resumes(nlp_resume: dict, llm_resume: dict) -> dict:
+
+    nlp_resume = nlp_resume or {}
+    llm_resume = llm_resume or {}
+
+    skills = jaccard(
+        {_normalize(s) for s in nlp_resume.get("skills", []) or []},
+        {_normalize(s) for s in llm_resume.get("skills", []) or []}
+    )
+
+    nlp_experience = nlp_resume.get("experience", []) or []
+    llm_experience = llm_resume.get("experience", []) or []
+    experience = _count_ratio(nlp_experience, llm_experience) * _match_entries(
+        nlp_experience, llm_experience, _experience_similarity
+    )
+
+    projects = compare_projects(
+        nlp_resume.get("projects", []),
+        llm_resume.get("projects", [])
+    )["score"]
+
+    achievements = _match_entries(
+        nlp_resume.get("achievements", []) or [],
+        llm_resume.get("achievements", []) or [],
+        _text_similarity
+    )
+
+    sections = {
+        "skills": skills,
+        "experience": experience,
+        "projects": projects,
+        "achievements": achievements
+    }
+    score = sum(RESUME_WEIGHTS[k] * v for k, v in sections.items())
+
+    return {
+        "score": round(score, 4),
+        **{k: round(v, 4) for k, v in sections.items()}
+    }
+
+
+def agreement_decision(stage: str, agreement: dict, threshold: float = None):
+    """
+    Return an examiner-style decision when the two outputs agree closely
+    enough to skip the examiner LLM, otherwise None. Every verdict is
+    logged so the threshold can be tuned from production traffic.
+    """
+    if threshold is None:
+        threshold = EXAMINER_AGREEMENT_THRESHOLD
+
+    skipped = agreement["score"] >= threshold
+    logger.info(
+        "examiner agreement stage=%s score=%.4f threshold=%.2f skipped=%s details=%s",
+        stage, agreement["score"], threshold, skipped, json.dumps(agreement)
+    )
+
+    if not skipped:
+        return None
+
+    return {
+        "selected_approach": "nlp_heuristic",
+        "reason": f"NLP and LLM outputs agree (score {agreement['score']:.2f}); examiner skipped."
+    }
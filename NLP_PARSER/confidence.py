@@ -0,0 +1,113 @@
+import re
+from NLP_PARSER.projects import is_project_title
+
+
+def _tokens(text: str) -> set:
+    return set(re.findall(r"[a-z0-9+#]+", (text or "").lower()))
+
+
+def _coverage(section_text: str, extracted: list) -> float:
+    """
+    Share of the section's tokens that ended up in some extracted field.
+    Low coverage means lines the heuristics could not place.
+    """
+    section_tokens = _tokens(section_text)
+    if not section_tokens:
+        return 0.0
+    return len(section_tokens & _tokens(" ".join(extracted))) / len(section_tokens)
+
+
+def _filled(entries: list, fields: list) -> float:
+    if not entries:
+        return 0.0
+
+    filled = sum(
+        1
+        for entry in entries
+        for field in fields
+        if entry.get(field)
+    )
+    return filled / (len(entries) * len(fields))
+
+
+def _count_agreement(found: int, expected: int) -> float:
+    if not found and not expected:
+        return 1.0
+    return min(found, expected) / max(found, expected)
+
+
+def _score(header_found: bool, filled: float, coverage: float, structure: float = 1.0) -> float:
+    # No header, no section: nothing to be unsure about.
+    if not header_found:
+        return None
+    return round(0.3 + 0.2 * filled + 0.3 * coverage + 0.2 * structure, 4)
+
+
+def score_skills(section_text: str, skills: list) -> float:
+
+    header = bool(section_text)
+    return _score(header, 1.0 if skills else 0.0, _coverage(section_text, skills))
+
+
+def score_experience(section_text: str, experience: list) -> float:
+
+    extracted = []
+    for entry in experience:
+        extracted.extend([entry.get("role", ""), entry.get("company", ""), entry.get("duration", "")])
+        extracted.extend(entry.get("responsibilities", []))
+
+    return _score(
+        bool(section_text),
+        _filled(experience, ["role", "company", "duration", "responsibilities"]),
+        _coverage(section_text, extracted)
+    )
+
+
+def score_projects(section_text: str, projects: list, lines: list = None) -> float:
+
+    if lines is None:
+        lines = [l.strip() for l in (section_text or "").split("\n")]
+    else:
+        lines = [line.text for line in lines]
+
+    extracted = []
+    for project in projects:
+        extracted.extend([project.get("name", ""), project.get("description", "")])
+        extracted.extend(project.get("tech_stack", []))
+
+    # Title-looking lines vs. entries produced catches merged projects,
+    # which token coverage alone cannot see.
+    title_lines = sum(1 for line in lines if is_project_title(line))
+
+    return _score(
+        bool(section_text),
+        _filled(projects, ["name", "description"]),
+        _coverage(section_text, extracted),
+        _count_agreement(len(projects), title_lines)
+    )
+
+
+def score_achievements(section_text: str, achievements: list) -> float:
+
+    return _score(
+        bool(section_text),
+        1.0 if achievements else 0.0,
+        _coverage(section_text, achievements)
+    )
+
+
+def score_sections(document, parsed: dict) -> dict:
+    """
+    Per-section confidence (0..1) for the heuristic output: are entries
+    filled in, and how much of the section text was consumed by the
+    extracted fields. None for a section the resume does not have.
+    """
+    sections = document.section_texts()
+    return {
+        "skills": score_skills(sections.get("skills", ""), parsed["skills"]),
+        "experience": score_experience(sections.get("experience", ""), parsed["experience"]),
+        "projects": score_projects(
+            sections.get("projects", ""), parsed["projects"], document.lines("projects")
+        ),
+        "achievements": score_achievements(sections.get("achievements", ""), parsed["achievements"])
+    }
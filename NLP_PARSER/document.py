@@ -0,0 +1,124 @@
+from array import array
+from collections import namedtuple
+
+from NLP_PARSER.section_detector import detect_section_ranges
+
+
+class Line(namedtuple("Line", ["text", "start", "end"])):
+    """
+    A stripped line and its [start, end) character span in the document.
+    """
+    __slots__ = ()
+
+    def lstrip(self, chars: str = None):
+        text = self.text.lstrip(chars)
+        return Line(text, self.end - len(text), self.end)
+
+    def rstrip(self, chars: str = None):
+        text = self.text.rstrip(chars)
+        return Line(text, self.start, self.start + len(text))
+
+    def strip(self, chars: str = None):
+        return self.lstrip(chars).rstrip(chars)
+
+    def prefix(self, length: int):
+        return Line(self.text[:length], self.start, self.start + min(length, len(self.text)))
+
+    @property
+    def span(self) -> list:
+        return [self.start, self.end]
+
+
+def split_lines(text: str, offset: int = 0) -> list:
+    """
+    Non-empty stripped lines of `text` with spans shifted by `offset`.
+    """
+    lines = []
+    start = 0
+    for raw in text.split("\n"):
+        stripped = raw.strip()
+        if stripped:
+            lead = start + len(raw) - len(raw.lstrip())
+            lines.append(Line(stripped, offset + lead, offset + lead + len(stripped)))
+        start += len(raw) + 1
+    return lines
+
+
+class ResumeDocument:
+    """
+    The cleaned resume text plus line and section offset tables, built
+    once per resume. Sections are line ranges over the same text, so
+    extractors work on views of it instead of re-split copies, and
+    every extracted field can point back to the span it came from.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.line_starts = array("I")
+        self.line_ends = array("I")
+
+        lines = split_lines(text)
+        for line in lines:
+            self.line_starts.append(line.start)
+            self.line_ends.append(line.end)
+
+        # section -> (first body line, end line), header lines excluded
+        self.section_ranges = detect_section_ranges([line.text for line in lines])
+        self._lines = lines
+        self._section_texts = None
+
+    def __len__(self) -> int:
+        return len(self.line_starts)
+
+    def lines(self, section: str = None) -> list:
+        """
+        Stripped lines of one section (or of the whole document).
+        """
+        if section is None:
+            return self._lines
+        first, end = self.section_ranges.get(section, (0, 0))
+        return self._lines[first:end]
+
+    def section_span(self, section: str):
+        first, end = self.section_ranges.get(section, (0, 0))
+        if first == end:
+            return None
+        return self.line_starts[first], self.line_ends[end - 1]
+
+    def section_text(self, section: str) -> str:
+        span = self.section_span(section)
+        return self.text[span[0]:span[1]] if span else ""
+
+    def section_texts(self) -> dict:
+        """
+        Section name -> section text, the shape detect_sections returns.
+        """
+        if self._section_texts is None:
+            self._section_texts = {
+                section: self.section_text(section)
+                for section in self.section_ranges
+            }
+        return self._section_texts
+
+    def text_at(self, spans: list) -> str:
+        """
+        Text covered by a field's spans, joined the way extractors join
+        continuation lines.
+        """
+        return " ".join(self.text[start:end] for start, end in spans)
+
+
+def map_offsets(spans: list, start: int, end: int) -> list:
+    """
+    Map [start, end) in the joined text of `spans` (see text_at) back to
+    document spans.
+    """
+    mapped = []
+    position = 0
+    for span_start, span_end in spans:
+        length = span_end - span_start
+        lo, hi = max(start, position), min(end, position + length)
+        if lo < hi:
+            mapped.append([span_start + lo - position, span_start + hi - position])
+        position += length + 1
+    return mapped
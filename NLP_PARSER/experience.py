@@ -1,4 +1,5 @@
 import re
+from NLP_PARSER.document import split_lines
 
 ROLE_KEYWORDS = [
     "intern", "engineer", "developer",
@@ -28,49 +29,71 @@ def looks_like_company(line: str) -> bool:
     return True
 
 def extract_experience(text: str) -> list:
+    return extract_experience_lines(split_lines(text))[0]
+
+
+def extract_experience_lines(lines: list) -> tuple:
+    """
+    Experience entries from stripped `Line`s, plus a parallel list with
+    the source spans of every field.
+    """
     experiences = []
-    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    spans = []
 
     current = None
+    current_spans = None
     last_bullet_idx = None
 
     for line in lines:
-        lower = line.lower()
+        lower = line.text.lower()
 
 
         if any(e in lower for e in EDUCATION_BLOCKLIST):
             continue
 
     
-        if any(r in lower for r in ROLE_KEYWORDS) and is_title_line(line):
+        if any(r in lower for r in ROLE_KEYWORDS) and is_title_line(line.text):
             if current:
                 experiences.append(current)
+                spans.append(current_spans)
 
             current = {
                 "company": "",
-                "role": line,
+                "role": line.text,
                 "duration": "",
                 "responsibilities": []
             }
+            current_spans = {
+                "company": [],
+                "role": [line.span],
+                "duration": [],
+                "responsibilities": []
+            }
             last_bullet_idx = None
             continue
 
-        if current and not current["company"] and looks_like_company(line):
-            current["company"] = line.split("-")[0].strip()
+        if current and not current["company"] and looks_like_company(line.text):
+            company = line.prefix(len(line.text.split("-")[0])).strip()
+            current["company"] = company.text
+            current_spans["company"] = [company.span]
             continue
 
         if current and re.search(DATE_PATTERN, lower):
-            current["duration"] = line
+            current["duration"] = line.text
+            current_spans["duration"] = [line.span]
             continue
 
         if current:
-            if line.startswith("-"):
-                current["responsibilities"].append(line)
+            if line.text.startswith("-"):
+                current["responsibilities"].append(line.text)
+                current_spans["responsibilities"].append([line.span])
                 last_bullet_idx = len(current["responsibilities"]) - 1
             elif last_bullet_idx is not None:
-                current["responsibilities"][last_bullet_idx] += " " + line
+                current["responsibilities"][last_bullet_idx] += " " + line.text
+                current_spans["responsibilities"][last_bullet_idx].append(line.span)
 
     if current:
         experiences.append(current)
+        spans.append(current_spans)
 
-    return experiences
+    return experiences, spans
@@ -0,0 +1,373 @@
+import os
+import json
+import logging
+from array import array
+from functools import lru_cache
+from dotenv import load_dotenv
+
+from NLP_PARSER.projects import is_project_title
+from NLP_PARSER.taxonomy import get_taxonomy
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+GROUNDING_ENABLED = os.getenv("GROUNDING_ENABLED", "1") == "1"
+# A score gap at least this large decides the examiner stage locally.
+GROUNDING_MARGIN = float(os.getenv("GROUNDING_MARGIN", "0.1"))
+# When both outputs score at least this, the higher one wins outright
+# (the heuristics on a tie).
+GROUNDING_MIN_SCORE = float(os.getenv("GROUNDING_MIN_SCORE", "0.9"))
+# Shortest verbatim run (characters) that counts as grounded inside a
+# longer, partly rewritten value. Shorter values must match whole.
+GROUNDING_MIN_RUN = int(os.getenv("GROUNDING_MIN_RUN", "12"))
+
+GROUNDING_WEIGHTS = {
+    "grounded": 0.6,
+    "coverage": 0.25,
+    "structure": 0.15
+}
+
+_CHAR_MAP = str.maketrans({
+    "–": "-", "—": "-", "•": "-", "●": "-", "▪": "-",
+    "‘": "'", "’": "'", "“": '"', "”": '"'
+})
+
+
+def normalize(text) -> str:
+    return " ".join(str(text or "").translate(_CHAR_MAP).lower().split())
+
+
+class SuffixAutomaton:
+    """
+    Suffix automaton of a string: every substring is a path from state 0,
+    so membership and first position are answered in O(len(query)).
+    """
+
+    def __init__(self, text: str):
+        self.next = [{}]
+        self.link = [-1]
+        self.length = [0]
+        self.first_end = [-1]
+
+        last = 0
+        for i, ch in enumerate(text):
+            cur = len(self.next)
+            self.next.append({})
+            self.link.append(0)
+            self.length.append(self.length[last] + 1)
+            self.first_end.append(i)
+
+            p = last
+            while p != -1 and ch not in self.next[p]:
+                self.next[p][ch] = cur
+                p = self.link[p]
+
+            if p != -1:
+                q = self.next[p][ch]
+                if self.length[p] + 1 == self.length[q]:
+                    self.link[cur] = q
+                else:
+                    clone = len(self.next)
+                    self.next.append(dict(self.next[q]))
+                    self.link.append(self.link[q])
+                    self.length.append(self.length[p] + 1)
+                    self.first_end.append(self.first_end[q])
+                    while p != -1 and self.next[p].get(ch) == q:
+                        self.next[p][ch] = clone
+                        p = self.link[p]
+                    self.link[q] = self.link[cur] = clone
+            last = cur
+
+    def walk(self, query: str, start: int = 0) -> tuple:
+        """
+        Follow `query[start:]` as far as it is a substring. Returns the
+        matched length and the state reached.
+        """
+        state = 0
+        for i in range(start, len(query)):
+            state_next = self.next[state].get(query[i])
+            if state_next is None:
+                return i - start, state
+            state = state_next
+        return len(query) - start, state
+
+    def find(self, query: str):
+        """
+        Start of the first occurrence of `query`, or None.
+        """
+        matched, state = self.walk(query)
+        if matched < len(query):
+            return None
+        return self.first_end[state] - len(query) + 1
+
+
+class GroundingIndex:
+    """
+    Substring index over one normalized source text, with a map back to
+    offsets in the original text.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        chars = []
+        self.positions = array("I")
+        pending_space = False
+        for i, ch in enumerate(text.translate(_CHAR_MAP).lower()):
+            if ch.isspace():
+                pending_space = bool(chars)
+                continue
+            if pending_space:
+                chars.append(" ")
+                self.positions.append(i)
+                pending_space = False
+            chars.append(ch)
+            self.positions.append(i)
+
+        self.normalized = "".join(chars)
+        self.automaton = SuffixAutomaton(self.normalized)
+        self.content_chars = sum(1 for ch in self.normalized if ch != " ")
+        self._skills = None
+
+    def find(self, value):
+        """
+        [start, end) of the first verbatim occurrence of `value` in the
+        original text (ignoring case and whitespace runs), or None.
+        """
+        query = normalize(value)
+        if not query:
+            return None
+        start = self.automaton.find(query)
+        if start is None:
+            return None
+        return self.positions[start], self.positions[start + len(query) - 1] + 1
+
+    def runs(self, query: str) -> list:
+        """
+        Greedy left-to-right longest-match factorization of a normalized
+        query: (query start, text start, length) for each verbatim run of
+        at least GROUNDING_MIN_RUN characters, or the whole query.
+        """
+        runs = []
+        i = 0
+        while i < len(query):
+            matched, state = self.automaton.walk(query, i)
+            if matched == len(query) or matched >= GROUNDING_MIN_RUN:
+                text_start = self.automaton.first_end[state] - matched + 1
+                runs.append((i, text_start, matched))
+                i += matched
+            else:
+                i += 1
+        return runs
+
+    def skills(self) -> set:
+        if self._skills is None:
+            self._skills = {m["skill"] for m in get_taxonomy().find_all(self.text)}
+        return self._skills
+
+    def mentions(self, item) -> bool:
+        """
+        Whether a skill or technology is mentioned. Items the taxonomy
+        knows must appear on token boundaries under any alias of the same
+        canonical skill ("postgres" grounds "PostgreSQL", a stray "c"
+        does not ground "C"); anything else must appear verbatim.
+        """
+        canonical = {m["skill"] for m in get_taxonomy().find_all(str(item or ""))}
+        if canonical:
+            return canonical <= self.skills()
+        return self.automaton.find(normalize(item)) is not None
+
+
+@lru_cache(maxsize=16)
+def grounding_index(text: str) -> GroundingIndex:
+    return GroundingIndex(text)
+
+
+class _Tally:
+
+    def __init__(self, index: GroundingIndex):
+        self.index = index
+        self.total = 0
+        self.grounded = 0
+        self.covered = bytearray(len(index.normalized))
+        self.ungrounded = []
+
+    def text(self, value) -> None:
+        query = normalize(value if not isinstance(value, list) else " ".join(map(str, value)))
+        weight = sum(1 for ch in query if ch != " ")
+        if not weight:
+            return
+
+        grounded = 0
+        for query_start, text_start, length in self.index.runs(query):
+            grounded += sum(1 for ch in query[query_start:query_start + length] if ch != " ")
+            self.covered[text_start:text_start + length] = b"\x01" * length
+
+        self.total += weight
+        self.grounded += grounded
+        if grounded < weight:
+            self.ungrounded.append(query[:80])
+
+    def item(self, value) -> None:
+        query = normalize(value)
+        if not query:
+            return
+
+        weight = len(query)
+        self.total += weight
+        if self.index.mentions(value):
+            self.grounded += weight
+            start = self.index.automaton.find(query)
+            if start is not None:
+                self.covered[start:start + len(query)] = b"\x01" * len(query)
+        else:
+            self.ungrounded.append(query[:80])
+
+    def report(self, structure: float) -> dict:
+        grounded = self.grounded / self.total if self.total else 1.0
+        content = self.index.content_chars
+        covered = sum(
+            1 for i, flag in enumerate(self.covered)
+            if flag and self.index.normalized[i] != " "
+        )
+        coverage = covered / content if content else 1.0
+
+        score = (
+            GROUNDING_WEIGHTS["grounded"] * grounded
+            + GROUNDING_WEIGHTS["coverage"] * coverage
+            + GROUNDING_WEIGHTS["structure"] * structure
+        )
+        return {
+            "score": round(score, 4),
+            "grounded": round(grounded, 4),
+            "coverage": round(coverage, 4),
+            "structure": round(structure, 4),
+            "ungrounded": self.ungrounded[:10]
+        }
+
+
+def _count_agreement(found: int, expected: int) -> float:
+    if not found and not expected:
+        return 1.0
+    return min(found, expected) / max(found, expected)
+
+
+def _tally_projects(tally: _Tally, projects) -> float:
+    """
+    Add project fields to `tally` and return the share of entries that
+    follow the schema.
+    """
+    if not isinstance(projects, list):
+        return 0.0
+
+    valid = 0
+    for project in projects:
+        if not isinstance(project, dict):
+            tally.text(project)
+            continue
+
+        tech = project.get("tech_stack", project.get("techstack", []))
+        keys = set(project) - {"tech_stack", "techstack"}
+        if keys == {"name", "description"} and isinstance(tech, list):
+            valid += 1
+
+        if project.get("name") != "Derived Project":
+            tally.text(project.get("name", ""))
+        tally.text(project.get("description", ""))
+        for item in tech if isinstance(tech, list) else [tech]:
+            tally.item(item)
+
+    return valid / len(projects) if projects else 1.0
+
+
+def score_projects(raw_project_section: str, projects) -> dict:
+    """
+    How well a project list is grounded in the raw project section:
+    verbatim share of its fields, share of the section they cover, and
+    schema validity times agreement with the number of title lines.
+    """
+    index = grounding_index(raw_project_section or "")
+    tally = _Tally(index)
+    schema = _tally_projects(tally, projects)
+
+    title_lines = sum(
+        1
+        for line in (raw_project_section or "").split("\n")
+        if is_project_title(line.strip())
+    )
+    found = len(projects) if isinstance(projects, list) else 0
+    return tally.report(schema * _count_agreement(found, title_lines))
+
+
+def score_resume(raw_resume_text: str, resume) -> dict:
+    """
+    Grounding report for a whole parsed resume against the raw text.
+    """
+    index = grounding_index(raw_resume_text or "")
+    tally = _Tally(index)
+    if not isinstance(resume, dict):
+        return tally.report(0.0)
+
+    checks = []
+
+    skills = resume.get("skills", [])
+    checks.append(isinstance(skills, list))
+    for skill in skills if isinstance(skills, list) else []:
+        tally.item(skill)
+
+    experience = resume.get("experience", [])
+    checks.append(isinstance(experience, list))
+    for entry in experience if isinstance(experience, list) else []:
+        if not isinstance(entry, dict):
+            tally.text(entry)
+            checks.append(False)
+            continue
+        checks.append(bool({"role", "company", "duration"} & set(entry)))
+        for field in ("role", "company", "duration"):
+            tally.text(entry.get(field, ""))
+        description = entry.get("description") or entry.get("responsibilities", [])
+        for line in description if isinstance(description, list) else [description]:
+            tally.text(line)
+
+    checks.append(_tally_projects(tally, resume.get("projects", [])) == 1.0)
+
+    achievements = resume.get("achievements", [])
+    checks.append(isinstance(achievements, list))
+    for achievement in achievements if isinstance(achievements, list) else []:
+        tally.text(achievement)
+
+    return tally.report(sum(checks) / len(checks))
+
+
+def grounding_decision(stage: str, nlp_report: dict, llm_report: dict):
+    """
+    Examiner-style decision from two grounding reports, or None when the
+    reports are too close to call and the examiner LLM should decide.
+    """
+    if not GROUNDING_ENABLED:
+        return None
+
+    diff = nlp_report["score"] - llm_report["score"]
+    decisive = (
+        abs(diff) >= GROUNDING_MARGIN
+        or min(nlp_report["score"], llm_report["score"]) >= GROUNDING_MIN_SCORE
+    )
+    approach = None
+    if decisive:
+        approach = "nlp_heuristic" if diff >= 0 else "llm_extraction"
+
+    logger.info(
+        "examiner grounding stage=%s nlp=%s llm=%s decided=%s",
+        stage, json.dumps(nlp_report), json.dumps(llm_report), approach
+    )
+    if approach is None:
+        return None
+
+    return {
+        "selected_approach": approach,
+        "reason": (
+            f"Grounding check: nlp {nlp_report['score']:.2f}, "
+            f"llm {llm_report['score']:.2f} against the raw text; examiner skipped."
+        )
+    }
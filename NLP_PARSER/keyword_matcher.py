@@ -0,0 +1,157 @@
+from array import array
+from bisect import bisect_left
+from collections import deque, namedtuple
+
+KeywordMatch = namedtuple("KeywordMatch", ["keyword", "payload", "start", "end"])
+
+# Flat uint32 arrays that fully describe a compiled automaton. They can be
+# built in memory or read straight out of a memory-mapped file.
+ARRAY_NAMES = (
+    "edge_offsets",   # per state: start of its outgoing edges (+1 sentinel)
+    "edge_chars",     # edge label code points, sorted within each state
+    "edge_targets",   # edge target states
+    "fail",           # failure link per state
+    "dict_link",      # nearest state on the failure chain that emits output
+    "out_offsets",    # per state: start of its keyword ids (+1 sentinel)
+    "out_ids",        # keyword ids emitted at each state
+    "kw_lengths",     # keyword length in characters
+    "kw_flags",       # bit 0: first char is a token char, bit 1: last char is
+)
+
+
+def _is_token_char(ch: str) -> bool:
+    # "+" and "#" count as part of a token so "c" does not match inside
+    # "c++" or "c#"; "." and "/" do not, so "node.js." still matches.
+    return ch.isalnum() or ch in "_+#"
+
+
+def compile_automaton(keywords: list) -> dict:
+    """
+    Build an Aho-Corasick automaton for lowercase `keywords` and flatten
+    it into the arrays named in ARRAY_NAMES. Keyword ids are list indexes.
+    """
+    goto = [{}]
+    out = [[]]
+
+    for idx, keyword in enumerate(keywords):
+        state = 0
+        for ch in keyword:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][ch] = nxt
+                goto.append({})
+                out.append([])
+            state = nxt
+        out[state].append(idx)
+
+    fail = [0] * len(goto)
+    dict_link = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for ch, nxt in goto[state].items():
+            queue.append(nxt)
+
+            fallback = fail[state]
+            while fallback and ch not in goto[fallback]:
+                fallback = fail[fallback]
+            target = goto[fallback].get(ch, 0)
+            fail[nxt] = target if target != nxt else 0
+            dict_link[nxt] = fail[nxt] if out[fail[nxt]] else dict_link[fail[nxt]]
+
+    arrays = {name: array("I") for name in ARRAY_NAMES}
+    for state, edges in enumerate(goto):
+        arrays["edge_offsets"].append(len(arrays["edge_chars"]))
+        for ch in sorted(edges):
+            arrays["edge_chars"].append(ord(ch))
+            arrays["edge_targets"].append(edges[ch])
+        arrays["out_offsets"].append(len(arrays["out_ids"]))
+        arrays["out_ids"].extend(out[state])
+    arrays["edge_offsets"].append(len(arrays["edge_chars"]))
+    arrays["out_offsets"].append(len(arrays["out_ids"]))
+    arrays["fail"].extend(fail)
+    arrays["dict_link"].extend(dict_link)
+
+    for keyword in keywords:
+        arrays["kw_lengths"].append(len(keyword))
+        arrays["kw_flags"].append(
+            (1 if _is_token_char(keyword[0]) else 0)
+            | (2 if _is_token_char(keyword[-1]) else 0)
+        )
+
+    return arrays
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over lowercase keywords. `find_all` reports
+    every keyword occurrence in one left-to-right scan of the text,
+    independent of how many keywords there are, and keeps only matches
+    that sit on token boundaries at both ends.
+    """
+
+    def __init__(self, keywords: dict):
+        """
+        `keywords` maps each keyword to a payload returned with its matches
+        (e.g. its categories).
+        """
+        lowered = [k.lower() for k in keywords]
+        self._load(compile_automaton(lowered), list(keywords.values()))
+
+    @classmethod
+    def from_arrays(cls, arrays: dict, payloads):
+        """
+        Wrap precompiled arrays (e.g. memoryviews over an mmap) without
+        rebuilding anything. `payloads[i]` is returned for keyword id i.
+        """
+        matcher = cls.__new__(cls)
+        matcher._load(arrays, payloads)
+        return matcher
+
+    def _load(self, arrays: dict, payloads) -> None:
+        for name in ARRAY_NAMES:
+            setattr(self, "_" + name, arrays[name])
+        self._payloads = payloads
+
+    def _next(self, state: int, code: int) -> int:
+        lo = self._edge_offsets[state]
+        hi = self._edge_offsets[state + 1]
+        i = bisect_left(self._edge_chars, code, lo, hi)
+        if i < hi and self._edge_chars[i] == code:
+            return self._edge_targets[i]
+        return -1
+
+    def find_all(self, text: str) -> list:
+
+        text = text.lower()
+        length = len(text)
+        fail, dict_link = self._fail, self._dict_link
+        out_offsets, out_ids = self._out_offsets, self._out_ids
+        kw_lengths, kw_flags = self._kw_lengths, self._kw_flags
+        matches = []
+
+        state = 0
+        for i, ch in enumerate(text):
+            code = ord(ch)
+            nxt = self._next(state, code)
+            while nxt < 0 and state:
+                state = fail[state]
+                nxt = self._next(state, code)
+            state = nxt if nxt >= 0 else 0
+
+            emit = state if out_offsets[state] != out_offsets[state + 1] else dict_link[state]
+            while emit:
+                for j in range(out_offsets[emit], out_offsets[emit + 1]):
+                    idx = out_ids[j]
+                    start = i - kw_lengths[idx] + 1
+                    end = i + 1
+                    flags = kw_flags[idx]
+                    if flags & 1 and start > 0 and _is_token_char(text[start - 1]):
+                        continue
+                    if flags & 2 and end < length and _is_token_char(text[end]):
+                        continue
+                    matches.append(KeywordMatch(text[start:end], self._payloads[idx], start, end))
+                emit = dict_link[emit]
+
+        return matches
@@ -1,69 +1,105 @@
 import json
 from extractor.extractor import extract_resume_text
 from extractor.utils import clean_text
-from NLP_PARSER.section_detector import detect_sections
-from NLP_PARSER.skills import extract_skills
-from NLP_PARSER.experience import extract_experience
-from NLP_PARSER.achievements import extract_achievements
+from NLP_PARSER.document import ResumeDocument
+from NLP_PARSER.skills import match_skills
+from NLP_PARSER.experience import extract_experience_lines
+from NLP_PARSER.achievements import extract_achievements_lines
+from NLP_PARSER.confidence import score_sections
 from NLP_PARSER.projects import (
-    extract_projects_from_section,
-    extract_projects_from_experience
+    extract_projects_lines,
+    derive_projects_from_experience
 )
 from NLP_PARSER.LLM.llm_project_corrector import refine_projects_with_llm
 from NLP_PARSER.LLM.llm_project import extract_projects_with_llm
 
 from  NLP_PARSER.LLM.examine_projects_llm import examine_project_outputs
 from LLM_PARSER.resume_parser_llm import parse_resume_with_llm
+from metrics import timed
 
 
-def parse_resume(cleaned_text) -> dict:
-  
-  
+def parse_resume_nlp(cleaned_text) -> dict:
+    """
+    Heuristic-only pass. Returns the detected sections and a per-section
+    confidence score alongside the NLP results, so the LLM stages can be
+    scheduled (or skipped) separately. `provenance` mirrors the results
+    with the [start, end) spans in `cleaned_text` each field came from.
+    """
 
-    sections = detect_sections(cleaned_text)
+    with timed("detect_sections"):
+        document = ResumeDocument(cleaned_text)
+        sections = document.section_texts()
 
-    skills = extract_skills(sections.get("skills", ""))
+    with timed("nlp_skills"):
+        skills_span = document.section_span("skills")
+        skill_spans = {}
+        for match in match_skills(sections.get("skills", "")):
+            skill_spans.setdefault(match["skill"], []).append(
+                [skills_span[0] + match["start"], skills_span[0] + match["end"]]
+            )
+        skills = sorted(skill_spans)
 
-    experience = (
-        extract_experience(sections["experience"])
-        if sections.get("experience")
-        else []
-    )
+    with timed("nlp_experience"):
+        experience, experience_spans = extract_experience_lines(document.lines("experience"))
 
-    projects = []
-    if sections.get("projects"):
-        projects = extract_projects_from_section(sections["projects"])
+    with timed("nlp_projects"):
+        projects, project_spans = extract_projects_lines(document.lines("projects"))
 
-    if not projects:
-        projects = extract_projects_from_experience(experience)
+        if not projects:
+            projects, project_spans = derive_projects_from_experience(experience, experience_spans)
 
-    
-    nlp_projects_section = refine_projects_with_llm(
-            project_section_text=sections["projects"],
-            projects=projects
-        )
-    achievements = extract_achievements(sections.get("achievements", ""))
-    llm_projects_section=extract_projects_with_llm(sections["projects"])
-    final_decision = examine_project_outputs(
-            raw_project_section=sections["projects"],
-            nlp_projects=nlp_projects_section,
-            llm_projects=llm_projects_section
-            )
-    
-    if final_decision["selected_approach"] == "nlp_heuristic":
-        final_projects = nlp_projects_section
-    else:
-        final_projects = llm_projects_section
-        
-    return{
+    with timed("nlp_achievements"):
+        achievements, achievement_spans = extract_achievements_lines(document.lines("achievements"))
+
+    parsed = {
+        "sections": sections,
         "skills": skills,
         "experience": experience,
-        "projects": final_projects,
-        "achievements": achievements
+        "projects": projects,
+        "achievements": achievements,
+        "provenance": {
+            "skills": skill_spans,
+            "experience": experience_spans,
+            "projects": project_spans,
+            "achievements": achievement_spans
+        },
+        "document": document
     }
+    with timed("nlp_confidence"):
+        parsed["confidence"] = score_sections(document, parsed)
+    return parsed
+
+
+def select_projects(decision: dict, nlp_projects: list, llm_projects: list) -> list:
 
-   
-    
+    if decision["selected_approach"] == "nlp_heuristic":
+        return nlp_projects
+    return llm_projects
 
 
+def parse_resume(cleaned_text, with_confidence: bool = False, nlp: dict = None) -> dict:
 
+
+    nlp = nlp or parse_resume_nlp(cleaned_text)
+    project_section = nlp["sections"].get("projects", "")
+
+    nlp_projects_section = refine_projects_with_llm(
+            project_section_text=project_section,
+            projects=nlp["projects"]
+        )
+    llm_projects_section=extract_projects_with_llm(project_section)
+    final_decision = examine_project_outputs(
+            raw_project_section=project_section,
+            nlp_projects=nlp_projects_section,
+            llm_projects=llm_projects_section
+            )
+
+    result = {
+        "skills": nlp["skills"],
+        "experience": nlp["experience"],
+        "projects": select_projects(final_decision, nlp_projects_section, llm_projects_section),
+        "achievements": nlp["achievements"]
+    }
+    if with_confidence:
+        result["confidence"] = nlp["confidence"]
+    return result
@@ -1,5 +1,7 @@
 
 import re
+from NLP_PARSER.taxonomy import get_taxonomy
+from NLP_PARSER.document import map_offsets, split_lines
 
 ACTION_VERBS = [
     "built", "developed", "implemented", "designed",
@@ -19,23 +21,8 @@ PROJECT_TITLE_HINTS = [
 
 
 
-TECH_HINTS = [
-    "python", "java", "javascript", "typescript",
-    "c++", "c#", "go", "php", "ruby",
-    "react", "angular", "vue", "html", "css",
-    "flask", "django", "fastapi", "spring",
-    "node", "express",
-
-    "mysql", "postgres", "mongodb", "redis",
-    
-    "docker", "kubernetes", "aws", "azure", "gcp",
- 
-    "machine learning", "ml", "deep learning",
-    "nlp", "rag", "tensorflow", "pytorch",
-    "xgboost", "lstm", "cnn", "transformer",
-
-    "git", "github", "ci/cd", "linux"
-]
+# Taxonomy categories that are not part of a project's tech stack.
+NON_TECH_CATEGORIES = {"soft_skills", "methodologies", "programming_concepts"}
 
 
 
@@ -91,71 +78,104 @@ def looks_like_wrapped_line(line: str) -> bool:
     )
 
 
-def extract_tech_stack(text: str) -> list:
- 
-    found = set()
-    lower = text.lower()
+def match_tech_stack(text: str) -> list:
+    """
+    (skill, start, end) for the first occurrence of each tech skill in
+    `text`, sorted by skill.
+    """
+    first = {}
+    for m in get_taxonomy().find_all(text):
+        if not NON_TECH_CATEGORIES.issuperset(m["categories"]):
+            first.setdefault(m["skill"], (m["skill"], m["start"], m["end"]))
+    return [first[skill] for skill in sorted(first)]
 
-    for tech in TECH_HINTS:
-        if re.search(r"\b" + re.escape(tech) + r"\b", lower):
-            found.add(tech.title())
 
-    return sorted(found)
+def extract_tech_stack(text: str) -> list:
+ 
+    return [skill for skill, _, _ in match_tech_stack(text)]
 
 
 def extract_projects_from_section(text: str) -> list:
+    return extract_projects_lines(split_lines(text))[0]
 
+
+def extract_projects_lines(lines: list) -> tuple:
+    """
+    Projects from stripped `Line`s, plus a parallel list with the source
+    spans of every field.
+    """
     projects = []
-    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    spans = []
 
     current = None
+    current_spans = None
     collecting_description = False
 
     for line in lines:
 
-        if current and looks_like_wrapped_line(line):
-            current["description"] += " " + line
+        if current and looks_like_wrapped_line(line.text):
+            current["description"] += " " + line.text
+            current_spans["description"].append(line.span)
             collecting_description = True
             continue
 
-        if is_project_title(line) and not collecting_description:
+        if is_project_title(line.text) and not collecting_description:
             if current:
                 projects.append(current)
+                spans.append(current_spans)
 
             current = {
-                "name": line,
+                "name": line.text,
                 "description": "",
                 "tech_stack": []
             }
+            current_spans = {
+                "name": [line.span],
+                "description": [],
+                "tech_stack": []
+            }
             collecting_description = False
             continue
 
-        if current and is_tech_line(line):
-            current["tech_stack"].extend(extract_tech_stack(line))
+        if current and is_tech_line(line.text):
+            for skill, start, end in match_tech_stack(line.text):
+                current["tech_stack"].append(skill)
+                current_spans["tech_stack"].append([[line.start + start, line.start + end]])
             continue
 
         if current:
             clean = line.lstrip("•- ").strip()
-            if clean:
+            if clean.text:
                 current["description"] += (
-                    " " + clean if current["description"] else clean
+                    " " + clean.text if current["description"] else clean.text
                 )
+                current_spans["description"].append(clean.span)
                 collecting_description = True
 
     if current:
         projects.append(current)
+        spans.append(current_spans)
 
-    return projects
+    return projects, spans
 
 
 def extract_projects_from_experience(experience: list) -> list:
     """
     Fallback project extraction from experience bullets.
     """
+    return derive_projects_from_experience(experience)[0]
+
+
+def derive_projects_from_experience(experience: list, experience_spans: list = None) -> tuple:
+    """
+    Projects derived from experience bullets and, when `experience_spans`
+    is given, their source spans.
+    """
     projects = []
+    spans = []
 
-    for exp in experience:
-        for bullet in exp.get("responsibilities", []):
+    for i, exp in enumerate(experience):
+        for j, bullet in enumerate(exp.get("responsibilities", [])):
             clean = bullet.lstrip("•- ").strip()
             lower = clean.lower()
 
@@ -163,10 +183,23 @@ def extract_projects_from_experience(experience: list) -> list:
                 any(v in lower for v in ACTION_VERBS)
                 and any(h in lower for h in PROJECT_TITLE_HINTS)
             ):
+                tech = match_tech_stack(clean)
                 projects.append({
                     "name": "Derived Project",
                     "description": clean,
-                    "tech_stack": extract_tech_stack(clean)
+                    "tech_stack": [skill for skill, _, _ in tech]
                 })
 
-    return projects
+                if experience_spans is not None:
+                    source = experience_spans[i]["responsibilities"][j]
+                    lead = len(bullet) - len(bullet.lstrip("•- ").lstrip())
+                    spans.append({
+                        "name": [],
+                        "description": map_offsets(source, lead, lead + len(clean)),
+                        "tech_stack": [
+                            map_offsets(source, lead + start, lead + end)
+                            for _, start, end in tech
+                        ]
+                    })
+
+    return projects, spans
@@ -1,19 +1,20 @@
 
 import re
 
+from NLP_PARSER.taxonomy import get_taxonomy
+
 SECTION_HEADERS = {
     "skills": [
-        "skills", "technical skills", "technologies", "tech stack","tech skills", "skill set",
-        "tools"
+        "skills", "technical skills", "technologies", "tech stack", "tech skills",
+        "skill set", "tools"
     ],
     "experience": [
-        "experience","internships", "professional experience", "work experience", "professional experience",
-        "employment", "industry experience","Work History",'work history'
+        "experience", "internships", "professional experience", "work experience",
+        "employment", "industry experience", "work history"
     ],
     "projects": [
         "projects", "academic projects", "personal projects",
-         "project", "project work", "key projects",
-        "academic projects", "project experience"
+        "project", "project work", "key projects", "project experience"
     ],
     "education": [
         "education", "academic background", "qualification"
@@ -21,55 +22,191 @@ SECTION_HEADERS = {
     "achievements": [
         "achievements", "awards", "certifications",
         "achievements & certificates", "honors", "recognition",
-        "certifications", "accomplishments","Achievements & Certificates",'ACHIEVEMENTS & CERTIFICATES','achievements & certificates'
+        "accomplishments"
     ],
     "summary": [
         "summary", "profile", "objective"
     ]
 }
 
+# Fuzzy matching only looks at short lines and tolerates one edit for
+# headers of at least FUZZY_MIN_LENGTH characters. Below
+# FUZZY_TWO_EDITS_MIN_LENGTH that edit may not swap one letter for another
+# ("Protects" is a word, not a typo of "projects"); from there on two
+# edits of any kind are allowed.
+FUZZY_MAX_WORDS = 4
+FUZZY_MIN_LENGTH = 7
+FUZZY_TWO_EDITS_MIN_LENGTH = 10
+
+# Digits and symbols OCR commonly reads letters as (o, i/l, s, s, a).
+# In fuzzy matching each one stands for any letter.
+_OCR_CONFUSIONS = re.compile(r"[015$@]")
+_OCR_WILDCARD = "?"
 
 
 def normalize(text: str) -> str:
-    return re.sub(r"[^a-z& ]", "", text.lower()).strip()
+    text = re.sub(r"[^a-z& ]", "", text.lower())
+    text = re.sub(r"\band\b", "&", text)
+    return " ".join(text.split())
+
+
+def _fuzzy_normalize(text: str) -> str:
+    text = _OCR_CONFUSIONS.sub(_OCR_WILDCARD, text.lower())
+    text = re.sub(r"[^a-z&? ]", "", text)
+    text = re.sub(r"\band\b", "&", text)
+    return " ".join(text.split())
+
+
+def _max_edits(header: str) -> int:
+    if len(header) < FUZZY_MIN_LENGTH:
+        return 0
+    return 2 if len(header) >= FUZZY_TWO_EDITS_MIN_LENGTH else 1
+
+
+def _deletes(word: str, depth: int) -> set:
+    """
+    `word` and every string reachable from it by up to `depth` deletions.
+    """
+    variants = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+def _edit_distance(a: str, b: str, letter_substitutions: bool = True) -> int:
+    # Optimal string alignment: Levenshtein plus adjacent transpositions.
+    # Without letter_substitutions, swapping one letter for another costs
+    # two edits; an OCR wildcard in `a` still stands for any one letter.
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            if a[i - 1] == b[j - 1]:
+                cost = 0
+            elif a[i - 1] == _OCR_WILDCARD or letter_substitutions:
+                cost = 1
+            else:
+                cost = 2
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _build_indexes() -> tuple:
+    exact = {}
+    fuzzy = {}
+    for section, headers in SECTION_HEADERS.items():
+        for header in headers:
+            key = normalize(header)
+            exact.setdefault(key, section)
+            for variant in _deletes(key, _max_edits(key)):
+                fuzzy.setdefault(variant, set()).add(key)
+    return exact, fuzzy
+
+
+# normalized header -> section, and deletion variant -> normalized headers
+HEADER_INDEX, FUZZY_INDEX = _build_indexes()
+_FUZZY_MAX_LENGTH = max(len(k) for k in HEADER_INDEX) + 2
+
+
+def _fuzzy_match(norm: str):
+    """
+    Symmetric-delete lookup: a header within k edits of `norm` shares a
+    deletion variant with it, so only those few candidates are scored.
+    """
+    if not FUZZY_MIN_LENGTH - 1 <= len(norm) <= _FUZZY_MAX_LENGTH:
+        return None
+
+    candidates = set()
+    for variant in _deletes(norm, 2):
+        candidates |= FUZZY_INDEX.get(variant, set())
+
+    best, best_distance = None, None
+    for header in sorted(candidates):
+        distance = _edit_distance(
+            norm, header, letter_substitutions=len(header) >= FUZZY_TWO_EDITS_MIN_LENGTH
+        )
+        if distance <= _max_edits(header) and (best_distance is None or distance < best_distance):
+            best, best_distance = header, distance
+    return HEADER_INDEX[best] if best else None
+
+
+def _looks_like_header(line: str) -> bool:
+    # Ignore OCR digits for the case check: "Educat1on" is title case.
+    line = _OCR_CONFUSIONS.sub("", line)
+    letters = [ch for ch in line if ch.isalpha()]
+    return (
+        bool(letters)
+        and len(line.split()) <= FUZZY_MAX_WORDS
+        and (line.rstrip().endswith(":") or line.isupper() or line.istitle())
+    )
 
 
 def match_section_header(line: str):
-    norm = normalize(line)
-
-    for section, headers in SECTION_HEADERS.items():
-        for h in headers:
-            if norm == h:
+    """
+    Section name for a header line, or None. Exact normalized lookup
+    first, then each part of a combined header ("PROJECTS / PERSONAL
+    WORK"), then a bounded fuzzy tier for short header-like lines.
+    """
+    section = HEADER_INDEX.get(normalize(line))
+    if section:
+        return section
+
+    if not _looks_like_header(line):
+        return None
+
+    parts = re.split(r"[/|]", line)
+    if len(parts) > 1:
+        for part in parts:
+            section = HEADER_INDEX.get(normalize(part))
+            if section:
                 return section
-    return None
 
+    for part in parts:
+        section = _fuzzy_match(_fuzzy_normalize(part))
+        if section:
+            # A line naming a skill ("Objective-C") is content, not a
+            # typo. Checked last: most header-like lines match nothing.
+            return None if get_taxonomy().find_all(line) else section
+    return None
 
 
 
-def detect_sections(text: str) -> dict:
 
-    lines = [l.strip() for l in text.split("\n") if l.strip()]
-    sections = {}
+def detect_section_ranges(lines: list) -> dict:
+    """
+    Section name -> (first, end) indexes into `lines` (stripped,
+    non-empty) of the body under each header. A repeated header keeps
+    the last occurrence; an empty trailing section is dropped.
+    """
+    ranges = {}
     current_section = None
-    buffer = []
+    first = 0
 
-    for line in lines:
+    for i, line in enumerate(lines):
         detected = match_section_header(line)
 
         if detected:
-        
             if current_section:
-                sections[current_section] = "\n".join(buffer)
+                ranges[current_section] = (first, i)
 
             current_section = detected
-            buffer = []
-            continue
+            first = i + 1
 
-        if current_section:
-            buffer.append(line)
+    if current_section and first < len(lines):
+        ranges[current_section] = (first, len(lines))
 
+    return ranges
 
-    if current_section and buffer:
-        sections[current_section] = "\n".join(buffer)
 
-    return sections
+def detect_sections(text: str) -> dict:
+
+    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    return {
+        section: "\n".join(lines[first:end])
+        for section, (first, end) in detect_section_ranges(lines).items()
+    }
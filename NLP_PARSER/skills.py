@@ -1,59 +1,23 @@
 
-import re
-
-SKILL_CATEGORIES = {
-    "programming_languages": [
-        "python", "java", "c", "c++", "c#", "javascript", "typescript",
-        "go", "rust", "php", "ruby", "kotlin", "swift", "scala"
-    ],
-    "backend_frameworks": [
-        "flask", "django", "fastapi", "spring", "spring boot",
-        "node.js", "express", "nestjs"
-    ],
-    "frontend_technologies": [
-        "html", "css", "javascript", "react", "angular", "vue",
-        "next.js", "tailwind", "bootstrap"
-    ],
-    "databases": [
-        "mysql", "postgresql", "sqlite", "mongodb", "redis",
-        "oracle", "sql server", "cassandra"
-    ],
-    "devops_cloud": [
-        "docker", "kubernetes", "aws", "azure", "gcp",
-        "terraform", "jenkins", "github actions", "ci/cd"
-    ],
-    "ml_ai": [
-        "machine learning", "deep learning", "nlp", "computer vision",
-        "tensorflow", "pytorch", "scikit-learn", "keras",
-        "llm", "rag", "transformers"
-    ],
-    "data_tools": [
-        "pandas", "numpy", "matplotlib", "seaborn", "spark",
-        "hadoop", "airflow"
-    ],
-    "tools_platforms": [
-        "git", "github", "gitlab", "linux", "bash",
-        "postman", "jira", "confluence"
-    ],
-    "apis_protocols": [
-        "rest", "rest api", "graphql", "grpc", "soap"
-    ]
-}
 
+from NLP_PARSER.taxonomy import get_taxonomy
 
-def extract_skills(text: str) -> list:
-   
-
+def match_skills(text: str) -> list:
+    """
+    Every skill occurrence in `text`, resolved through the taxonomy to
+    its canonical name, with the alias that matched, its categories and
+    offsets.
+    """
     if not text:
         return []
 
-    text_lower = text.lower()
-    found_skills = set()
+    return get_taxonomy().find_all(text)
+
+
+def extract_skills(text: str) -> list:
+
 
-    for _, skills in SKILL_CATEGORIES.items():
-        for skill in skills:
-            pattern = r"\b" + re.escape(skill) + r"\b"
-            if re.search(pattern, text_lower):
-                found_skills.add(skill.title())
+    if not text:
+        return []
 
-    return sorted(found_skills)
+    return sorted({m["skill"] for m in get_taxonomy().find_all(text)})
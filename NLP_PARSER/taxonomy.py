@@ -0,0 +1,269 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import logging
+import threading
+from array import array
+from dotenv import load_dotenv
+
+from NLP_PARSER.keyword_matcher import ARRAY_NAMES, KeywordMatcher, compile_automaton
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skill_taxonomy.tsv")
+)
+SKILL_TAXONOMY_INDEX_PATH = os.getenv("SKILL_TAXONOMY_INDEX_PATH", "./cache/skill_taxonomy.idx")
+
+# Bump when the index layout or the matcher arrays change.
+INDEX_VERSION = 1
+_MAGIC = b"SKIX"
+
+# Arrays stored after the matcher's own: keyword id -> canonical id,
+# canonical id -> categories (CSR) and canonical id -> name in the blob.
+TAXONOMY_ARRAYS = ("kw_canonical", "cat_offsets", "cat_ids", "name_offsets")
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_taxonomy(path: str) -> tuple:
+    """
+    Parse the TSV (canonical, category, "|"-separated aliases). Returns
+    (canonical names, category names, categories per canonical, alias ->
+    canonical id). The first canonical to claim an alias keeps it.
+    """
+    canonicals, categories = [], []
+    canonical_ids, category_ids = {}, {}
+    canonical_categories = []
+    aliases = {}
+
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+
+            fields = line.split("\t")
+            if len(fields) < 2:
+                raise ValueError(f"{path}:{lineno}: expected canonical<TAB>category<TAB>aliases")
+            canonical, category = fields[0].strip(), fields[1].strip()
+            extra = fields[2].split("|") if len(fields) > 2 else []
+
+            cid = canonical_ids.get(canonical)
+            if cid is None:
+                cid = canonical_ids[canonical] = len(canonicals)
+                canonicals.append(canonical)
+                canonical_categories.append([])
+
+            if category not in category_ids:
+                category_ids[category] = len(categories)
+                categories.append(category)
+            if category_ids[category] not in canonical_categories[cid]:
+                canonical_categories[cid].append(category_ids[category])
+
+            for alias in [canonical] + extra:
+                alias = alias.strip().lower()
+                if not alias:
+                    continue
+                owner = aliases.setdefault(alias, cid)
+                if owner != cid:
+                    logger.warning(
+                        "%s:%d: alias '%s' already maps to '%s'",
+                        path, lineno, alias, canonicals[owner]
+                    )
+
+    return canonicals, categories, canonical_categories, aliases
+
+
+def build_index(source_path: str) -> bytes:
+    """
+    Compile the TSV into the on-disk index: magic, header length, JSON
+    header, then 4-byte aligned uint32 arrays and the UTF-8 name blob.
+    """
+    canonicals, categories, canonical_categories, aliases = read_taxonomy(source_path)
+    keywords = list(aliases)
+
+    arrays = compile_automaton(keywords)
+    arrays["kw_canonical"] = array("I", (aliases[k] for k in keywords))
+    arrays["cat_offsets"] = array("I", [0])
+    arrays["cat_ids"] = array("I")
+    arrays["name_offsets"] = array("I", [0])
+
+    names = bytearray()
+    for cid, canonical in enumerate(canonicals):
+        arrays["cat_ids"].extend(canonical_categories[cid])
+        arrays["cat_offsets"].append(len(arrays["cat_ids"]))
+        names += canonical.encode("utf-8")
+        arrays["name_offsets"].append(len(names))
+
+    header = {
+        "version": INDEX_VERSION,
+        "byteorder": sys.byteorder,
+        "source_sha256": _file_sha256(source_path),
+        "skills": len(canonicals),
+        "aliases": len(keywords),
+        "categories": categories,
+        "arrays": {},
+        "names": None
+    }
+
+    # Offsets are relative to the end of the header, so they can be
+    # fixed before the header's own length is known.
+    body = bytearray()
+    for name in ARRAY_NAMES + TAXONOMY_ARRAYS:
+        header["arrays"][name] = [len(body), len(arrays[name])]
+        body += arrays[name].tobytes()
+    header["names"] = [len(body), len(names)]
+    body += names
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_bytes += b" " * (-(8 + len(header_bytes)) % 4)
+    return _MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes + bytes(body)
+
+
+def write_index(source_path: str, index_path: str) -> None:
+
+    data = build_index(source_path)
+
+    directory = os.path.dirname(index_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, index_path)
+
+
+def _read_header(buffer) -> tuple:
+
+    if bytes(buffer[:4]) != _MAGIC:
+        raise ValueError("not a skill taxonomy index")
+    (length,) = struct.unpack("<I", bytes(buffer[4:8]))
+    return json.loads(bytes(buffer[8:8 + length])), 8 + length
+
+
+class SkillTaxonomy:
+    """
+    Compiled skill taxonomy. Every array is a memoryview over the index
+    buffer (normally an mmap), so loading costs the same no matter how
+    many skills and aliases the taxonomy holds, and the pages are shared
+    between worker processes.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self.header, base = _read_header(buffer)
+
+        view = memoryview(buffer)
+        arrays = {}
+        for name, (offset, count) in self.header["arrays"].items():
+            arrays[name] = view[base + offset:base + offset + 4 * count].cast("I")
+
+        offset, length = self.header["names"]
+        self._names = view[base + offset:base + offset + length]
+        self._name_offsets = arrays["name_offsets"]
+        self._cat_offsets = arrays["cat_offsets"]
+        self._cat_ids = arrays["cat_ids"]
+        self.categories = self.header["categories"]
+
+        # Match payloads are canonical ids, read straight from the index.
+        self.matcher = KeywordMatcher.from_arrays(arrays, arrays["kw_canonical"])
+
+    @classmethod
+    def load(cls, index_path: str):
+
+        with open(index_path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    def __len__(self) -> int:
+        return self.header["skills"]
+
+    def canonical(self, cid: int) -> str:
+        start, end = self._name_offsets[cid], self._name_offsets[cid + 1]
+        return bytes(self._names[start:end]).decode("utf-8")
+
+    def categories_of(self, cid: int) -> list:
+        start, end = self._cat_offsets[cid], self._cat_offsets[cid + 1]
+        return [self.categories[self._cat_ids[i]] for i in range(start, end)]
+
+    def find_all(self, text: str) -> list:
+        """
+        Every alias occurrence in `text`, resolved to its canonical skill.
+        """
+        return [
+            {
+                "skill": self.canonical(m.payload),
+                "alias": m.keyword,
+                "categories": self.categories_of(m.payload),
+                "start": m.start,
+                "end": m.end
+            }
+            for m in self.matcher.find_all(text)
+        ]
+
+
+def _index_is_current(index_path: str, source_sha256: str) -> bool:
+
+    try:
+        with open(index_path, "rb") as f:
+            prefix = f.read(8)
+            (length,) = struct.unpack("<I", prefix[4:8])
+            header, _ = _read_header(prefix + f.read(length))
+    except (OSError, ValueError, struct.error):
+        return False
+    return (
+        header.get("version") == INDEX_VERSION
+        and header.get("byteorder") == sys.byteorder
+        and header.get("source_sha256") == source_sha256
+    )
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """
+    The shared taxonomy, loaded lazily. The index is rebuilt only when it
+    is missing or was compiled from a different version of the TSV; if
+    the index directory is not writable the compiled bytes are used from
+    memory instead.
+    """
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                source_sha256 = _file_sha256(SKILL_TAXONOMY_PATH)
+                if not _index_is_current(SKILL_TAXONOMY_INDEX_PATH, source_sha256):
+                    logger.info("compiling skill taxonomy index %s", SKILL_TAXONOMY_INDEX_PATH)
+                    try:
+                        write_index(SKILL_TAXONOMY_PATH, SKILL_TAXONOMY_INDEX_PATH)
+                    except OSError as e:
+                        logger.warning("skill taxonomy index not written (%s); using it from memory", e)
+                        _taxonomy = SkillTaxonomy(build_index(SKILL_TAXONOMY_PATH))
+                        return _taxonomy
+                _taxonomy = SkillTaxonomy.load(SKILL_TAXONOMY_INDEX_PATH)
+    return _taxonomy
+
+
+if __name__ == "__main__":
+    # Precompile at deploy time: python -m NLP_PARSER.taxonomy [tsv] [index]
+    source = sys.argv[1] if len(sys.argv) > 1 else SKILL_TAXONOMY_PATH
+    target = sys.argv[2] if len(sys.argv) > 2 else SKILL_TAXONOMY_INDEX_PATH
+    write_index(source, target)
+    taxonomy = SkillTaxonomy.load(target)
+    print(f"{target}: {len(taxonomy)} skills, {taxonomy.header['aliases']} aliases")
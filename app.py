@@ -1,15 +1,50 @@
 from flask import Flask,request
-from NLP_PARSER.main import parse_resume
-from LLM_PARSER.resume_parser_llm import parse_resume_with_llm
-from extractor.extractor import extract_resume_text
-from extractor.utils import clean_text
-from resume_examiner_llm import examine_resume_outputs
+from extractor.cache import copy_and_hash, extract_cached, extraction_cache
+from extractor.pdf import PDF_TIER, PDF_TIERS
+from pipeline import run_pipeline, PARSE_MODE, PARSE_MODES
+from LLM_PARSER.response_cache import get_response_cache
+from LLM_PARSER.preflight import start_tokenizer_load
+from jobs import JOB_WORKERS, job_queue, start_workers, validate_callback_url
+import metrics
+import profiling
 import json
 import os
+import shutil
+import tempfile
 
 app=Flask(__name__)
 UPLOAD_FOLDER = "./uploads"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Larger request bodies get a 413 before anything is read into memory.
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES
+# Uploads stay in memory up to this size, then spill to an anonymous temp file.
+UPLOAD_SPOOL_MAX_BYTES = int(os.getenv("UPLOAD_SPOOL_MAX_BYTES", str(8 * 1024 * 1024)))
+# Keep a copy of every upload, named by content hash, under UPLOAD_FOLDER.
+ARCHIVE_UPLOADS = os.getenv("ARCHIVE_UPLOADS", "0") == "1"
+if ARCHIVE_UPLOADS:
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+
+def start_background():
+    """
+    Start this process's background work: the job workers, so jobs left
+    queued or running by a previous process are picked up without
+    waiting for a new submission, and the tokenizer load. Called by the
+    entry points (wsgi.py, `python app.py`), never at import.
+    """
+    start_tokenizer_load()
+    if JOB_WORKERS > 0:
+        start_workers()
+
+
+def _archive_upload(upload, digest, filename):
+    ext = os.path.splitext(filename)[1].lower()
+    path = os.path.join(UPLOAD_FOLDER, f"{digest}{ext}")
+    if not os.path.exists(path):
+        upload.seek(0)
+        with open(path, "wb") as out:
+            shutil.copyfileobj(upload, out)
+    upload.seek(0)
 
 
 @app.route('/resume_parser',methods=['POST'])
@@ -19,33 +54,127 @@ def main():
     except Exception as e:
         raise e  
       
-    if resume:
-        #resume.save(f"./uploads/{resume.filename}")
-        file_path = os.path.join(UPLOAD_FOLDER, resume.filename)
-        resume.save(file_path)
+    mode = request.args.get('mode') or request.form.get('mode') or PARSE_MODE
+    if mode not in PARSE_MODES:
+        return f"Unknown mode '{mode}'. Use one of: {', '.join(PARSE_MODES)}.", 400
+
+    pdf_tier = request.args.get('pdf_tier') or request.form.get('pdf_tier') or PDF_TIER
+    if pdf_tier not in PDF_TIERS:
+        return f"Unknown pdf_tier '{pdf_tier}'. Use one of: {', '.join(PDF_TIERS)}.", 400
 
-    else:
+    if not resume:
         return "NO files are recived."
+    profile_requested = (
+        request.headers.get(profiling.PROFILE_HEADER) == '1'
+        or request.args.get('profile') == '1'
+    )
+    timings = metrics.start_request()
     try:
-        
-        raw_text=extract_resume_text(f'./uploads/{resume.filename}')
-        cleaned_text=clean_text(raw_text)
-        nlp_parsed_resume=parse_resume(cleaned_text)
-        llm_parsed_resume=parse_resume_with_llm(cleaned_text)
-        decision = examine_resume_outputs(
-            raw_resume_text=cleaned_text,
-            nlp_resume_json=nlp_parsed_resume,
-            llm_resume_json=llm_parsed_resume
-        )
-        final_resume = (
-            nlp_parsed_resume
-            if decision["selected_approach"] == "nlp_heuristic"
-            else llm_parsed_resume
+        profile = profiling.profile_request(
+            profile_requested,
+            filename=resume.filename,
+            mode=mode,
+            pdf_tier=pdf_tier
         )
+        with profile as run:
+            with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_BYTES) as upload:
+                with metrics.timed("upload_save"):
+                    digest = copy_and_hash(resume.stream, upload)
+                    if ARCHIVE_UPLOADS:
+                        _archive_upload(upload, digest, resume.filename)
+
+                if run:
+                    run.digest = digest
+                # A profiled request extracts for real and runs its stages
+                # on this thread, so the profile sees all of the work.
+                document = extract_cached(
+                    upload, digest, filename=resume.filename, pdf_tier=pdf_tier, use_cache=not run
+                )
+
+            with metrics.timed("pipeline"):
+                final_resume=run_pipeline(
+                    document["cleaned_text"], mode=mode, concurrent=False if run else None
+                )
+
+        headers = {"X-Extraction-Engine": document["engine"]}
+        if document.get("error"):
+            # Partial OCR: the result covers only the pages that were read.
+            headers["X-Extraction-Error"] = document["error"]
+        if run and run.name:
+            headers["X-Profile-Id"] = run.name
+        if metrics.METRICS_TIMING_HEADER or request.args.get('timings') == '1':
+            headers["Server-Timing"] = metrics.server_timing_header(metrics.request_timings())
 
-        return json.dumps(final_resume, indent=4, ensure_ascii=False)
+        return (
+            json.dumps(final_resume, indent=4, ensure_ascii=False),
+            200,
+            headers
+        )
     except Exception as e:
         raise e
+    finally:
+        metrics.end_request(timings)
+
+@app.route('/jobs',methods=['POST'])
+def submit_job():
+    resume=request.files.get('resume')
+    if not resume:
+        return "NO files are recived.", 400
+    # Chunked uploads carry no Content-Length for MAX_CONTENT_LENGTH to check.
+    payload = resume.read(MAX_UPLOAD_BYTES + 1)
+    if len(payload) > MAX_UPLOAD_BYTES:
+        return f"Upload exceeds MAX_UPLOAD_BYTES ({MAX_UPLOAD_BYTES}).", 413
+
+    mode = request.args.get('mode') or request.form.get('mode') or PARSE_MODE
+    if mode not in PARSE_MODES:
+        return f"Unknown mode '{mode}'. Use one of: {', '.join(PARSE_MODES)}.", 400
+
+    pdf_tier = request.args.get('pdf_tier') or request.form.get('pdf_tier') or PDF_TIER
+    if pdf_tier not in PDF_TIERS:
+        return f"Unknown pdf_tier '{pdf_tier}'. Use one of: {', '.join(PDF_TIERS)}.", 400
+
+    callback_url = request.form.get('callback_url')
+    if callback_url:
+        try:
+            validate_callback_url(callback_url)
+        except ValueError as e:
+            return str(e), 400
+
+    job_id = job_queue.submit(
+        filename=resume.filename,
+        payload=payload,
+        mode=mode,
+        callback_url=callback_url,
+        pdf_tier=pdf_tier
+    )
+    return json.dumps({"job_id": job_id, "status": "queued"}), 202
+
+@app.route('/jobs/<job_id>',methods=['GET'])
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return "Job not found.", 404
+    return json.dumps(job, indent=4, ensure_ascii=False)
+
+@app.route('/cache/stats',methods=['GET'])
+def cache_stats():
+    return json.dumps({
+        "extraction": extraction_cache.stats(),
+        "llm_responses": get_response_cache().stats()
+    }, indent=4)
+
+@app.route('/metrics',methods=['GET'])
+def prometheus_metrics():
+    return (
+        metrics.render({
+            "extraction": extraction_cache.stats(),
+            "llm_response": get_response_cache().stats()
+        }),
+        200,
+        {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+    )
 
-if __name__=='__main__':   
-    app.run(debug=True) 
\ No newline at end of file
+if __name__=='__main__':
+    start_background()
+    # The reloader would start a second copy of the workers in its parent.
+    app.run(debug=True, use_reloader=False) 
\ No newline at end of file
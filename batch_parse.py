@@ -0,0 +1,218 @@
+"""
+Offline batch parser.
+
+    python batch_parse.py ./archive --output parsed.jsonl
+    python batch_parse.py --manifest files.txt --output parsed.jsonl --mode fast
+
+Extraction and the heuristic parse fan out over a process pool in every
+mode; the LLM stages run on a separate, smaller thread pool so remote
+concurrency stays bounded no matter how many CPU workers are used. Every finished document
+is appended to the output JSONL; successes are also recorded in a
+checkpoint file, so an interrupted run picks up where it stopped and a
+re-run retries the documents that failed.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    FIRST_COMPLETED,
+    wait
+)
+
+from extractor.extractor import SUPPORTED_EXTENSIONS
+from extractor.pdf import PDF_TIER, PDF_TIERS
+from extractor.cache import extract_cached
+from NLP_PARSER.main import parse_resume_nlp
+from pipeline import run_pipeline, PARSE_MODE, PARSE_MODES
+
+
+def _iter_inputs(args):
+
+    if args.manifest:
+        with open(args.manifest, "r", encoding="utf-8") as f:
+            for line in f:
+                path = line.strip()
+                if path and not path.startswith("#"):
+                    yield path
+        return
+
+    for root, _, files in os.walk(args.input):
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                yield os.path.join(root, name)
+
+
+def _load_checkpoint(path: str) -> set:
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def _extract_document(path: str, mode: str, pdf_tier: str) -> dict:
+    """
+    Runs in a worker process: hash, extract (through the shared
+    extraction cache) and the heuristic parse. In fast mode that is the
+    whole result; otherwise the parse is handed on to the LLM stages.
+    """
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+
+    extracted = extract_cached(path, digest, pdf_tier=pdf_tier)
+    document = {
+        "path": path,
+        "sha256": digest,
+        "pages": extracted["pages"],
+        "engine": extracted["engine"],
+        "extraction_error": extracted.get("error"),
+        "cleaned_text": extracted["cleaned_text"]
+    }
+    nlp = parse_resume_nlp(document["cleaned_text"])
+    if mode == "fast":
+        document["result"] = run_pipeline(document["cleaned_text"], mode="fast", nlp=nlp)
+    else:
+        document["nlp"] = nlp
+    return document
+
+
+def _parse_with_llm(document: dict, mode: str) -> dict:
+    document["result"] = run_pipeline(document["cleaned_text"], mode=mode, nlp=document.pop("nlp"))
+    return document
+
+
+class _Writer:
+
+    def __init__(self, output_path: str, checkpoint_path: str):
+        self.out = open(output_path, "a", encoding="utf-8")
+        self.checkpoint = open(checkpoint_path, "a", encoding="utf-8")
+        self.docs = 0
+        self.pages = 0
+        self.errors = 0
+
+    def write(self, path: str, document: dict = None, error: str = None) -> None:
+        if error is None:
+            record = {
+                "path": path,
+                "sha256": document["sha256"],
+                "pages": document["pages"],
+                "engine": document["engine"],
+                "result": document["result"]
+            }
+            if document["extraction_error"]:
+                record["extraction_error"] = document["extraction_error"]
+            self.docs += 1
+            self.pages += document["pages"]
+        else:
+            record = {"path": path, "error": error}
+            self.errors += 1
+
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.out.flush()
+        # Failures stay off the checkpoint so the next run retries them.
+        if error is None:
+            self.checkpoint.write(path + "\n")
+            self.checkpoint.flush()
+
+    def close(self) -> None:
+        self.out.close()
+        self.checkpoint.close()
+
+
+def run_batch(args) -> dict:
+
+    checkpoint_path = args.checkpoint or args.output + ".checkpoint"
+    done = _load_checkpoint(checkpoint_path)
+    inputs = list(_iter_inputs(args))
+    remaining = [p for p in inputs if p not in done]
+    todo = iter(remaining)
+
+    writer = _Writer(args.output, checkpoint_path)
+    started = time.perf_counter()
+
+    # Cap how far extraction may run ahead of the LLM stages.
+    max_pending = max(args.workers, args.llm_concurrency) * 4
+
+    with ProcessPoolExecutor(max_workers=args.workers) as cpu_pool, \
+            ThreadPoolExecutor(max_workers=args.llm_concurrency) as llm_pool:
+
+        pending = {}
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                path = next(todo, None)
+                if path is None:
+                    exhausted = True
+                    break
+                future = cpu_pool.submit(_extract_document, path, args.mode, args.pdf_tier)
+                pending[future] = ("extract", path)
+
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, path = pending.pop(future)
+                try:
+                    document = future.result()
+                except Exception as e:
+                    writer.write(path, error=f"{stage}: {e}")
+                    continue
+
+                if "result" in document:
+                    writer.write(path, document)
+                else:
+                    llm_future = llm_pool.submit(_parse_with_llm, document, args.mode)
+                    pending[llm_future] = ("llm", path)
+
+    writer.close()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "documents": writer.docs,
+        "pages": writer.pages,
+        "errors": writer.errors,
+        # Checkpointed paths no longer in the input do not count.
+        "skipped": len(inputs) - len(remaining),
+        "seconds": round(elapsed, 2),
+        "docs_per_sec": round(writer.docs / elapsed, 3) if elapsed else 0.0,
+        "pages_per_sec": round(writer.pages / elapsed, 3) if elapsed else 0.0
+    }
+
+
+def main(argv=None) -> int:
+
+    parser = argparse.ArgumentParser(description="Parse a directory of resumes to JSONL.")
+    parser.add_argument("input", nargs="?", help="Directory to walk for .pdf/.png/.jpg/.jpeg files.")
+    parser.add_argument("--manifest", help="File with one resume path per line (instead of a directory).")
+    parser.add_argument("--output", required=True, help="JSONL file results are appended to.")
+    parser.add_argument("--checkpoint", help="Progress file (default: <output>.checkpoint).")
+    parser.add_argument("--mode", default=PARSE_MODE, choices=PARSE_MODES)
+    parser.add_argument("--pdf-tier", default=PDF_TIER, choices=PDF_TIERS,
+                        help="PDF text engine: auto (fast with pdfminer fallback), fast or pdfminer.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes for extraction and heuristic parsing.")
+    parser.add_argument("--llm-concurrency", type=int, default=4,
+                        help="Documents allowed in the LLM stages at once.")
+    args = parser.parse_args(argv)
+
+    if not args.input and not args.manifest:
+        parser.error("give an input directory or --manifest")
+
+    stats = run_batch(args)
+    print(
+        f"{stats['documents']} docs, {stats['pages']} pages, {stats['errors']} errors "
+        f"({stats['skipped']} already done) in {stats['seconds']}s: "
+        f"{stats['docs_per_sec']} docs/sec, {stats['pages_per_sec']} pages/sec",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Microbenchmarks for the NLP_PARSER hot paths over a synthetic corpus.
+
+    python -m benchmarks.bench_nlp run --output benchmarks/baselines/nlp_parser.json
+    python -m benchmarks.bench_nlp compare benchmarks/baselines/nlp_parser.json
+    python -m benchmarks.bench_nlp run --bench detect_sections --size large
+
+`run` times every benchmark on every corpus entry and writes a JSON
+baseline. `compare` runs the same cases and exits with 1 when any of
+them got slower than the baseline by more than --threshold. Flagged
+cases are re-timed up to --confirm times first, so a noisy moment on
+the machine does not count as a regression.
+
+Timings are per call. Each case is timed in repeats of at least
+--min-time seconds, and the fastest repeat is compared, since it is the
+one least disturbed by the rest of the machine.
+
+Both commands also time a fixed calibration workload that touches no
+project code. `compare` divides every ratio by how much slower that
+workload ran than when the baseline was recorded, so a baseline from a
+faster or slower machine still compares like for like. Baselines
+without a calibration timing are compared raw.
+"""
+import os
+import sys
+import json
+import time
+import re
+import timeit
+import platform
+import argparse
+import statistics
+
+from benchmarks.corpus import LAYOUTS, SIZES, build_corpus
+from extractor.utils import clean_text
+from NLP_PARSER.section_detector import detect_sections
+from NLP_PARSER.skills import extract_skills
+from NLP_PARSER.experience import extract_experience
+from NLP_PARSER.projects import extract_projects_from_section, extract_tech_stack
+from NLP_PARSER.achievements import extract_achievements
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "nlp_parser.json")
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 0.05
+DEFAULT_CONFIRM = 3
+
+_CALIBRATION_TEXT = "\n".join(
+    f"Line {i}: Built Python, SQL and Docker services at Company {i % 17}."
+    for i in range(200)
+)
+_CALIBRATION_WORD = re.compile(r"[a-z]+")
+
+
+def _prepare(raw: str) -> dict:
+    """
+    Inputs for every benchmark, computed once outside the timed code.
+    """
+    cleaned = clean_text(raw)
+    sections = detect_sections(cleaned)
+    return {
+        "raw": raw,
+        "cleaned": cleaned,
+        "skills": sections.get("skills", ""),
+        "experience": sections.get("experience", ""),
+        "projects": sections.get("projects", ""),
+        "achievements": sections.get("achievements", "")
+    }
+
+
+def _all(raw: str) -> None:
+    sections = detect_sections(clean_text(raw))
+    extract_skills(sections.get("skills", ""))
+    extract_experience(sections.get("experience", ""))
+    extract_projects_from_section(sections.get("projects", ""))
+    extract_tech_stack(sections.get("projects", ""))
+    extract_achievements(sections.get("achievements", ""))
+
+
+def _parse_resume_nlp():
+    # The full span-based parse pulls in the extraction and LLM modules.
+    try:
+        from NLP_PARSER.main import parse_resume_nlp
+    except ImportError:
+        return None
+    return lambda inputs: parse_resume_nlp(inputs["cleaned"])
+
+
+def calibration_workload() -> list:
+    """
+    Interpreter-bound work in the same mix as the parsers (splitting,
+    regex, dict counting, sorting) that does not change with the code.
+    """
+    counts = {}
+    for line in _CALIBRATION_TEXT.splitlines():
+        for word in _CALIBRATION_WORD.findall(line.lower()):
+            counts[word] = counts.get(word, 0) + 1
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+BENCHMARKS = {
+    "clean_text": lambda inputs: clean_text(inputs["raw"]),
+    "detect_sections": lambda inputs: detect_sections(inputs["cleaned"]),
+    "extract_skills": lambda inputs: extract_skills(inputs["skills"]),
+    "extract_experience": lambda inputs: extract_experience(inputs["experience"]),
+    "extract_projects_from_section": lambda inputs: extract_projects_from_section(inputs["projects"]),
+    "extract_tech_stack": lambda inputs: extract_tech_stack(inputs["projects"]),
+    "extract_achievements": lambda inputs: extract_achievements(inputs["achievements"]),
+    "all": lambda inputs: _all(inputs["raw"]),
+}
+
+
+def time_call(fn, repeat: int = DEFAULT_REPEAT, min_time: float = DEFAULT_MIN_TIME) -> dict:
+    """
+    Per-call seconds of `fn`: fastest and median of `repeat` repeats.
+    """
+    fn()
+    timer = timeit.Timer(fn)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    per_call = [elapsed / loops] + [timer.timeit(loops) / loops for _ in range(repeat - 1)]
+    return {
+        "min_us": round(min(per_call) * 1e6, 3),
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "loops": loops
+    }
+
+
+def select_benchmarks(benchmarks=None) -> dict:
+    selected = dict(BENCHMARKS)
+    full_parse = _parse_resume_nlp()
+    if full_parse is not None:
+        selected["parse_resume_nlp"] = full_parse
+    if benchmarks:
+        unknown = set(benchmarks) - set(selected)
+        if unknown:
+            raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+        selected = {name: selected[name] for name in benchmarks}
+    return selected
+
+
+def prepare_corpus(sizes=tuple(SIZES), layouts=LAYOUTS, seed: int = 0) -> dict:
+    return {case: _prepare(text) for case, text in build_corpus(sizes, layouts, seed).items()}
+
+
+def run_benchmarks(
+    selected: dict,
+    corpus: dict,
+    repeat: int = DEFAULT_REPEAT,
+    min_time: float = DEFAULT_MIN_TIME,
+    seed: int = 0
+) -> dict:
+    # Machine speed drifts within a run, so the calibration is timed
+    # like a case around every benchmark and the median sample kept.
+    calibration = [time_call(calibration_workload, repeat, min_time)["min_us"]]
+    results = {}
+    for name, bench in selected.items():
+        results[name] = {
+            case: time_call(lambda: bench(inputs), repeat, min_time)
+            for case, inputs in corpus.items()
+        }
+        calibration.append(time_call(calibration_workload, repeat, min_time)["min_us"])
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "seed": seed,
+            "repeat": repeat,
+            "calibration_us": round(statistics.median(calibration), 3),
+            "corpus_chars": {case: len(inputs["raw"]) for case, inputs in corpus.items()}
+        },
+        "results": results
+    }
+
+
+def machine_factor(baseline: dict, current: dict) -> float:
+    """
+    How much slower this machine ran the calibration workload than the
+    baseline's; 1.0 when either side has no calibration timing.
+    """
+    base = baseline["meta"].get("calibration_us")
+    now = current["meta"].get("calibration_us")
+    return now / base if base and now else 1.0
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    One row per case present in both: (benchmark, case, baseline us,
+    current us, ratio, regressed). The ratio is corrected by
+    `machine_factor`.
+    """
+    factor = machine_factor(baseline, current)
+    rows = []
+    for name, cases in current["results"].items():
+        for case, timing in cases.items():
+            base = baseline["results"].get(name, {}).get(case)
+            if base is None:
+                continue
+            ratio = timing["min_us"] / (base["min_us"] * factor) if base["min_us"] else 1.0
+            rows.append((name, case, base["min_us"], timing["min_us"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def _print_results(results: dict) -> None:
+    print(f"{'benchmark':32} {'case':28} {'min us':>12} {'median us':>12}")
+    for name, cases in results["results"].items():
+        for case, timing in cases.items():
+            print(f"{name:32} {case:28} {timing['min_us']:12.1f} {timing['median_us']:12.1f}")
+
+
+def _print_comparison(rows: list, threshold: float, factor: float) -> None:
+    print(f"machine factor {factor:.2f} (calibration now / baseline); ratios are corrected by it\n")
+    print(f"{'benchmark':32} {'case':28} {'base us':>12} {'now us':>12} {'ratio':>7}")
+    for name, case, base, now, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:32} {case:28} {base:12.1f} {now:12.1f} {ratio:7.2f}{flag}")
+    regressions = sum(1 for row in rows if row[5])
+    print(f"\n{regressions} of {len(rows)} cases slower than baseline by more than {threshold:.0%}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="NLP_PARSER microbenchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for command in ("run", "compare"):
+        p = sub.add_parser(command)
+        p.add_argument("--bench", action="append", help="benchmark to run (repeatable; default all)")
+        p.add_argument("--size", action="append", choices=tuple(SIZES), help="corpus size (repeatable)")
+        p.add_argument("--layout", action="append", choices=LAYOUTS, help="corpus layout (repeatable)")
+        p.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+        p.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME)
+        p.add_argument("--seed", type=int, default=0)
+
+    sub.choices["run"].add_argument("--output", help="write results as a JSON baseline")
+    sub.choices["compare"].add_argument("baseline", nargs="?", default=BASELINE_PATH)
+    sub.choices["compare"].add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    sub.choices["compare"].add_argument("--confirm", type=int, default=DEFAULT_CONFIRM)
+
+    args = parser.parse_args(argv)
+
+    selected = select_benchmarks(args.bench)
+    corpus = prepare_corpus(tuple(args.size or SIZES), tuple(args.layout or LAYOUTS), args.seed)
+    results = run_benchmarks(selected, corpus, args.repeat, args.min_time, args.seed)
+
+    if args.command == "run":
+        _print_results(results)
+        if args.output:
+            os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+                f.write("\n")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("seed") != args.seed:
+        print(f"warning: baseline corpus seed {baseline['meta'].get('seed')} differs from {args.seed}")
+    if "calibration_us" not in baseline["meta"]:
+        print("warning: baseline has no calibration timing; it is only valid on the machine that recorded it")
+
+    rows = compare_results(baseline, results, args.threshold)
+    for _ in range(args.confirm):
+        flagged = [(name, case) for name, case, *_, regressed in rows if regressed]
+        if not flagged:
+            break
+        for name, case in flagged:
+            bench, inputs = selected[name], corpus[case]
+            timing = time_call(lambda: bench(inputs), args.repeat, args.min_time)
+            if timing["min_us"] < results["results"][name][case]["min_us"]:
+                results["results"][name][case] = timing
+        rows = compare_results(baseline, results, args.threshold)
+
+    _print_comparison(rows, args.threshold, machine_factor(baseline, results))
+    return 1 if any(row[5] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Deterministic synthetic resumes for the benchmarks. The same (layout,
+size, seed) always produces the same text, so timings stay comparable
+across runs and machines.
+"""
+import random
+
+LAYOUTS = ("bulleted", "wrapped", "uppercase", "many_projects", "long_experience")
+
+# (experience entries, bullets per entry, projects, skills, achievements)
+SIZES = {
+    "small": (2, 3, 2, 10, 2),
+    "medium": (4, 5, 5, 25, 4),
+    "large": (8, 8, 12, 60, 8),
+}
+
+NAMES = ["Asha Verma", "Daniel Okafor", "Mei Lin", "Carlos Ruiz", "Priya Nair", "Jonas Berg"]
+COMPANIES = [
+    "Northwind Labs", "Bluefin Analytics", "Acme Robotics", "Quantum Leaf",
+    "Helix Health", "Orbit Payments", "Cedar Logistics", "Lumen Media"
+]
+ROLES = [
+    "Software Engineer", "Data Scientist", "Backend Developer", "Machine Learning Engineer",
+    "Frontend Developer", "Data Analyst", "Software Engineering Intern", "Cloud Architect"
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+SKILLS = [
+    "Python", "Java", "C++", "Go", "Rust", "TypeScript", "JavaScript", "SQL",
+    "React", "Node.js", "Django", "Flask", "FastAPI", "Spring Boot", "Docker",
+    "Kubernetes", "AWS", "GCP", "Azure", "PostgreSQL", "MongoDB", "Redis",
+    "Kafka", "Spark", "TensorFlow", "PyTorch", "scikit-learn", "Pandas", "NumPy",
+    "Git", "Linux", "GraphQL", "REST APIs", "Terraform", "Jenkins", "Airflow",
+    "Tableau", "Power BI", "Elasticsearch", "RabbitMQ", "Next.js", "Vue.js",
+    "HTML", "CSS", "Tailwind CSS", "OpenCV", "NLP", "Machine Learning",
+    "Deep Learning", "CI/CD", "Agile", "Scrum", "Leadership", "Communication",
+    "Hadoop", "Snowflake", "dbt", "Prometheus", "Grafana", "Selenium"
+]
+VERBS = ["Built", "Developed", "Designed", "Implemented", "Optimized", "Automated", "Deployed"]
+OBJECTS = [
+    "a data ingestion pipeline", "the payments reconciliation service",
+    "an internal analytics dashboard", "a recommendation engine",
+    "the customer onboarding API", "a fraud detection model",
+    "a real-time notification system", "the search indexing workers"
+]
+OUTCOMES = [
+    "reducing latency by 35%", "cutting infrastructure cost by 20%",
+    "serving 2M requests per day", "improving accuracy from 81% to 93%",
+    "shortening release cycles from weeks to days", "handling 10x peak traffic"
+]
+PROJECT_KINDS = [
+    "Inventory Management System", "Movie Recommendation Engine", "Expense Tracker App",
+    "Crop Yield Prediction Model", "Campus Event Portal", "Resume Screening Tool",
+    "Stock Price Dashboard", "Customer Support Chatbot", "Smart Parking Platform",
+    "Fitness Tracking Web App", "News Summary Generator", "Library Booking Portal"
+]
+ACHIEVEMENTS = [
+    "Winner, National Hackathon {year}",
+    "Ranked top 1% in Kaggle competition {year}",
+    "AWS Certified Solutions Architect ({year})",
+    "Best Paper Award at Student Research Symposium {year}",
+    "Rank 12 in regional coding contest {year}",
+    "Top performer award for {year}"
+]
+
+
+def _header(name: str, layout: str, rng: random.Random) -> str:
+    if layout == "uppercase":
+        return name.upper()
+    return rng.choice([name.title(), name.upper(), name.title() + ":"])
+
+
+def _bullet(rng: random.Random, layout: str) -> list:
+    text = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} with {rng.choice(SKILLS)} and {rng.choice(SKILLS)}, {rng.choice(OUTCOMES)}"
+    marker = rng.choice(["-", "•", "●"]) if layout != "uppercase" else "-"
+    if layout != "wrapped":
+        return [f"{marker} {text}."]
+    # Wrap like a PDF text layer does: continuation lines start lowercase.
+    words = text.split()
+    cut = max(3, len(words) // 2)
+    return [f"{marker} {' '.join(words[:cut])}", f"{' '.join(words[cut:]).lower()}."]
+
+
+def _duration(rng: random.Random, year: int) -> str:
+    start = f"{rng.choice(MONTHS)} {year}"
+    end = "Present" if rng.random() < 0.2 else f"{rng.choice(MONTHS)} {year + rng.randint(1, 3)}"
+    return f"{start} - {end}"
+
+
+def generate_resume(layout: str = "bulleted", size: str = "medium", seed: int = 0) -> str:
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Expected one of {LAYOUTS}.")
+    if size not in SIZES:
+        raise ValueError(f"Unknown size '{size}'. Expected one of {tuple(SIZES)}.")
+
+    rng = random.Random(f"{layout}:{size}:{seed}")
+    jobs, bullets, projects, skills, achievements = SIZES[size]
+    if layout == "many_projects":
+        projects *= 4
+    if layout == "long_experience":
+        jobs *= 3
+        bullets *= 2
+
+    lines = [
+        rng.choice(NAMES),
+        "name@example.com | +1 555 0100 | linkedin.com/in/example",
+        _header("summary", layout, rng),
+        "Engineer with experience building data-heavy backend systems and ML products.",
+    ]
+
+    lines.append(_header("skills", layout, rng))
+    chosen = rng.sample(SKILLS, min(skills, len(SKILLS)))
+    for i in range(0, len(chosen), 8):
+        lines.append(", ".join(chosen[i:i + 8]))
+
+    lines.append(_header("work experience", layout, rng))
+    year = 2010
+    for _ in range(jobs):
+        role = rng.choice(ROLES)
+        lines.append(role.upper() if layout == "uppercase" else role)
+        lines.append(f"{rng.choice(COMPANIES)} - {rng.choice(['Remote', 'Berlin', 'Pune', 'Austin'])}")
+        lines.append(_duration(rng, year))
+        year += rng.randint(1, 2)
+        for _ in range(bullets):
+            lines.extend(_bullet(rng, layout))
+
+    lines.append(_header("projects", layout, rng))
+    for i in range(projects):
+        title = PROJECT_KINDS[i % len(PROJECT_KINDS)]
+        if i >= len(PROJECT_KINDS):
+            title = f"{title} {i // len(PROJECT_KINDS) + 1}"
+        lines.append(title)
+        lines.append(", ".join(rng.sample(SKILLS, 4)))
+        lines.extend(_bullet(rng, layout))
+
+    lines.append(_header("education", layout, rng))
+    lines.append("B.Tech in Computer Science, State University of Technology")
+    lines.append(f"Aug {year - 14} - May {year - 10}")
+
+    lines.append(_header("achievements", layout, rng))
+    for _ in range(achievements):
+        lines.append(rng.choice(ACHIEVEMENTS).format(year=rng.randint(2012, 2024)))
+
+    # Extraction artefacts that clean_text has to undo.
+    text = "\n".join(
+        line + (" " * rng.randint(1, 3) if rng.random() < 0.3 else "")
+        for line in lines
+    )
+    return text.replace("\n- ", "\n\n-  ", rng.randint(1, 5))
+
+
+def build_corpus(sizes=tuple(SIZES), layouts=LAYOUTS, seed: int = 0) -> dict:
+    """
+    {"<layout>/<size>": text} for every combination.
+    """
+    return {
+        f"{layout}/{size}": generate_resume(layout, size, seed)
+        for layout in layouts
+        for size in sizes
+    }
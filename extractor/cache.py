@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from dotenv import load_dotenv
+
+from extractor.extractor import extract_resume_document
+from extractor.pdf import PDF_TIER
+from extractor.utils import clean_text
+from metrics import record_extraction, timed
+
+
+load_dotenv()
+
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", "./cache/extraction")
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "1") == "1"
+
+# Bump when extraction or cleaning changes so stale entries are not served.
+EXTRACTION_CACHE_VERSION = "4"
+
+CHUNK_SIZE = 64 * 1024
+
+# Eviction scans the whole directory, so it runs once per this many writes.
+_EVICT_EVERY = 100
+
+
+def copy_and_hash(stream, out, chunk_size: int = CHUNK_SIZE) -> str:
+    """
+    Copy an upload stream into `out` chunk by chunk and return the
+    sha256 of its bytes, so the key is ready as soon as the upload is.
+    """
+    digest = hashlib.sha256()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+        out.write(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Disk-backed cache of extracted resume text, keyed by content hash.
+
+    One JSON file per document. A hit bumps the file's mtime, and every
+    _EVICT_EVERY writes the least recently used files are evicted once
+    the directory has grown past `max_bytes`. Files are replaced
+    atomically, so several workers can share a directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.v{EXTRACTION_CACHE_VERSION}.json")
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        entry = {**entry, "created": time.time()}
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes % _EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self) -> None:
+        files = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+extraction_cache = ExtractionCache(EXTRACTION_CACHE_DIR, EXTRACTION_CACHE_MAX_BYTES)
+
+
+def extract_cached(
+    source,
+    digest: str,
+    filename: str = None,
+    pdf_tier: str = None,
+    use_cache: bool = True
+) -> dict:
+    """
+    Return {raw_text, cleaned_text, engine, pages, error} for a document, running
+    the PDF engines or tesseract only when its hash has not been seen
+    before. `source`, `filename` and `pdf_tier` are passed through to
+    `extract_resume_document`. `use_cache=False` always extracts (used
+    when profiling) and leaves the cache untouched. Results with an
+    `error` (partial OCR) are not cached, so the next request retries.
+    """
+    key = f"{digest}.{pdf_tier or PDF_TIER}"
+    use_cache = use_cache and EXTRACTION_CACHE_ENABLED
+    start = time.perf_counter()
+    if use_cache:
+        entry = extraction_cache.get(key)
+        if entry is not None:
+            record_extraction("cache", time.perf_counter() - start)
+            return entry
+
+    document = extract_resume_document(source, filename, pdf_tier)
+    record_extraction(document["engine"], time.perf_counter() - start)
+
+    with timed("clean_text"):
+        cleaned_text = clean_text(document["text"])
+    entry = {
+        "raw_text": document["text"],
+        "cleaned_text": cleaned_text,
+        "engine": document["engine"],
+        "pages": document["pages"],
+        "error": document.get("error")
+    }
+
+    if use_cache and entry["error"] is None:
+        extraction_cache.put(key, entry)
+
+    return entry
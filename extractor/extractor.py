@@ -1,17 +1,59 @@
-from pdfminer.high_level import extract_text
-from PIL import Image
-import pytesseract
+import io
 import os
 
-def extract_resume_text(file_path: str) -> str:
-    ext = os.path.splitext(file_path)[1].lower()
+from extractor.pdf import extract_pdf
+from extractor.ocr import has_text_layer, ocr_image, ocr_pdf
+
+SUPPORTED_EXTENSIONS = [".pdf", ".png", ".jpg", ".jpeg"]
+
+def _extension(source, filename: str = None) -> str:
+    if filename is None:
+        if isinstance(source, (str, os.PathLike)):
+            filename = os.fspath(source)
+        else:
+            filename = getattr(source, "name", "") or ""
+    return os.path.splitext(str(filename))[1].lower()
+
+def _as_stream(source):
+    """
+    Paths and binary file-likes go straight to pdfminer/PIL;
+    raw bytes are wrapped so nothing touches the disk.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+def _extract_pdf_or_ocr(stream, pdf_tier: str = None) -> dict:
+    document = extract_pdf(stream, pdf_tier)
+    if has_text_layer(document["text"], document["pages"]):
+        return document
+
+    # Scanned PDF: no usable text layer from either engine.
+    return ocr_pdf(stream)
+
+def extract_resume_document(source, filename: str = None, pdf_tier: str = None) -> dict:
+    """
+    `source` is a path, raw bytes or a binary file-like object. For
+    anything but a path, pass `filename` so the format can be told.
+    Returns the text together with the engine that produced it and
+    the page count; OCR results also carry `error` when pages were lost.
+    """
+    ext = _extension(source, filename)
 
     if ext == ".pdf":
-        return extract_text(file_path)
+        stream = _as_stream(source)
+        if isinstance(stream, (str, os.PathLike)):
+            with open(stream, "rb") as f:
+                return _extract_pdf_or_ocr(f, pdf_tier)
+        return _extract_pdf_or_ocr(stream, pdf_tier)
 
     elif ext in [".png", ".jpg", ".jpeg"]:
-        image = Image.open(file_path)
-        return pytesseract.image_to_string(image)
+        return ocr_image(_as_stream(source))
 
     else:
         raise ValueError("Unsupported file format")
+
+def extract_resume_text(source, filename: str = None, pdf_tier: str = None) -> str:
+    return extract_resume_document(source, filename, pdf_tier)["text"]
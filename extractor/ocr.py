@@ -0,0 +1,235 @@
+import io
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from dotenv import load_dotenv
+from PIL import Image
+import pytesseract
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+OCR_DPI = int(os.getenv("OCR_DPI", "300"))
+# Images without DPI metadata are scaled so their long side fits this.
+OCR_MAX_DIMENSION = int(os.getenv("OCR_MAX_DIMENSION", "3500"))
+OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", "10"))
+OCR_DEADLINE_SECONDS = float(os.getenv("OCR_DEADLINE_SECONDS", "60"))
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))
+OCR_DESKEW = os.getenv("OCR_DESKEW", "1") == "1"
+
+# Below this many non-space characters per page a PDF is treated as a scan.
+TEXT_LAYER_MIN_CHARS_PER_PAGE = int(os.getenv("TEXT_LAYER_MIN_CHARS_PER_PAGE", "20"))
+
+_DESKEW_MAX_ANGLE = 5.0
+_DESKEW_STEP = 0.5
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def has_text_layer(text: str, pages: int) -> bool:
+    return len("".join(text.split())) >= TEXT_LAYER_MIN_CHARS_PER_PAGE * max(pages, 1)
+
+
+def _deskew_angle(image: Image.Image) -> float:
+    """
+    Projection-profile deskew: the rotation that makes text rows
+    sharpest gives the highest variance of row sums.
+    """
+    thumb = image.copy()
+    thumb.thumbnail((800, 800))
+    ink = np.asarray(thumb, dtype=np.uint8) < 128
+
+    best_angle, best_score = 0.0, None
+    angle = -_DESKEW_MAX_ANGLE
+    while angle <= _DESKEW_MAX_ANGLE:
+        rotated = Image.fromarray(ink.astype(np.uint8) * 255).rotate(angle, fillcolor=0)
+        score = np.var(np.asarray(rotated, dtype=np.float32).sum(axis=1))
+        if best_score is None or score > best_score:
+            best_angle, best_score = angle, score
+        angle += _DESKEW_STEP
+    return best_angle
+
+
+def normalize_image(image: Image.Image) -> Image.Image:
+    """
+    Grayscale, downscale to OCR_DPI (or OCR_MAX_DIMENSION when the image
+    carries no DPI), then deskew small rotations.
+    """
+    image = image.convert("L")
+
+    dpi = image.info.get("dpi", (0, 0))[0]
+    if dpi and dpi > OCR_DPI:
+        scale = OCR_DPI / dpi
+    else:
+        scale = min(1.0, OCR_MAX_DIMENSION / max(image.size))
+
+    if scale < 1.0:
+        image = image.resize(
+            (max(1, int(image.width * scale)), max(1, int(image.height * scale))),
+            Image.LANCZOS
+        )
+
+    if OCR_DESKEW and np is not None:
+        angle = _deskew_angle(image)
+        if angle:
+            image = image.rotate(angle, expand=True, fillcolor=255)
+
+    return image
+
+
+def _ocr_page(png: bytes, timeout: float = 0) -> str:
+    # Runs in an OCR worker process; tesseract is killed after `timeout`.
+    image = normalize_image(Image.open(io.BytesIO(png)))
+    return pytesseract.image_to_string(image, timeout=timeout)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: forking a threaded web worker is not safe.
+                _pool = ProcessPoolExecutor(
+                    max_workers=OCR_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def _to_png(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def rasterize_pdf(stream, max_pages: int = None) -> tuple:
+    """
+    Render up to `max_pages` pages at OCR_DPI. Returns (PNG bytes per
+    page, total page count).
+    """
+    if pdfium is None:
+        raise RuntimeError(
+            "PDF has no text layer and pypdfium2 is not installed to rasterize it for OCR."
+        )
+
+    max_pages = OCR_MAX_PAGES if max_pages is None else max_pages
+    if hasattr(stream, "seek"):
+        stream.seek(0)
+    document = pdfium.PdfDocument(stream.read() if hasattr(stream, "read") else stream)
+
+    total = len(document)
+    pages = []
+    for i in range(min(total, max_pages)):
+        bitmap = document[i].render(scale=OCR_DPI / 72)
+        image = bitmap.to_pil()
+        image.info["dpi"] = (OCR_DPI, OCR_DPI)
+        pages.append(_to_png(image))
+    return pages, total
+
+
+def _page_error(errors: list, message: str) -> None:
+    logger.warning(message)
+    errors.append(message)
+
+
+def ocr_pages(pages: list, deadline: float = None) -> tuple:
+    """
+    OCR page images in parallel and reassemble their text in page order.
+    Returns (text, error): pages that failed or were still running at the
+    deadline are dropped, and `error` says which (None when all pages
+    were read).
+    """
+    if not pages:
+        return "", None
+
+    deadline = OCR_DEADLINE_SECONDS if deadline is None else deadline
+    if deadline <= 0:
+        error = "OCR deadline exhausted before any page was processed"
+        logger.warning(error)
+        return "", error
+
+    errors = []
+    if len(pages) == 1:
+        # tesseract raises RuntimeError when killed at the timeout.
+        try:
+            return _ocr_page(pages[0], timeout=deadline), None
+        except RuntimeError as e:
+            _page_error(errors, f"OCR failed on page 1: {e}")
+            return "", errors[0]
+
+    pool = _get_pool()
+    futures = [pool.submit(_ocr_page, page, deadline) for page in pages]
+    done, not_done = wait(futures, timeout=deadline)
+
+    for future in not_done:
+        future.cancel()
+    if not_done:
+        _page_error(
+            errors,
+            f"OCR deadline of {deadline:.0f}s hit: {len(not_done)} of {len(pages)} pages dropped"
+        )
+
+    texts = []
+    for i, future in enumerate(futures):
+        if future not in done:
+            continue
+        try:
+            texts.append(future.result())
+        except Exception as e:
+            _page_error(errors, f"OCR failed on page {i + 1}: {e}")
+    return "\n".join(texts), "; ".join(errors) or None
+
+
+def ocr_image(stream) -> dict:
+
+    image = Image.open(stream)
+    image.load()
+    text, error = "", None
+    try:
+        text = pytesseract.image_to_string(normalize_image(image), timeout=OCR_DEADLINE_SECONDS)
+    except RuntimeError as e:
+        error = f"OCR failed: {e}"
+        logger.warning(error)
+    return {
+        "text": text,
+        "engine": "tesseract",
+        "pages": 1,
+        "error": error
+    }
+
+
+def ocr_pdf(stream) -> dict:
+    """
+    OCR a PDF without a text layer, page-parallel, within the page cap
+    and per-document deadline. `error` is set when pages were lost.
+    """
+    started = time.monotonic()
+    pages, total = rasterize_pdf(stream)
+    remaining = max(0.0, OCR_DEADLINE_SECONDS - (time.monotonic() - started))
+
+    if total > len(pages):
+        logger.warning("OCR page cap: %d of %d pages processed", len(pages), total)
+
+    text, error = ocr_pages(pages, deadline=remaining)
+    return {
+        "text": text,
+        "engine": "tesseract",
+        "pages": total,
+        "error": error
+    }
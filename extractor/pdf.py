@@ -0,0 +1,101 @@
+import os
+from dotenv import load_dotenv
+from pdfminer.high_level import extract_text
+from pdfminer.layout import LAParams
+from pdfminer.pdfpage import PDFPage
+
+try:
+    from PyPDF2 import PdfReader
+except ImportError:
+    PdfReader = None
+
+from NLP_PARSER.section_detector import match_section_header
+
+
+load_dotenv()
+
+# auto: fast text layer, pdfminer if that looks bad. fast / pdfminer: force one engine.
+PDF_TIERS = ("auto", "fast", "pdfminer")
+PDF_TIER = os.getenv("PDF_TIER", "auto")
+
+MIN_CHARS_PER_PAGE = int(os.getenv("PDF_MIN_CHARS_PER_PAGE", "200"))
+MIN_PRINTABLE_RATIO = float(os.getenv("PDF_MIN_PRINTABLE_RATIO", "0.97"))
+MIN_SECTION_HEADERS = int(os.getenv("PDF_MIN_SECTION_HEADERS", "1"))
+
+# Tighter line grouping than the defaults keeps resume bullets and
+# two-column layouts from being merged into one paragraph.
+LAPARAMS = LAParams(line_margin=0.3, char_margin=2.0, word_margin=0.1)
+
+
+def _rewind(stream):
+    if hasattr(stream, "seek"):
+        stream.seek(0)
+    return stream
+
+
+def _fast_extract(stream) -> tuple:
+    reader = PdfReader(_rewind(stream))
+    pages = [page.extract_text() or "" for page in reader.pages]
+    return "\n".join(pages), len(pages)
+
+
+def _pdfminer_extract(stream) -> tuple:
+    text = extract_text(_rewind(stream), laparams=LAPARAMS)
+    pages = sum(1 for _ in PDFPage.get_pages(_rewind(stream)))
+    return text, pages
+
+
+def assess_text_quality(text: str, pages: int) -> dict:
+    """
+    Cheap checks that a text layer is usable: enough characters per page,
+    almost no unprintable or replacement characters, and at least one
+    recognisable resume section header.
+    """
+    stripped = "".join(text.split())
+    good = sum(1 for ch in stripped if ch.isprintable() and ch != "�")
+    headers = sum(
+        1
+        for line in text.split("\n")
+        if line.strip() and match_section_header(line)
+    )
+
+    chars_per_page = len(stripped) / max(pages, 1)
+    printable_ratio = good / len(stripped) if stripped else 0.0
+
+    return {
+        "chars_per_page": round(chars_per_page, 1),
+        "printable_ratio": round(printable_ratio, 4),
+        "section_headers": headers,
+        "ok": (
+            chars_per_page >= MIN_CHARS_PER_PAGE
+            and printable_ratio >= MIN_PRINTABLE_RATIO
+            and headers >= MIN_SECTION_HEADERS
+        )
+    }
+
+
+def extract_pdf(stream, tier: str = None) -> dict:
+    """
+    Tiered PDF text extraction. Returns the text, the engine that
+    produced it, the page count and the fast tier's quality report.
+    """
+    tier = tier or PDF_TIER
+    if tier not in PDF_TIERS:
+        raise ValueError(f"Unknown PDF tier '{tier}'. Expected one of {PDF_TIERS}.")
+
+    quality = None
+    if tier != "pdfminer" and PdfReader is not None:
+        try:
+            text, pages = _fast_extract(stream)
+        except Exception:
+            text, pages = "", 0
+
+        if tier == "fast":
+            return {"text": text, "engine": "pypdf2", "pages": pages, "quality": None}
+
+        quality = assess_text_quality(text, pages)
+        if quality["ok"]:
+            return {"text": text, "engine": "pypdf2", "pages": pages, "quality": quality}
+
+    text, pages = _pdfminer_extract(stream)
+    return {"text": text, "engine": "pdfminer", "pages": pages, "quality": quality}
@@ -0,0 +1,313 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+import sqlite3
+import threading
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+
+from extractor.cache import extract_cached
+from pipeline import run_pipeline
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "./var/jobs.sqlite3")
+# Background pipelines per process; 0 makes the process submit-only.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+# A running job whose lease expires (its worker died) is picked up again.
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "600"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_CALLBACK_TIMEOUT = float(os.getenv("JOB_CALLBACK_TIMEOUT", "10"))
+# Hosts callbacks may be sent to, comma-separated; ".example.com" also
+# allows its subdomains. Empty disables callbacks.
+JOB_CALLBACK_HOSTS = [
+    host.strip().lower()
+    for host in os.getenv("JOB_CALLBACK_HOSTS", "").split(",")
+    if host.strip()
+]
+
+
+def validate_callback_url(url: str) -> str:
+    """
+    Return `url` if callbacks may be sent to it, else raise ValueError.
+    Only http(s) URLs on a JOB_CALLBACK_HOSTS host are allowed, so the
+    server cannot be made to POST to arbitrary internal addresses.
+    """
+    parts = urlsplit(url or "")
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("callback_url must be an http or https URL.")
+
+    host = parts.hostname.lower()
+    allowed = any(
+        host == entry or (entry.startswith(".") and host.endswith(entry))
+        for entry in JOB_CALLBACK_HOSTS
+    )
+    if not allowed:
+        raise ValueError(f"callback_url host '{host}' is not in JOB_CALLBACK_HOSTS.")
+    return url
+
+
+class JobQueue:
+    """
+    Persistent job queue in SQLite. Jobs survive restarts, and several
+    processes can claim from the same database: a claim takes a lease,
+    and expired leases are reclaimed up to JOB_MAX_ATTEMPTS times.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connect().execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                payload BLOB,
+                mode TEXT,
+                pdf_tier TEXT,
+                callback_url TEXT,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_until REAL,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+            """
+        )
+        self._connect().execute(
+            "CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created)"
+        )
+        columns = {row["name"] for row in self._connect().execute("PRAGMA table_info(jobs)")}
+        if "pdf_tier" not in columns:
+            self._connect().execute("ALTER TABLE jobs ADD COLUMN pdf_tier TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def submit(
+        self,
+        filename: str,
+        payload: bytes,
+        mode: str = None,
+        callback_url: str = None,
+        pdf_tier: str = None
+    ) -> str:
+
+        if callback_url:
+            validate_callback_url(callback_url)
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO jobs (id, status, filename, payload, mode, pdf_tier, callback_url, created, updated) "
+            "VALUES (?, 'queued', ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, filename, payload, mode, pdf_tier, callback_url, now, now)
+        )
+        self._wakeup.set()
+        return job_id
+
+    def claim(self):
+        """
+        Atomically take the oldest runnable job, or return None.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs "
+                "WHERE status = 'queued' OR (status = 'running' AND lease_until < ?) "
+                "ORDER BY created LIMIT 1",
+                (now,)
+            ).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            if row["attempts"] >= JOB_MAX_ATTEMPTS:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', payload = NULL, "
+                    "error = 'Worker lease expired too many times.', updated = ? WHERE id = ?",
+                    (now, row["id"])
+                )
+                conn.execute("COMMIT")
+                return self.claim()
+
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                "lease_until = ?, updated = ? WHERE id = ?",
+                (now + JOB_LEASE_SECONDS, now, row["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return dict(row)
+
+    def _finish(self, job_id: str, status: str, result=None, error: str = None) -> None:
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, payload = NULL, "
+            "lease_until = NULL, updated = ? WHERE id = ?",
+            (
+                status,
+                json.dumps(result, ensure_ascii=False) if result is not None else None,
+                error,
+                time.time(),
+                job_id
+            )
+        )
+
+    def complete(self, job_id: str, result: dict) -> None:
+        self._finish(job_id, "done", result=result)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._finish(job_id, "failed", error=error)
+
+    def get(self, job_id: str):
+
+        row = self._connect().execute(
+            "SELECT id, status, filename, mode, pdf_tier, result, error, attempts, created, updated "
+            "FROM jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def wait_for_work(self, timeout: float) -> None:
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+
+def process_job(job: dict) -> dict:
+    """
+    Extraction -> NLP -> LLM -> examiner for one queued upload.
+    """
+    payload = job["payload"]
+    digest = hashlib.sha256(payload).hexdigest()
+    document = extract_cached(
+        payload, digest, filename=job["filename"], pdf_tier=job.get("pdf_tier")
+    )
+
+    return run_pipeline(document["cleaned_text"], mode=job["mode"])
+
+
+def _send_callback(job_id: str, queue: JobQueue, callback_url: str) -> None:
+
+    try:
+        import requests
+        # Checked again here: the allowlist may have changed since submit,
+        # and redirects could lead anywhere.
+        validate_callback_url(callback_url)
+        requests.post(
+            callback_url,
+            json=queue.get(job_id),
+            timeout=JOB_CALLBACK_TIMEOUT,
+            allow_redirects=False
+        )
+    except Exception as e:
+        logger.warning("job %s callback to %s failed: %s", job_id, callback_url, e)
+
+
+class JobWorkerPool:
+
+    def __init__(self, queue: JobQueue, workers: int):
+        self.queue = queue
+        self.workers = workers
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.queue._wakeup.set()
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim()
+            except sqlite3.Error as e:
+                logger.warning("job claim failed: %s", e)
+                job = None
+
+            if job is None:
+                self.queue.wait_for_work(JOB_POLL_SECONDS)
+                continue
+
+            try:
+                try:
+                    result = process_job(job)
+                except Exception as e:
+                    logger.exception("job %s failed", job["id"])
+                    self.queue.fail(job["id"], str(e))
+                else:
+                    self.queue.complete(job["id"], result)
+            except sqlite3.Error as e:
+                # Leave the job to its lease: it expires and the job is
+                # claimed again, instead of this worker thread dying.
+                logger.warning("job %s could not be recorded: %s", job["id"], e)
+                continue
+
+            if job["callback_url"]:
+                _send_callback(job["id"], self.queue, job["callback_url"])
+
+
+job_queue = JobQueue(JOB_DB_PATH)
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def start_workers(workers: int = None):
+    """
+    Start this process's background workers once. Safe to call from
+    every gunicorn worker; with JOB_WORKERS=0 nothing is started.
+    """
+    global _pool
+    workers = JOB_WORKERS if workers is None else workers
+    with _pool_lock:
+        if _pool is None and workers > 0:
+            _pool = JobWorkerPool(job_queue, workers)
+            _pool.start()
+    return _pool
+
+
+if __name__ == "__main__":
+    # Dedicated worker process: python jobs.py
+    logging.basicConfig(level=logging.INFO)
+    start_workers(max(JOB_WORKERS, 1))
+    while True:
+        time.sleep(3600)
@@ -0,0 +1,332 @@
+"""
+Load test for /resume_parser against a stub inference server.
+
+    python -m loadtest.driver ./samples --concurrency 8 --duration 60
+    python -m loadtest.driver ./samples --rps 4 --requests 200 --mode auto --latency lognormal:0:0.5
+    python -m loadtest.driver ./samples --url http://127.0.0.1:5000/resume_parser --concurrency 16
+
+By default the driver starts the stub chat-completions server
+(loadtest.stub_server) and the Flask app on local threads, with the LLM
+client pointed at the stub and both caches off, so every request pays
+for extraction and the LLM round trips. With --url it drives an app that
+is already running; start that one with LLM_BACKEND=openai and
+LLM_BASE_URL at a stub.
+
+Without --rps the driver is closed-loop: --concurrency clients each send
+their next request as soon as the last one returns. With --rps requests
+are sent on a fixed schedule, up to --concurrency at a time, and latency
+is measured from the scheduled send time, so time spent waiting for a
+free client counts against the server instead of hiding a backlog.
+
+The report has throughput, p50/p95/p99 latency of successful requests
+and the error rate, plus the stub's call counts when it is local.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import mimetypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from loadtest.stub_server import add_stub_arguments, start_stub_server, stub_config
+
+
+CORPUS_EXTENSIONS = (".pdf", ".png", ".jpg", ".jpeg")
+
+
+def load_corpus(paths: list) -> list:
+    """
+    [(filename, bytes, content type)] for every resume under `paths`.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = [
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in sorted(names)
+            ]
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            if os.path.splitext(candidate)[1].lower() in CORPUS_EXTENSIONS:
+                with open(candidate, "rb") as f:
+                    content_type = mimetypes.guess_type(candidate)[0] or "application/octet-stream"
+                    files.append((os.path.basename(candidate), f.read(), content_type))
+    return files
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class Recorder:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.statuses = {}
+        self.errors = {}
+        self.engines = {}
+
+    def record(self, latency: float, status=None, error: str = None, engine: str = None) -> None:
+        with self._lock:
+            if error is not None:
+                self.errors[error] = self.errors.get(error, 0) + 1
+                return
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status == 200:
+                self.latencies.append(latency)
+                if engine:
+                    self.engines[engine] = self.engines.get(engine, 0) + 1
+
+    def report(self, elapsed: float) -> dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            total = sum(self.statuses.values()) + sum(self.errors.values())
+            ok = len(latencies)
+            return {
+                "requests": total,
+                "ok": ok,
+                "error_rate": round((total - ok) / total, 4) if total else 0.0,
+                "elapsed_seconds": round(elapsed, 3),
+                "throughput_rps": round(ok / elapsed, 3) if elapsed else 0.0,
+                "latency_seconds": {
+                    "p50": percentile(latencies, 50),
+                    "p95": percentile(latencies, 95),
+                    "p99": percentile(latencies, 99),
+                    "mean": sum(latencies) / ok if ok else None,
+                    "max": latencies[-1] if latencies else None
+                },
+                "status_codes": {str(k): v for k, v in sorted(self.statuses.items())},
+                "client_errors": dict(self.errors),
+                "extraction_engines": dict(self.engines)
+            }
+
+
+def send(session, url: str, document: tuple, params: dict, timeout: float) -> tuple:
+    """
+    POST one resume. Returns (status, extraction engine).
+    """
+    filename, payload, content_type = document
+    response = session.post(
+        url,
+        files={"resume": (filename, payload, content_type)},
+        params=params,
+        timeout=timeout
+    )
+    return response.status_code, response.headers.get("X-Extraction-Engine")
+
+
+def run_load(
+    url: str,
+    corpus: list,
+    concurrency: int = 4,
+    rps: float = None,
+    duration: float = None,
+    requests_total: int = None,
+    warmup: int = 0,
+    params: dict = None,
+    timeout: float = 300.0
+) -> dict:
+    """
+    Drive `url` until `duration` seconds or `requests_total` requests,
+    whichever comes first, and return the report.
+    """
+    import requests
+
+    if not corpus:
+        raise ValueError("The corpus is empty.")
+    if duration is None and requests_total is None:
+        raise ValueError("Set a duration or a number of requests.")
+
+    local = threading.local()
+
+    def session():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    for i in range(warmup):
+        send(session(), url, corpus[i % len(corpus)], params, timeout)
+
+    recorder = Recorder()
+    counter = {"next": 0}
+    counter_lock = threading.Lock()
+    start = time.perf_counter()
+    stop_at = start + duration if duration is not None else None
+
+    def claim():
+        # The next request index, or None once the run is over.
+        with counter_lock:
+            i = counter["next"]
+            if requests_total is not None and i >= requests_total:
+                return None
+            if stop_at is not None and time.perf_counter() >= stop_at:
+                return None
+            counter["next"] += 1
+            return i
+
+    def one(i: int, scheduled: float) -> None:
+        try:
+            status, engine = send(session(), url, corpus[i % len(corpus)], params, timeout)
+            recorder.record(time.perf_counter() - scheduled, status, engine=engine)
+        except Exception as e:
+            recorder.record(time.perf_counter() - scheduled, error=type(e).__name__)
+
+    if rps is None:
+        def client():
+            while True:
+                i = claim()
+                if i is None:
+                    return
+                one(i, time.perf_counter())
+
+        threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load") as pool:
+            interval = 1.0 / rps
+            while True:
+                i = claim()
+                if i is None:
+                    break
+                scheduled = start + i * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(one, i, scheduled)
+
+    return recorder.report(time.perf_counter() - start)
+
+
+def start_local_app(stub_url: str, llm_cache: bool = False, extraction_cache: bool = False) -> tuple:
+    """
+    Point the LLM client at the stub and serve the Flask app on a thread.
+    Returns (server, /resume_parser URL).
+    """
+    # The app reads its settings at import time.
+    os.environ["LLM_BACKEND"] = "openai"
+    os.environ["LLM_BASE_URL"] = stub_url
+    os.environ["LLM_CACHE_ENABLED"] = "1" if llm_cache else "0"
+    os.environ["EXTRACTION_CACHE_ENABLED"] = "1" if extraction_cache else "0"
+
+    from werkzeug.serving import make_server
+    from app import app
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, name="app", daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_port}/resume_parser"
+
+
+def _print_report(report: dict) -> None:
+    latency = report["latency_seconds"]
+
+    def fmt(value):
+        return "-" if value is None else f"{value * 1000:.0f} ms"
+
+    print(f"requests       {report['requests']} ({report['ok']} ok) in {report['elapsed_seconds']:.1f}s")
+    print(f"throughput     {report['throughput_rps']:.2f} req/s")
+    print(f"latency        p50 {fmt(latency['p50'])}  p95 {fmt(latency['p95'])}  "
+          f"p99 {fmt(latency['p99'])}  max {fmt(latency['max'])}")
+    print(f"error rate     {report['error_rate']:.2%}")
+    print(f"status codes   {report['status_codes']}")
+    if report["client_errors"]:
+        print(f"client errors  {report['client_errors']}")
+    if report.get("stub"):
+        stub = report["stub"]
+        print(f"stub calls     {stub['requests']} ({stub['errors']} failed, "
+              f"{stub['disconnects']} closed early) {stub['by_schema']}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test /resume_parser against a stub LLM server.")
+    parser.add_argument("corpus", nargs="+", help="resume files or directories (.pdf, .png, .jpg)")
+    parser.add_argument("--url", help="drive a running app instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=None, help="open-loop arrival rate")
+    parser.add_argument("--duration", type=float, default=None, help="seconds to run")
+    parser.add_argument("--requests", type=int, default=None, help="requests to send")
+    parser.add_argument("--warmup", type=int, default=0, help="unrecorded requests sent first")
+    parser.add_argument("--mode", default=None, help="parse mode (fast, auto, accurate)")
+    parser.add_argument("--pdf-tier", default=None)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--llm-cache", action="store_true", help="keep the LLM response cache on")
+    parser.add_argument("--extraction-cache", action="store_true", help="keep the extraction cache on")
+    parser.add_argument("--output", help="write the report as JSON")
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.duration is None and args.requests is None:
+        args.requests = 100
+    try:
+        config = stub_config(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        parser.error("no .pdf, .png or .jpg files found in the corpus")
+
+    stub = app_server = None
+    url = args.url
+    if url is None:
+        stub, stub_url = start_stub_server(**config)
+        app_server, url = start_local_app(stub_url, args.llm_cache, args.extraction_cache)
+
+    params = {key: value for key, value in (("mode", args.mode), ("pdf_tier", args.pdf_tier)) if value}
+    try:
+        report = run_load(
+            url,
+            corpus,
+            concurrency=args.concurrency,
+            rps=args.rps,
+            duration=args.duration,
+            requests_total=args.requests,
+            warmup=args.warmup,
+            params=params,
+            timeout=args.timeout
+        )
+    finally:
+        if app_server is not None:
+            app_server.shutdown()
+        if stub is not None:
+            report_stub = stub.RequestHandlerClass.config.snapshot()
+            stub.shutdown()
+
+    report["config"] = {
+        "url": url,
+        "corpus_files": len(corpus),
+        "concurrency": args.concurrency,
+        "rps": args.rps,
+        "mode": args.mode,
+        "stub_latency": args.latency if stub is not None else None,
+        "stub_error_rate": args.error_rate if stub is not None else None
+    }
+    if stub is not None:
+        report["stub"] = report_stub
+
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+"""
+Local stand-in for an OpenAI-compatible chat-completions server.
+
+    python -m loadtest.stub_server --port 8080 --latency lognormal:0:0.4 --error-rate 0.02
+    LLM_BACKEND=openai LLM_BASE_URL=http://127.0.0.1:8080 python app.py
+
+Serves POST /v1/chat/completions, plain or streamed as server-sent
+events, after a delay drawn from --latency. A --error-rate share of
+calls fails with --error-status instead. Replies are either canned,
+picked by the schema name in `response_format` so every pipeline stage
+gets a valid object, or an echo of the last user message. GET /stats
+returns what the stub has served so far.
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Replies per schema name (see LLM_PARSER.schemas.response_schema).
+CANNED_RESPONSES = {
+    "ParsedResume": {
+        "skills": ["Python", "SQL", "Docker", "AWS"],
+        "experience": [
+            {
+                "company": "Northwind Labs",
+                "role": "Software Engineer",
+                "duration": "Jan 2020 - Present",
+                "description": "Built data ingestion pipelines."
+            }
+        ],
+        "projects": [
+            {
+                "name": "Expense Tracker App",
+                "description": "Tracks and categorises personal expenses.",
+                "techstack": ["React", "Node.js", "MongoDB"]
+            }
+        ],
+        "achievements": ["Winner, National Hackathon 2021"]
+    },
+    "ProjectList": {
+        "projects": [
+            {
+                "name": "Expense Tracker App",
+                "description": "Tracks and categorises personal expenses.",
+                "techstack": ["React", "Node.js", "MongoDB"]
+            }
+        ]
+    },
+    "ProjectNames": {"names": ["Expense Tracker App"]},
+    "Decision": {
+        "selected_approach": "nlp_heuristic",
+        "reason": "Stub reply: the heuristic output covers the resume."
+    },
+}
+
+# Characters per streamed chunk, roughly a few tokens each.
+STREAM_CHUNK_CHARS = 12
+
+
+def parse_latency(spec: str):
+    """
+    Seconds sampler from "fixed:S", "uniform:LO:HI", "normal:MEAN:SD"
+    or "lognormal:MU:SIGMA" (parameters of the log of the seconds).
+    """
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(v) for v in args.split(":")] if args else []
+    except ValueError:
+        raise ValueError(f"Bad latency '{spec}'.") from None
+
+    samplers = {
+        "fixed": (1, lambda rng, s: s),
+        "uniform": (2, lambda rng, lo, hi: rng.uniform(lo, hi)),
+        "normal": (2, lambda rng, mean, sd: rng.gauss(mean, sd)),
+        "lognormal": (2, lambda rng, mu, sigma: rng.lognormvariate(mu, sigma)),
+    }
+    if kind not in samplers or len(values) != samplers[kind][0]:
+        raise ValueError(
+            f"Bad latency '{spec}'. Use fixed:S, uniform:LO:HI, normal:MEAN:SD or lognormal:MU:SIGMA."
+        )
+
+    sampler = samplers[kind][1]
+    return lambda rng: max(0.0, sampler(rng, *values))
+
+
+class StubConfig:
+
+    def __init__(
+        self,
+        latency: str = "fixed:0",
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: float = None,
+        mode: str = "canned",
+        responses: dict = None,
+        seed: int = None
+    ):
+        self.latency = latency
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.mode = mode
+        self.responses = {**CANNED_RESPONSES, **(responses or {})}
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "streamed": 0,
+            "errors": 0,
+            "disconnects": 0,
+            "by_schema": {}
+        }
+
+    def draw(self) -> tuple:
+        """
+        (fail?, latency seconds) for one call.
+        """
+        with self.rng_lock:
+            return self.rng.random() < self.error_rate, self.sample_latency(self.rng)
+
+    def count(self, key: str, schema: str = None) -> None:
+        with self.stats_lock:
+            self.stats[key] += 1
+            if schema is not None:
+                self.stats["by_schema"][schema] = self.stats["by_schema"].get(schema, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self.stats_lock:
+            return json.loads(json.dumps(self.stats))
+
+
+def _schema_name(body: dict):
+    response_format = body.get("response_format") or {}
+    return (response_format.get("json_schema") or {}).get("name")
+
+
+def _guess_schema(messages: list):
+    # Without constrained output the prompt is the only hint.
+    prompt = " ".join(str(m.get("content", "")) for m in messages)
+    if "selected_approach" in prompt:
+        return "Decision"
+    if '"names"' in prompt:
+        return "ProjectNames"
+    if '"experience"' in prompt:
+        return "ParsedResume"
+    if '"projects"' in prompt:
+        return "ProjectList"
+    return None
+
+
+def reply_content(config: StubConfig, body: dict) -> tuple:
+    """
+    (schema name, reply text) for a chat-completions request body.
+    """
+    messages = body.get("messages") or []
+    schema = _schema_name(body) or _guess_schema(messages)
+    if config.mode == "echo":
+        user = [m for m in messages if m.get("role") == "user"]
+        return schema, str(user[-1].get("content", "")) if user else ""
+    return schema, json.dumps(config.responses.get(schema, {}), ensure_ascii=False)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config: StubConfig = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, {"latency": self.config.latency, **self.config.snapshot()})
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "invalid JSON body"})
+            return
+
+        config = self.config
+        fail, latency = config.draw()
+        schema, content = reply_content(config, body)
+        config.count("requests", schema or "unknown")
+
+        if fail:
+            config.count("errors")
+            time.sleep(latency)
+            headers = {}
+            if config.retry_after is not None:
+                headers["Retry-After"] = str(config.retry_after)
+            self._send_json(config.error_status, {"error": "stub failure"}, headers)
+            return
+
+        try:
+            if body.get("stream"):
+                config.count("streamed")
+                self._stream(body, content, latency)
+            else:
+                time.sleep(latency)
+                self._send_json(200, self._completion(body, content))
+        except (BrokenPipeError, ConnectionResetError):
+            # The client closes streams early once the JSON object is complete.
+            config.count("disconnects")
+            self.close_connection = True
+
+    def _completion(self, body: dict, content: str) -> dict:
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in body.get("messages") or [])
+        return {
+            "id": f"stub-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(content) // 4
+            }
+        }
+
+    def _stream(self, body: dict, content: str, latency: float) -> None:
+        """
+        Send the reply as chunked server-sent events, spreading the
+        latency over the chunks like token-by-token generation.
+        """
+        pieces = [
+            content[i:i + STREAM_CHUNK_CHARS]
+            for i in range(0, len(content), STREAM_CHUNK_CHARS)
+        ] or [""]
+        delay = latency / len(pieces)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        for piece in pieces:
+            time.sleep(delay)
+            chunk = {
+                "object": "chat.completion.chunk",
+                "model": body.get("model", "stub"),
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+            }
+            self._write_event(json.dumps(chunk))
+        self._write_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _write_event(self, data: str) -> None:
+        event = f"data: {data}\n\n".encode("utf-8")
+        self.wfile.write(f"{len(event):x}\r\n".encode("ascii") + event + b"\r\n")
+        self.wfile.flush()
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients drop pooled keep-alive connections whenever they like.
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+
+def make_stub_server(host: str = "127.0.0.1", port: int = 0, **config) -> StubServer:
+    """
+    A stub server bound to (host, port); port 0 picks a free one. Call
+    serve_forever(), or start_stub_server() to run it on a thread.
+    """
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": StubConfig(**config)})
+    return StubServer((host, port), handler)
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, **config) -> tuple:
+    """
+    Serve on a daemon thread. Returns (server, base URL).
+    """
+    server = make_stub_server(host, port, **config)
+    thread = threading.Thread(target=server.serve_forever, name="llm-stub", daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", default="fixed:0.5",
+                        help="fixed:S, uniform:LO:HI, normal:MEAN:SD or lognormal:MU:SIGMA seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds on failures")
+    parser.add_argument("--reply", choices=("canned", "echo"), default="canned")
+    parser.add_argument("--responses", help="JSON file of {schema name: reply object} overriding the canned ones")
+    parser.add_argument("--stub-seed", type=int, default=None)
+
+
+def stub_config(args) -> dict:
+    responses = None
+    if args.responses:
+        with open(args.responses, "r", encoding="utf-8") as f:
+            responses = json.load(f)
+    parse_latency(args.latency)
+    return {
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "error_status": args.error_status,
+        "retry_after": args.retry_after,
+        "mode": args.reply,
+        "responses": responses,
+        "seed": args.stub_seed
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stub OpenAI-compatible chat-completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        config = stub_config(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    server = make_stub_server(args.host, args.port, **config)
+    host, port = server.server_address[:2]
+    print(f"stub chat-completions server on http://{host}:{port} (latency {args.latency})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
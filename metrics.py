@@ -0,0 +1,248 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# Send a Server-Timing header with every parse response, not only when
+# the request asks for it with ?timings=1.
+METRICS_TIMING_HEADER = os.getenv("METRICS_TIMING_HEADER", "0") == "1"
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+_registry = []
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # label values -> [per-bucket counts, sum, count]
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, **labels) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = _format_labels(self.labels, key, f'le="{_format_value(bound)}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                labels = _format_labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+stage_seconds = Histogram(
+    "resume_stage_seconds",
+    "Wall time of each parsing stage.",
+    ("stage",)
+)
+extraction_seconds = Histogram(
+    "resume_extraction_seconds",
+    "Text extraction time by engine (cache for extraction cache hits).",
+    ("engine",)
+)
+llm_call_seconds = Histogram(
+    "llm_call_seconds",
+    "LLM call latency including retries, by stage.",
+    ("stage",)
+)
+llm_prompt_tokens = Histogram(
+    "llm_prompt_tokens",
+    "Prompt tokens per LLM call.",
+    ("stage",),
+    TOKEN_BUCKETS
+)
+llm_completion_tokens = Histogram(
+    "llm_completion_tokens",
+    "Completion tokens per LLM call.",
+    ("stage",),
+    TOKEN_BUCKETS
+)
+llm_cache_hits = Counter(
+    "llm_cache_hits_total",
+    "LLM calls answered from the response cache.",
+    ("stage",)
+)
+llm_retries = Counter(
+    "llm_retries_total",
+    "LLM requests retried after a retryable error.",
+    ("stage",)
+)
+llm_failures = Counter(
+    "llm_failures_total",
+    "LLM calls that raised, by exception type.",
+    ("stage", "error")
+)
+llm_truncated = Counter(
+    "llm_truncated_total",
+    "Streamed LLM replies that ended before the JSON object closed.",
+    ("stage",)
+)
+stage_fallbacks = Counter(
+    "pipeline_stage_fallbacks_total",
+    "Pipeline stages that timed out or failed and used their fallback.",
+    ("stage", "reason")
+)
+examiner_decisions = Counter(
+    "examiner_decisions_total",
+    "Examiner decisions by stage, chosen approach and what decided it.",
+    ("stage", "approach", "source")
+)
+
+_request_timings = ContextVar("request_timings", default=None)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """
+    Observe a stage duration, and add it to the current request's
+    breakdown when one is being collected.
+    """
+    stage_seconds.observe(seconds, stage=stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def record_extraction(engine: str, seconds: float) -> None:
+    extraction_seconds.observe(seconds, engine=engine)
+    record_stage("extract_text", seconds)
+
+
+def record_decision(stage: str, decision: dict, source: str) -> dict:
+    """
+    Count an examiner decision and return it unchanged.
+    """
+    examiner_decisions.inc(stage=stage, approach=decision["selected_approach"], source=source)
+    return decision
+
+
+@contextmanager
+def timed(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+def start_request():
+    """
+    Start collecting a per-request stage breakdown in this context.
+    Pipeline stages submitted to worker threads carry the context along.
+    Returns a token for `end_request`.
+    """
+    return _request_timings.set({})
+
+
+def request_timings() -> dict:
+    return dict(_request_timings.get() or {})
+
+
+def end_request(token) -> None:
+    _request_timings.reset(token)
+
+
+def server_timing_header(timings: dict) -> str:
+    """
+    Stage breakdown in Server-Timing header format (milliseconds).
+    """
+    return ", ".join(
+        f"{stage};dur={seconds * 1000:.1f}"
+        for stage, seconds in timings.items()
+    )
+
+
+def _gauges(name: str, documentation: str, label: str, values: dict) -> list:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+    for key, value in sorted(values.items()):
+        lines.append(f'{name}{{{label}="{key}"}} {_format_value(value)}')
+    return lines
+
+
+def render(cache_stats: dict = None) -> str:
+    """
+    Every metric in Prometheus text exposition format. `cache_stats`
+    ({cache name: stats dict}) is exported as gauges.
+    """
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for cache, stats in (cache_stats or {}).items():
+        lines.extend(_gauges(
+            f"{cache}_cache_events",
+            f"{cache} cache hits, misses and evictions since start.",
+            "event",
+            stats
+        ))
+    return "\n".join(lines) + "\n"
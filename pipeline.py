@@ -0,0 +1,273 @@
+import os
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dotenv import load_dotenv
+
+from NLP_PARSER.main import parse_resume, parse_resume_nlp, select_projects
+from NLP_PARSER.LLM.llm_project_corrector import refine_projects_with_llm
+from NLP_PARSER.LLM.llm_project import extract_projects_with_llm
+from NLP_PARSER.LLM.examine_projects_llm import examine_project_outputs
+from LLM_PARSER.resume_parser_llm import parse_resume_with_llm
+from resume_examiner_llm import examine_resume_outputs
+from LLM_PARSER.client import call_deadline
+from metrics import stage_fallbacks, timed
+
+
+load_dotenv()
+
+PIPELINE_CONCURRENT = os.getenv("PIPELINE_CONCURRENT", "1") == "1"
+# Threads per request; three covers the widest point of the stage graph.
+PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "3"))
+
+# fast: heuristics only. auto: LLM only for low-confidence sections.
+# accurate: every LLM stage plus both examiners.
+PARSE_MODES = ("fast", "auto", "accurate")
+PARSE_MODE = os.getenv("PARSE_MODE", "accurate")
+AUTO_CONFIDENCE_THRESHOLD = float(os.getenv("AUTO_CONFIDENCE_THRESHOLD", "0.9"))
+
+# Seconds each LLM stage may take, measured from the moment it starts running.
+STAGE_TIMEOUTS = {
+    "refine_projects": float(os.getenv("TIMEOUT_REFINE_PROJECTS", "30")),
+    "extract_projects": float(os.getenv("TIMEOUT_EXTRACT_PROJECTS", "45")),
+    "parse_resume_llm": float(os.getenv("TIMEOUT_PARSE_RESUME_LLM", "60")),
+    "examine_projects": float(os.getenv("TIMEOUT_EXAMINE_PROJECTS", "30")),
+    "examine_resume": float(os.getenv("TIMEOUT_EXAMINE_RESUME", "45")),
+}
+
+EMPTY_LLM_RESUME = {
+    "skills": [],
+    "experience": [],
+    "projects": [],
+    "achievements": []
+}
+
+def _fallback_decision(stage: str) -> dict:
+    return {
+        "selected_approach": "nlp_heuristic",
+        "reason": f"Examiner stage '{stage}' timed out or failed."
+    }
+
+
+def _timed_call(name: str, fn, *args, **kwargs):
+    # The stage's LLM calls, retries included, end at its deadline, so
+    # a stage that timed out frees its thread instead of running on.
+    with timed(name), call_deadline(STAGE_TIMEOUTS[name]):
+        return fn(*args, **kwargs)
+
+
+@contextmanager
+def _stage_pool():
+    """
+    Threads for one request's stages. Requests never queue behind each
+    other, and a timed-out stage is left to hit its call deadline
+    instead of being waited for.
+    """
+    pool = ThreadPoolExecutor(max_workers=PIPELINE_MAX_WORKERS, thread_name_prefix="pipeline")
+    try:
+        yield pool
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _Stage:
+
+    def __init__(self, pool: ThreadPoolExecutor, name: str, fn, *args, **kwargs):
+        self.name = name
+        self.timeout = STAGE_TIMEOUTS[name]
+        self.started_at = None
+        self._started = threading.Event()
+        # Run in a copy of the caller's context so the stage's timings
+        # land in the submitting request's breakdown.
+        self.future = pool.submit(
+            self._run, contextvars.copy_context(), name, fn, *args, **kwargs
+        )
+
+    def _run(self, context, name: str, fn, *args, **kwargs):
+        self.started_at = time.monotonic()
+        self._started.set()
+        return context.run(_timed_call, name, fn, *args, **kwargs)
+
+    def result(self, fallback):
+        """
+        Wait for the stage until its deadline, counted from when it
+        started running. Timeouts and errors resolve to the same
+        fallback the sequential path would use.
+        """
+        self._started.wait()
+        try:
+            return self.future.result(
+                timeout=max(0.0, self.started_at + self.timeout - time.monotonic())
+            )
+        except FutureTimeoutError:
+            stage_fallbacks.inc(stage=self.name, reason="timeout")
+            return fallback
+        except Exception as e:
+            stage_fallbacks.inc(stage=self.name, reason=type(e).__name__)
+            return fallback
+
+
+def _nlp_resume(nlp: dict, projects: list) -> dict:
+    return {
+        "skills": nlp["skills"],
+        "experience": nlp["experience"],
+        "projects": projects,
+        "achievements": nlp["achievements"]
+    }
+
+
+def _submit_project_stages(pool: ThreadPoolExecutor, nlp: dict) -> tuple:
+    project_section = nlp["sections"].get("projects", "")
+    refine = _Stage(
+        pool,
+        "refine_projects",
+        refine_projects_with_llm,
+        project_section_text=project_section,
+        projects=nlp["projects"]
+    )
+    extract = _Stage(pool, "extract_projects", extract_projects_with_llm, project_section)
+    return refine, extract
+
+
+def _join_project_stages(pool: ThreadPoolExecutor, nlp: dict, refine: _Stage, extract: _Stage) -> list:
+
+    nlp_projects = refine.result(fallback=nlp["projects"])
+    llm_projects = extract.result(fallback=[])
+
+    examine_projects = _Stage(
+        pool,
+        "examine_projects",
+        examine_project_outputs,
+        raw_project_section=nlp["sections"].get("projects", ""),
+        nlp_projects=nlp_projects,
+        llm_projects=llm_projects
+    )
+    project_decision = examine_projects.result(
+        fallback=_fallback_decision("examine_projects")
+    )
+    return select_projects(project_decision, nlp_projects, llm_projects)
+
+
+def run_pipeline_fast(cleaned_text: str, nlp: dict = None) -> dict:
+
+    nlp = nlp or parse_resume_nlp(cleaned_text)
+    return _nlp_resume(nlp, nlp["projects"])
+
+
+def run_pipeline_auto(cleaned_text: str, nlp: dict = None) -> dict:
+    """
+    Keep high-confidence heuristic sections and escalate only the rest:
+    low-confidence projects go through the project LLM stages, any other
+    low-confidence section is taken from the full LLM parse when that
+    produced something for it.
+    """
+
+    nlp = nlp or parse_resume_nlp(cleaned_text)
+    low = [
+        section
+        for section, score in nlp["confidence"].items()
+        if score is not None and score < AUTO_CONFIDENCE_THRESHOLD
+    ]
+
+    if not low:
+        return _nlp_resume(nlp, nlp["projects"])
+
+    with _stage_pool() as pool:
+        parse_llm = None
+        if any(section != "projects" for section in low):
+            parse_llm = _Stage(pool, "parse_resume_llm", parse_resume_with_llm, cleaned_text)
+
+        projects = nlp["projects"]
+        if "projects" in low:
+            projects = _join_project_stages(pool, nlp, *_submit_project_stages(pool, nlp))
+
+        resume = _nlp_resume(nlp, projects)
+
+        if parse_llm is not None:
+            llm_parsed_resume = parse_llm.result(fallback=dict(EMPTY_LLM_RESUME))
+            for section in low:
+                if section != "projects" and llm_parsed_resume.get(section):
+                    resume[section] = llm_parsed_resume[section]
+
+    return resume
+
+
+def run_pipeline_sequential(cleaned_text: str, nlp: dict = None) -> dict:
+
+    nlp_parsed_resume = parse_resume(cleaned_text, nlp=nlp)
+    with timed("parse_resume_llm"):
+        llm_parsed_resume = parse_resume_with_llm(cleaned_text)
+    with timed("examine_resume"):
+        decision = examine_resume_outputs(
+            raw_resume_text=cleaned_text,
+            nlp_resume_json=nlp_parsed_resume,
+            llm_resume_json=llm_parsed_resume
+        )
+    return (
+        nlp_parsed_resume
+        if decision["selected_approach"] == "nlp_heuristic"
+        else llm_parsed_resume
+    )
+
+
+def run_pipeline_concurrent(cleaned_text: str, nlp: dict = None) -> dict:
+    """
+    Same stages as the sequential path, scheduled by data dependency:
+
+        refine_projects  ─┐
+        extract_projects ─┴─> examine_projects ─┐
+        parse_resume_llm ───────────────────────┴─> examine_resume
+
+    so the critical path is three LLM round trips instead of five.
+    """
+
+    with _stage_pool() as pool:
+        parse_llm = _Stage(pool, "parse_resume_llm", parse_resume_with_llm, cleaned_text)
+
+        nlp = nlp or parse_resume_nlp(cleaned_text)
+        projects = _join_project_stages(pool, nlp, *_submit_project_stages(pool, nlp))
+
+        nlp_parsed_resume = _nlp_resume(nlp, projects)
+        llm_parsed_resume = parse_llm.result(fallback=dict(EMPTY_LLM_RESUME))
+
+        examine_resume = _Stage(
+            pool,
+            "examine_resume",
+            examine_resume_outputs,
+            raw_resume_text=cleaned_text,
+            nlp_resume_json=nlp_parsed_resume,
+            llm_resume_json=llm_parsed_resume
+        )
+        decision = examine_resume.result(fallback=_fallback_decision("examine_resume"))
+
+    return (
+        nlp_parsed_resume
+        if decision["selected_approach"] == "nlp_heuristic"
+        else llm_parsed_resume
+    )
+
+
+def run_pipeline(cleaned_text: str, mode: str = None, concurrent: bool = None, nlp: dict = None) -> dict:
+    """
+    `nlp` is a parse_resume_nlp result for `cleaned_text` computed
+    elsewhere (e.g. in a batch worker process); it is parsed here if not
+    given.
+    """
+
+    mode = mode or PARSE_MODE
+    if mode not in PARSE_MODES:
+        raise ValueError(f"Unknown parse mode '{mode}'. Expected one of {PARSE_MODES}.")
+
+    if mode == "fast":
+        return run_pipeline_fast(cleaned_text, nlp)
+    if mode == "auto":
+        return run_pipeline_auto(cleaned_text, nlp)
+
+    if concurrent is None:
+        concurrent = PIPELINE_CONCURRENT
+
+    if concurrent:
+        return run_pipeline_concurrent(cleaned_text, nlp)
+    return run_pipeline_sequential(cleaned_text, nlp)
@@ -0,0 +1,232 @@
+"""
+Opt-in CPU and memory profiling of single parse requests.
+
+    python profiling.py resume.pdf --mode accurate
+
+A profiled request runs under cProfile and leaves two files in
+PROFILE_DIR, named by time and the upload's content hash:
+
+    <name>.prof   cProfile stats, for pstats / snakeviz
+    <name>.json   hash, timings and, with memory tracing, peak memory
+                  and top allocation sites
+
+cProfile only sees the thread that enabled it, but tracemalloc traces
+every thread in the process: in a server handling several requests at
+once, its numbers would mix all of them and slow every one. Memory is
+therefore traced only with PROFILE_TRACE_MEMORY=1, meant for a process
+serving one request at a time, and always by the offline replay below.
+
+Requests are profiled when they ask for it (X-Profile: 1 or ?profile=1,
+honoured only with PROFILE_ALLOW_REQUESTS=1) or by PROFILE_SAMPLE_RATE.
+Run this module on the archived upload with the same hash to replay a
+slow request offline.
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+import metrics
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./var/profiles")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_ALLOW_REQUESTS = os.getenv("PROFILE_ALLOW_REQUESTS", "0") == "1"
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+PROFILE_MAX_BYTES = int(os.getenv("PROFILE_MAX_BYTES", str(200 * 1024 * 1024)))
+PROFILE_TRACE_MEMORY = os.getenv("PROFILE_TRACE_MEMORY", "0") == "1"
+PROFILE_TRACE_FRAMES = int(os.getenv("PROFILE_TRACE_FRAMES", "10"))
+PROFILE_HEADER = "X-Profile"
+
+TOP_ALLOCATIONS = 25
+
+# One profile at a time: tracemalloc is process-wide, and concurrent
+# cProfile runs would double the overhead on a server already under load.
+_lock = threading.Lock()
+
+
+class ProfileRun:
+    """
+    Handle for the request being profiled; set `digest` once known.
+    """
+
+    def __init__(self, metadata: dict):
+        self.metadata = metadata
+        self.digest = None
+        self.name = None
+
+
+def should_profile(requested: bool = False) -> bool:
+    if requested and PROFILE_ALLOW_REQUESTS:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+@contextmanager
+def profile_request(
+    requested: bool = False,
+    force: bool = False,
+    trace_memory: bool = None,
+    **metadata
+):
+    """
+    Profile the block when the request asked for it (see should_profile)
+    or `force` is set. Yields a ProfileRun, or None when not profiling,
+    including when another request is already being profiled.
+    `trace_memory` defaults to PROFILE_TRACE_MEMORY.
+    """
+    if not (force or should_profile(requested)) or not _lock.acquire(blocking=False):
+        yield None
+        return
+
+    if trace_memory is None:
+        trace_memory = PROFILE_TRACE_MEMORY
+    run = ProfileRun(metadata)
+    profiler = cProfile.Profile()
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(PROFILE_TRACE_FRAMES)
+    if trace_memory:
+        tracemalloc.reset_peak()
+
+    error = None
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield run
+    except BaseException as e:
+        error = repr(e)
+        raise
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        try:
+            snapshot, peak = None, None
+            if trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+            _write(run, profiler, snapshot, peak, elapsed, error)
+        except OSError as e:
+            logger.warning("could not write profile: %s", e)
+        finally:
+            _lock.release()
+
+
+def _top_allocations(snapshot) -> list:
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_bytes": stat.size,
+            "count": stat.count
+        }
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+    ]
+
+
+def _write(run: ProfileRun, profiler, snapshot, peak: int, elapsed: float, error) -> None:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+    run.name = f"{stamp}-{(run.digest or 'unknown')[:16]}"
+    base = os.path.join(PROFILE_DIR, run.name)
+
+    profiler.dump_stats(base + ".prof")
+    report = {
+        "name": run.name,
+        "digest": run.digest,
+        "elapsed_seconds": round(elapsed, 4),
+        "peak_memory_bytes": peak,
+        "stage_seconds": metrics.request_timings(),
+        "error": error,
+        "top_allocations": _top_allocations(snapshot) if snapshot else None,
+        **run.metadata
+    }
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    logger.info("wrote profile %s (%.2fs, peak %s bytes)", base, elapsed, peak)
+    _prune(PROFILE_DIR)
+
+
+def _prune(directory: str) -> None:
+    """
+    Delete the oldest profiles beyond PROFILE_MAX_FILES or PROFILE_MAX_BYTES.
+    """
+    profiles = {}
+    for entry in os.scandir(directory):
+        name, ext = os.path.splitext(entry.name)
+        if ext in (".prof", ".json"):
+            stat = entry.stat()
+            size, mtime = profiles.get(name, (0, 0))
+            profiles[name] = (size + stat.st_size, max(mtime, stat.st_mtime))
+
+    oldest_first = sorted(profiles, key=lambda name: profiles[name][1])
+    total = sum(size for size, _ in profiles.values())
+    while oldest_first and (len(oldest_first) > PROFILE_MAX_FILES or total > PROFILE_MAX_BYTES):
+        name = oldest_first.pop(0)
+        total -= profiles[name][0]
+        for ext in (".prof", ".json"):
+            try:
+                os.remove(os.path.join(directory, name + ext))
+            except FileNotFoundError:
+                pass
+
+
+def profile_file(path: str, mode: str = None, pdf_tier: str = None) -> str:
+    """
+    Extract and parse a local file under the profiler, bypassing the
+    extraction cache. Returns the profile name.
+    """
+    from extractor.cache import copy_and_hash, extract_cached
+    from pipeline import run_pipeline
+
+    token = metrics.start_request()
+    try:
+        with profile_request(
+            force=True, trace_memory=True, filename=os.path.basename(path), mode=mode, replay=True
+        ) as run:
+            if run is None:
+                raise RuntimeError("Another profile is being recorded in this process.")
+            with open(path, "rb") as f, open(os.devnull, "wb") as sink:
+                run.digest = copy_and_hash(f, sink)
+            document = extract_cached(path, run.digest, pdf_tier=pdf_tier, use_cache=False)
+            run_pipeline(document["cleaned_text"], mode=mode, concurrent=False)
+    finally:
+        metrics.end_request(token)
+    return run.name
+
+
+def main(argv=None) -> int:
+    from extractor.pdf import PDF_TIERS
+    from pipeline import PARSE_MODES
+
+    parser = argparse.ArgumentParser(description="Profile one resume through the full parse.")
+    parser.add_argument("path", help="resume file (e.g. an archived upload)")
+    parser.add_argument("--mode", choices=PARSE_MODES, default=None)
+    parser.add_argument("--pdf-tier", choices=PDF_TIERS, default=None)
+    args = parser.parse_args(argv)
+
+    name = profile_file(args.path, mode=args.mode, pdf_tier=args.pdf_tier)
+    print(os.path.join(PROFILE_DIR, name + ".prof"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
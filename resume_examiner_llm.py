@@ -1,133 +1,107 @@
-import os
-import json
-import ast
-from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
-
-
-
-load_dotenv()
-
-HF_TOKEN = os.getenv("HF_TOKEN")
-if not HF_TOKEN:
-    raise RuntimeError("HF_TOKEN not loaded. Check your .env file.")
-
-
-_client = InferenceClient(
-    model="mistralai/Mistral-7B-Instruct-v0.2",
-    token=HF_TOKEN
+from LLM_PARSER.client import chat_completion
+from LLM_PARSER.preflight import estimate_decision_output, size_max_tokens
+from LLM_PARSER.prompt_builder import (
+    SAME_AS_NLP,
+    JsonPart,
+    ResumeTextPart,
+    build_prompt,
+    dedupe_against,
+    template
 )
-
-
-
-def _safe_json(data):
-
-    if isinstance(data, dict):
-        return data
-
-    if not isinstance(data, str) or not data.strip():
-        return {}
-
-
-    if data.count("{") != data.count("}"):
-        return {}
-
-
-    try:
-        start = data.index("{")
-        end = data.rindex("}") + 1
-        return json.loads(data[start:end])
-    except Exception:
-        pass
-
-
-    try:
-        start = data.index("{")
-        end = data.rindex("}") + 1
-        return ast.literal_eval(data[start:end])
-    except Exception:
-        return {}
-
+from LLM_PARSER.schemas import Decision, validate_response
+from NLP_PARSER.agreement import compare_resumes, agreement_decision
+from NLP_PARSER.grounding import score_resume, grounding_decision
+from metrics import record_decision
+
+
+EXAMINE_RESUME_TEMPLATE = template("""
+You are a STRICT resume parsing EXAMINER.
+
+IMPORTANT OUTPUT CONSTRAINT (MANDATORY):
+- You MUST think silently.
+- You MUST NOT include any text outside the JSON object.
+- Your response MUST start with '{{' and MUST end with '}}'.
+- Use DOUBLE QUOTES for all keys and string values.
+- DO NOT use markdown, bullet points, or explanations.
+
+YOUR ROLE:
+Compare two parsed resume JSON outputs against the RAW RESUME TEXT
+and decide which approach is MORE CORRECT.
+
+--------------------------------------------------
+REFERENCE RESUME JSON SCHEMA (MANDATORY)
+--------------------------------------------------
+
+{{
+"experience": [
+    {{
+    "company": "",
+    "role": "",
+    "duration": "",
+    "description": ""
+    }}
+],
+"projects": [
+    {{
+    "name": "",
+    "description": "",
+    "techstack": []
+    }}
+],
+"skills": [],
+"achievements": []
+}}
+
+--------------------------------------------------
+DECISION FORMAT (MANDATORY)
+--------------------------------------------------
+
+{{
+"selected_approach": "nlp_heuristic | llm_extraction",
+"reason": "one short factual sentence"
+}}
+
+--------------------------------------------------
+STRICT EVALUATION RULES
+--------------------------------------------------
+- Raw resume text is the ONLY source of truth.
+- Penalize hallucination, inference, rewriting, or schema violations.
+- Penalize extra or missing entries.
+- Do NOT reward formatting or verbosity.
+- If both outputs contain errors, choose the LESS incorrect one.
+
+--------------------------------------------------
+INPUT DATA
+--------------------------------------------------
+
+RAW RESUME TEXT:
+<<<
+{raw_resume_text}
+>>>
+
+NLP HEURISTIC OUTPUT:
+<<<
+{nlp_resume_json}
+>>>
+
+LLM EXTRACTION OUTPUT (a field equal to the NLP output reads "{same_as_nlp}"):
+<<<
+{llm_resume_json}
+>>>
+
+END.
+""")
 
 
 def _build_examiner_prompt(raw_resume_text, nlp_resume_json, llm_resume_json):
-    return f"""
-        You are a STRICT resume parsing EXAMINER.
-
-        IMPORTANT OUTPUT CONSTRAINT (MANDATORY):
-        - You MUST think silently.
-        - You MUST NOT include any text outside the JSON object.
-        - Your response MUST start with '{{' and MUST end with '}}'.
-        - Use DOUBLE QUOTES for all keys and string values.
-        - DO NOT use markdown, bullet points, or explanations.
-
-        YOUR ROLE:
-        Compare two parsed resume JSON outputs against the RAW RESUME TEXT
-        and decide which approach is MORE CORRECT.
-
-        --------------------------------------------------
-        REFERENCE RESUME JSON SCHEMA (MANDATORY)
-        --------------------------------------------------
-
-        {{
-        "experience": [
-            {{
-            "company": "",
-            "role": "",
-            "duration": "",
-            "description": ""
-            }}
-        ],
-        "projects": [
-            {{
-            "name": "",
-            "description": "",
-            "techstack": []
-            }}
-        ],
-        "skills": [],
-        "achievements": []
-        }}
-
-        --------------------------------------------------
-        DECISION FORMAT (MANDATORY)
-        --------------------------------------------------
-
-        {{
-        "selected_approach": "nlp_heuristic | llm_extraction",
-        "reason": "one short factual sentence"
-        }}
-
-        --------------------------------------------------
-        STRICT EVALUATION RULES
-        --------------------------------------------------
-        - Raw resume text is the ONLY source of truth.
-        - Penalize hallucination, inference, rewriting, or schema violations.
-        - Penalize extra or missing entries.
-        - Do NOT reward formatting or verbosity.
-        - If both outputs contain errors, choose the LESS incorrect one.
-
-        --------------------------------------------------
-        INPUT DATA
-        --------------------------------------------------
-
-        RAW RESUME TEXT:
-        <<<
-        {raw_resume_text}
-        >>>
-
-        NLP HEURISTIC OUTPUT:
-        <<<
-        {json.dumps(nlp_resume_json, indent=2)}
-        >>>
-
-        LLM EXTRACTION OUTPUT:
-        <<<
-        {json.dumps(llm_resume_json, indent=2)}
-        >>>
-
-        END.
-        """
+    return build_prompt(
+        "examine_resume",
+        EXAMINE_RESUME_TEMPLATE,
+        raw_resume_text=ResumeTextPart(raw_resume_text),
+        nlp_resume_json=JsonPart(nlp_resume_json),
+        llm_resume_json=JsonPart(dedupe_against(nlp_resume_json, llm_resume_json)),
+        same_as_nlp=SAME_AS_NLP
+    )
 
 
 
@@ -136,7 +110,21 @@ def examine_resume_outputs(
     nlp_resume_json: dict,
     llm_resume_json: dict
 ) -> dict:
-    
+
+    grounded_decision = grounding_decision(
+        "resume",
+        score_resume(raw_resume_text, nlp_resume_json),
+        score_resume(raw_resume_text, llm_resume_json)
+    )
+    if grounded_decision:
+        return record_decision("resume", grounded_decision, "grounding")
+
+    local_decision = agreement_decision(
+        "resume",
+        compare_resumes(nlp_resume_json, llm_resume_json)
+    )
+    if local_decision:
+        return record_decision("resume", local_decision, "agreement")
 
     prompt = _build_examiner_prompt(
         raw_resume_text,
@@ -144,38 +132,23 @@ def examine_resume_outputs(
         llm_resume_json
     )
 
-    def _call_llm(max_tokens: int):
-        response = _client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0,
-            max_tokens=max_tokens,
-            stop=["END."]
-        )
-        return response.choices[0].message.content
-
- 
-    response_text = _call_llm(max_tokens=600)
-    decision = _safe_json(response_text)
-
-    if (
-        isinstance(decision, dict)
-        and decision.get("selected_approach") in {"nlp_heuristic", "llm_extraction"}
-        and isinstance(decision.get("reason"), str)
-    ):
-        return decision
-
-    response_text = _call_llm(max_tokens=1000)
-    decision = _safe_json(response_text)
-
-    if (
-        isinstance(decision, dict)
-        and decision.get("selected_approach") in {"nlp_heuristic", "llm_extraction"}
-        and isinstance(decision.get("reason"), str)
-    ):
-        return decision
-
-    
-    return {
+    messages = [{"role": "user", "content": prompt}]
+
+    # Sized up front, so there is no second, larger call after a cut-off.
+    response_text = chat_completion(
+        messages=messages,
+        temperature=0.0,
+        max_tokens=size_max_tokens("examine_resume", messages, estimate_decision_output()),
+        stream_json=True,
+        response_model=Decision,
+        stage="examine_resume"
+    )
+    decision = validate_response(response_text, Decision)
+
+    if decision:
+        return record_decision("resume", decision, "llm")
+
+    return record_decision("resume", {
         "selected_approach": "nlp_heuristic",
         "reason": "Examiner output was truncated or invalid and could not be parsed safely."
-    }
+    }, "fallback")
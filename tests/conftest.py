@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Settings are read at import time: keep tests off the shared caches.
+_tmp = tempfile.mkdtemp(prefix="resume-parser-tests-")
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+os.environ.setdefault("EXTRACTION_CACHE_ENABLED", "0")
+os.environ.setdefault("SKILL_TAXONOMY_INDEX_PATH", os.path.join(_tmp, "skill_taxonomy.idx"))
+os.environ.setdefault("JOB_DB_PATH", os.path.join(_tmp, "jobs.sqlite3"))
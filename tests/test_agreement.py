@@ -0,0 +1,98 @@
+import pytest
+
+from NLP_PARSER.agreement import (
+    _match_entries,
+    _text_similarity,
+    agreement_decision,
+    compare_projects,
+    compare_resumes,
+    jaccard
+)
+
+PROJECTS = [
+    {"name": "Expense Tracker", "description": "Budgeting app with charts", "techstack": ["React", "Node.js"]},
+    {"name": "Movie Recommender", "description": "Collaborative filtering model", "techstack": ["Python"]},
+]
+
+
+def test_jaccard():
+    assert jaccard(set(), set()) == 1.0
+    assert jaccard({"a", "b"}, {"b", "c"}) == 1 / 3
+
+
+def test_identical_projects_agree_fully():
+    assert compare_projects(PROJECTS, [dict(p) for p in PROJECTS]) == {
+        "score": 1.0, "count_ratio": 1.0, "content": 1.0
+    }
+
+
+def test_order_case_and_punctuation_do_not_matter():
+    llm = [
+        {"name": "movie recommender", "description": "Collaborative-filtering model.", "tech_stack": ["python"]},
+        {"name": "EXPENSE TRACKER", "description": "budgeting app with charts", "tech_stack": ["react", "node.js"]},
+    ]
+
+    assert compare_projects(PROJECTS, llm)["score"] == 1.0
+
+
+def test_missing_project_counts_twice():
+    # Once in the count ratio, once as a zero in the content mean.
+    agreement = compare_projects(PROJECTS, PROJECTS[:1])
+
+    assert agreement["count_ratio"] == 0.5
+    assert agreement["content"] == 0.5
+    assert agreement["score"] == 0.25
+
+
+def test_both_empty_agree():
+    assert compare_projects([], None)["score"] == 1.0
+
+
+def test_match_entries_pairs_greedily():
+    score = _match_entries(["a b", "c d"], ["c d", "a x"], _text_similarity)
+
+    assert score == (1.0 + 1 / 3) / 2
+
+
+def test_resume_score_weights_sections():
+    resume = {
+        "skills": ["Python", "SQL"],
+        "experience": [{"role": "Engineer", "company": "Acme", "description": "Built APIs"}],
+        "projects": PROJECTS,
+        "achievements": ["Won a hackathon"]
+    }
+    other = dict(resume, skills=["Python", "Go"])
+
+    agreement = compare_resumes(resume, other)
+
+    assert agreement["skills"] == round(1 / 3, 4)
+    assert agreement["experience"] == agreement["projects"] == agreement["achievements"] == 1.0
+    assert agreement["score"] == round(0.2 / 3 + 0.8, 4)
+
+
+def test_string_entries_are_compared_as_text():
+    assert compare_resumes({"experience": ["Engineer at Acme"]}, {"experience": ["Engineer at Acme"]})["score"] == 1.0
+
+
+@pytest.mark.parametrize("score, skipped", [(0.95, True), (0.9, True), (0.89, False)])
+def test_decision_skips_the_examiner_at_the_threshold(score, skipped):
+    decision = agreement_decision("projects", {"score": score}, threshold=0.9)
+
+    if skipped:
+        assert decision["selected_approach"] == "nlp_heuristic"
+        assert f"{score:.2f}" in decision["reason"]
+    else:
+        assert decision is None
+
+
+def test_agreeing_outputs_skip_the_examiner_llm(monkeypatch):
+    from NLP_PARSER.LLM import examine_projects_llm
+
+    def no_llm(**kwargs):
+        raise AssertionError("examiner LLM called")
+    monkeypatch.setattr(examine_projects_llm, "chat_completion", no_llm)
+    monkeypatch.setattr(examine_projects_llm, "grounding_decision", lambda *args: None)
+
+    decision = examine_projects_llm.examine_project_outputs("", PROJECTS, [dict(p) for p in PROJECTS])
+
+    assert decision["selected_approach"] == "nlp_heuristic"
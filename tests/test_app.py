@@ -0,0 +1,48 @@
+import io
+import json
+
+import pytest
+
+import app as app_module
+import jobs
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(app_module, "job_queue", jobs.JobQueue(str(tmp_path / "jobs.sqlite3")))
+    return app_module.app.test_client()
+
+
+def submit(client, data: bytes):
+    return client.post("/jobs", data={"resume": (io.BytesIO(data), "resume.pdf")})
+
+
+def test_import_starts_no_workers():
+    assert jobs._pool is None
+
+
+def test_job_upload_is_stored(client):
+    response = submit(client, b"%PDF small")
+
+    assert response.status_code == 202
+    job_id = json.loads(response.data)["job_id"]
+    assert app_module.job_queue.claim()["payload"] == b"%PDF small"
+    assert app_module.job_queue.get(job_id)["status"] == "running"
+
+
+def test_oversized_request_is_rejected(monkeypatch, client):
+    monkeypatch.setitem(app_module.app.config, "MAX_CONTENT_LENGTH", 1024)
+
+    response = submit(client, b"x" * 4096)
+
+    assert response.status_code == 413
+    assert app_module.job_queue.claim() is None
+
+
+def test_oversized_job_payload_is_rejected_while_reading(monkeypatch, client):
+    # As for a chunked upload: no Content-Length for Flask to check.
+    monkeypatch.setitem(app_module.app.config, "MAX_CONTENT_LENGTH", None)
+    monkeypatch.setattr(app_module, "MAX_UPLOAD_BYTES", 1024)
+
+    assert submit(client, b"x" * 1024).status_code == 202
+    assert submit(client, b"x" * 1025).status_code == 413
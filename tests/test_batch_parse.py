@@ -0,0 +1,97 @@
+import argparse
+import json
+
+import pytest
+
+import batch_parse
+import pipeline
+import NLP_PARSER.main
+from batch_parse import run_batch
+from tests.test_parse_modes import LLM_RESUME
+
+
+def batch_args(input_dir, output) -> argparse.Namespace:
+    return argparse.Namespace(
+        input=str(input_dir),
+        manifest=None,
+        output=str(output),
+        checkpoint=None,
+        mode="fast",
+        pdf_tier="auto",
+        workers=1,
+        llm_concurrency=1
+    )
+
+
+def test_failed_documents_are_retried_on_the_next_run(tmp_path):
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "broken.pdf").write_text("not a pdf")
+    output = tmp_path / "parsed.jsonl"
+
+    first = run_batch(batch_args(tmp_path / "in", output))
+    second = run_batch(batch_args(tmp_path / "in", output))
+
+    assert first["errors"] == second["errors"] == 1
+    assert second["skipped"] == 0
+    assert (tmp_path / "parsed.jsonl.checkpoint").read_text() == ""
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record["path"].endswith("broken.pdf") and "error" in record for record in records] == [True, True]
+
+
+def test_skipped_counts_only_inputs_in_the_checkpoint(tmp_path):
+    (tmp_path / "in").mkdir()
+    for name in ("done.pdf", "broken.pdf"):
+        (tmp_path / "in" / name).write_text("not a pdf")
+    output = tmp_path / "parsed.jsonl"
+    (tmp_path / "parsed.jsonl.checkpoint").write_text(
+        f"{tmp_path / 'in' / 'done.pdf'}\n{tmp_path / 'elsewhere' / 'gone.pdf'}\n"
+    )
+
+    stats = run_batch(batch_args(tmp_path / "in", output))
+
+    assert stats["skipped"] == 1
+    assert stats["errors"] == 1
+
+
+@pytest.fixture
+def extracted(monkeypatch, tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"%PDF")
+    monkeypatch.setattr(batch_parse, "extract_cached", lambda path, digest, pdf_tier: {
+        "pages": 1,
+        "engine": "fast",
+        "cleaned_text": "SKILLS\nPython, Go"
+    })
+    return str(path)
+
+
+def test_fast_mode_finishes_in_the_worker(extracted):
+    document = batch_parse._extract_document(extracted, "fast", "auto")
+
+    assert document["result"]["skills"] == ["Go", "Python"]
+    assert "nlp" not in document
+
+
+@pytest.mark.parametrize("mode", ["auto", "accurate"])
+def test_llm_modes_reuse_the_worker_parse(monkeypatch, extracted, mode):
+    document = batch_parse._extract_document(extracted, mode, "auto")
+    assert "result" not in document
+    assert document["nlp"]["skills"] == ["Go", "Python"]
+
+    def reparsed(text):
+        raise AssertionError("heuristic parse ran on the LLM thread")
+    monkeypatch.setattr(pipeline, "parse_resume_nlp", reparsed)
+    monkeypatch.setattr(NLP_PARSER.main, "parse_resume_nlp", reparsed)
+    monkeypatch.setattr(pipeline, "parse_resume_with_llm", lambda text: dict(LLM_RESUME))
+    for name in ("refine_projects_with_llm", "extract_projects_with_llm"):
+        monkeypatch.setattr(pipeline, name, lambda *args, **kwargs: [])
+        monkeypatch.setattr(NLP_PARSER.main, name, lambda *args, **kwargs: [])
+    decision = {"selected_approach": "nlp_heuristic", "reason": "test"}
+    for module in (pipeline, NLP_PARSER.main):
+        monkeypatch.setattr(module, "examine_project_outputs", lambda **kwargs: decision)
+    monkeypatch.setattr(pipeline, "examine_resume_outputs", lambda **kwargs: decision)
+
+    document = batch_parse._parse_with_llm(document, mode)
+
+    assert document["result"]["skills"] == ["Go", "Python"]
+    assert "nlp" not in document
@@ -0,0 +1,40 @@
+from benchmarks.bench_nlp import compare_results, machine_factor
+
+
+def results(calibration_us, **timings) -> dict:
+    meta = {} if calibration_us is None else {"calibration_us": calibration_us}
+    return {
+        "meta": meta,
+        "results": {name: {"bulleted/small": {"min_us": us}} for name, us in timings.items()}
+    }
+
+
+def test_slower_machine_is_not_a_regression():
+    baseline = results(100.0, detect_sections=1000.0)
+    current = results(200.0, detect_sections=2100.0)
+
+    [(_, _, _, _, ratio, regressed)] = compare_results(baseline, current, threshold=0.15)
+
+    assert machine_factor(baseline, current) == 2.0
+    assert round(ratio, 2) == 1.05
+    assert not regressed
+
+
+def test_regression_is_flagged_on_a_faster_machine():
+    baseline = results(200.0, detect_sections=2000.0)
+    current = results(100.0, detect_sections=1400.0)
+
+    [(*_, regressed)] = compare_results(baseline, current, threshold=0.15)
+
+    assert regressed
+
+
+def test_baseline_without_calibration_is_compared_raw():
+    baseline = results(None, detect_sections=1000.0)
+    current = results(200.0, detect_sections=1100.0)
+
+    [(*_, ratio, regressed)] = compare_results(baseline, current, threshold=0.15)
+
+    assert machine_factor(baseline, current) == 1.0
+    assert round(ratio, 2) == 1.1
+    assert not regressed
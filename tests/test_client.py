@@ -0,0 +1,259 @@
+import pytest
+
+import metrics
+from LLM_PARSER import client
+from LLM_PARSER.client import LLMHTTPError
+from LLM_PARSER.response_cache import ResponseCache
+from LLM_PARSER.schemas import Decision, ProjectNames
+
+
+def sleeps(monkeypatch) -> list:
+    slept = []
+    monkeypatch.setattr(client.time, "sleep", slept.append)
+    return slept
+
+
+def test_retry_after_is_capped_at_backoff_max(monkeypatch):
+    slept = sleeps(monkeypatch)
+
+    client._backoff(LLMHTTPError(429, "slow down", retry_after=3600), 0, "test")
+
+    assert slept == [client.LLM_BACKOFF_MAX]
+
+
+def test_short_retry_after_is_honoured(monkeypatch):
+    slept = sleeps(monkeypatch)
+
+    client._backoff(LLMHTTPError(503, "busy", retry_after=0.25), 0, "test")
+
+    assert slept == [0.25]
+
+
+def test_negative_retry_after_does_not_sleep(monkeypatch):
+    slept = sleeps(monkeypatch)
+
+    client._backoff(LLMHTTPError(503, "busy", retry_after=-5), 0, "test")
+
+    assert slept == [0.0]
+
+
+class ReplyBackend:
+    model = "reply"
+    supports_response_format = False
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def chat(self, messages, **params):
+        self.calls += 1
+        return self.replies.pop(0)
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    response_cache = ResponseCache(str(tmp_path / "llm.sqlite3"), ttl=3600, max_entries=100)
+    monkeypatch.setattr(client, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(client, "get_response_cache", lambda: response_cache)
+    previous = client._backend
+    yield response_cache
+    client.set_backend(previous)
+
+
+def complete(model=ProjectNames) -> str:
+    return client.chat_completion(
+        [{"role": "user", "content": "names?"}],
+        max_tokens=64,
+        temperature=0.0,
+        response_model=model,
+        stage="test"
+    )
+
+
+@pytest.mark.parametrize("bad", ["I cannot help with that.", '{"other": 1}', '{"names": "x"}'])
+def test_invalid_reply_is_not_cached(cache, bad):
+    backend = ReplyBackend(bad, '{"names": ["A"]}')
+    client.set_backend(backend)
+
+    assert complete() == bad
+    assert complete() == '{"names": ["A"]}'
+    assert complete() == '{"names": ["A"]}'
+    assert backend.calls == 2
+
+
+def test_invalid_cached_reply_is_ignored(cache):
+    key = ResponseCache.make_key("reply", [{"role": "user", "content": "names?"}], max_tokens=64, temperature=0.0)
+    cache.put(key, "reply", "garbage")
+    backend = ReplyBackend('{"names": ["A"]}')
+    client.set_backend(backend)
+
+    assert complete() == '{"names": ["A"]}'
+    assert backend.calls == 1
+    assert cache.stats() == {"hits": 0, "misses": 1}
+    assert complete() == '{"names": ["A"]}'
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_decision_missing_required_field_is_not_cached(cache):
+    backend = ReplyBackend('{"selected_approach": "llm_extraction"}', '{"selected_approach": "llm_extraction"}')
+    client.set_backend(backend)
+
+    complete(Decision)
+    complete(Decision)
+
+    assert backend.calls == 2
+
+
+@pytest.fixture
+def slow_server():
+    from loadtest.stub_server import start_stub_server
+
+    server, url = start_stub_server(latency="fixed:2")
+    yield url
+    server.shutdown()
+
+
+@pytest.mark.parametrize("stream_json", [False, True])
+def test_call_deadline_bounds_the_http_call(slow_server, stream_json):
+    import requests
+
+    previous = client._backend
+    client.set_backend(client.OpenAICompatibleBackend(base_url=slow_server, model="stub"))
+    try:
+        started = client.time.monotonic()
+        with pytest.raises((requests.RequestException, client.LLMDeadlineExceeded)), client.call_deadline(0.3):
+            client.chat_completion(
+                [{"role": "user", "content": '"names"'}],
+                max_tokens=16,
+                temperature=0.0,
+                stream_json=stream_json,
+                stage="test"
+            )
+        elapsed = client.time.monotonic() - started
+    finally:
+        client.set_backend(previous)
+
+    assert elapsed < 1.0
+
+
+def test_backoff_gives_up_when_the_retry_would_miss_the_deadline(monkeypatch):
+    slept = sleeps(monkeypatch)
+    error = LLMHTTPError(503, "busy", retry_after=5)
+
+    with pytest.raises(LLMHTTPError), client.call_deadline(1.0):
+        client._backoff(error, 0, "test")
+
+    assert slept == []
+
+
+def test_request_timeout_is_cut_to_the_deadline():
+    assert client._request_timeout() == client.LLM_TIMEOUT_SECONDS
+
+    with client.call_deadline(0.5):
+        assert 0 < client._request_timeout() <= 0.5
+        with client.call_deadline(10):
+            assert client._request_timeout() <= 0.5
+
+    with client.call_deadline(-1), pytest.raises(client.LLMDeadlineExceeded):
+        client._request_timeout()
+
+
+class StreamBackend(ReplyBackend):
+    """
+    Streams each reply in small chunks and records how far it was read.
+    """
+
+    def __init__(self, *replies, fail_after: int = None):
+        super().__init__(*replies)
+        self.fail_after = fail_after
+        self.read = []
+        self.closed = 0
+
+    def stream(self, messages, **params):
+        self.calls += 1
+        reply = self.replies.pop(0)
+        read = []
+        self.read.append(read)
+        try:
+            for i in range(0, len(reply), 4):
+                if self.fail_after is not None and i >= self.fail_after:
+                    raise ConnectionResetError("connection dropped")
+                read.append(reply[i:i + 4])
+                yield reply[i:i + 4]
+        finally:
+            self.closed += 1
+
+
+def stream_complete(model=ProjectNames) -> str:
+    return client.chat_completion(
+        [{"role": "user", "content": "names?"}],
+        max_tokens=64,
+        temperature=0.0,
+        stream_json=True,
+        response_model=model,
+        stage="test"
+    )
+
+
+@pytest.fixture
+def streaming(monkeypatch, cache):
+    monkeypatch.setattr(client, "LLM_STREAMING", True)
+
+
+def test_stream_is_closed_once_the_object_is_complete(streaming):
+    backend = StreamBackend('{"names": ["A", "B"]}\n\nLet me know if you need anything else!')
+    client.set_backend(backend)
+
+    assert stream_complete() == '{"names": ["A", "B"]}'
+    assert "".join(backend.read[0]).startswith('{"names": ["A", "B"]}')
+    assert "anything else" not in "".join(backend.read[0])
+    assert backend.closed == 1
+
+
+def test_truncated_stream_returns_the_partial_object_uncached(streaming):
+    truncated = '{"names": ["A", "B", "C'
+    backend = StreamBackend(truncated, truncated)
+    client.set_backend(backend)
+    before = metrics.llm_truncated._values.get(("test",), 0)
+
+    assert stream_complete() == '{"names": ["A", "B"]}'
+    assert stream_complete() == '{"names": ["A", "B"]}'
+    assert backend.calls == 2
+    assert metrics.llm_truncated._values.get(("test",), 0) == before + 2
+
+
+def test_failure_mid_stream_keeps_what_arrived(streaming):
+    backend = StreamBackend('{"names": ["Alpha", "Beta", "Gamma"]}', fail_after=28)
+    client.set_backend(backend)
+
+    assert stream_complete() == '{"names": ["Alpha", "Beta"]}'
+    assert backend.calls == 1
+
+
+def test_failure_before_any_output_is_retried(monkeypatch, streaming):
+    import requests
+
+    sleeps(monkeypatch)
+
+    class FlakyBackend(StreamBackend):
+        def stream(self, messages, **params):
+            if self.calls == 0:
+                self.calls += 1
+                raise requests.ConnectionError("refused")
+            yield from super().stream(messages, **params)
+
+    backend = FlakyBackend('{"names": ["A"]}')
+    client.set_backend(backend)
+
+    assert stream_complete() == '{"names": ["A"]}'
+    assert backend.calls == 2
+
+
+def test_streaming_off_uses_chat(monkeypatch, cache):
+    monkeypatch.setattr(client, "LLM_STREAMING", False)
+    backend = StreamBackend()
+    backend.chat = lambda messages, **params: '{"names": ["A"]}'
+    client.set_backend(backend)
+
+    assert stream_complete() == '{"names": ["A"]}'
+    assert backend.read == []
@@ -0,0 +1,78 @@
+import pytest
+
+from NLP_PARSER.confidence import (
+    _count_agreement,
+    _coverage,
+    _filled,
+    _score,
+    score_achievements,
+    score_projects,
+    score_skills
+)
+
+
+def test_missing_header_scores_none():
+    assert _score(False, 1.0, 1.0) is None
+    assert score_skills("", []) is None
+    assert score_achievements("", ["Won a prize"]) is None
+
+
+@pytest.mark.parametrize("filled, coverage, structure, expected", [
+    (0.0, 0.0, 0.0, 0.3),
+    (1.0, 1.0, 1.0, 1.0),
+    (1.0, 0.5, 1.0, 0.85),
+    (0.5, 1.0, 0.0, 0.7),
+])
+def test_score_weights(filled, coverage, structure, expected):
+    assert _score(True, filled, coverage, structure) == expected
+
+
+def test_coverage_is_share_of_section_tokens_extracted():
+    assert _coverage("python sql docker kubernetes", ["Python", "SQL"]) == 0.5
+    assert _coverage("", ["Python"]) == 0.0
+
+
+def test_filled_counts_non_empty_fields():
+    entries = [{"name": "A", "description": ""}, {"name": "B", "description": "x"}]
+
+    assert _filled(entries, ["name", "description"]) == 0.75
+    assert _filled([], ["name"]) == 0.0
+
+
+@pytest.mark.parametrize("found, expected, agreement", [
+    (0, 0, 1.0),
+    (3, 3, 1.0),
+    (1, 3, 1 / 3),
+    (4, 2, 0.5),
+])
+def test_count_agreement(found, expected, agreement):
+    assert _count_agreement(found, expected) == agreement
+
+
+def test_fully_consumed_skills_section_scores_one():
+    assert score_skills("Python, SQL", ["Python", "SQL"]) == 1.0
+
+
+def test_unplaced_skill_lines_lower_the_score():
+    full = score_skills("Python, SQL", ["Python", "SQL"])
+    partial = score_skills("Python, SQL, Fortran, COBOL, Haskell, Erlang", ["Python", "SQL"])
+
+    assert partial < full
+
+
+def test_merged_projects_score_below_separate_ones():
+    section = "\n".join([
+        "Expense Tracker App",
+        "- Budgeting tool",
+        "Movie Recommendation Engine",
+        "- Ranking model",
+    ])
+    separate = [
+        {"name": "Expense Tracker App", "description": "Budgeting tool"},
+        {"name": "Movie Recommendation Engine", "description": "Ranking model"},
+    ]
+    merged = [
+        {"name": "Expense Tracker App", "description": "Budgeting tool Movie Recommendation Engine Ranking model"},
+    ]
+
+    assert score_projects(section, merged) < score_projects(section, separate)
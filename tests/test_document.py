@@ -0,0 +1,98 @@
+import pytest
+
+from NLP_PARSER.document import Line, ResumeDocument, map_offsets, split_lines
+from NLP_PARSER.main import parse_resume_nlp
+from NLP_PARSER.section_detector import detect_sections
+
+TEXT = "\n".join([
+    "Jane Doe",
+    "  SKILLS  ",
+    "Python, Go",
+    "",
+    "PROJECTS",
+    "Expense Tracker",
+    "- Budgeting app built with React",
+    "  and Node.js",
+    "EXPERIENCE",
+    "Software Engineer at Acme Corp",
+])
+
+
+def test_split_lines_keeps_spans_into_the_text():
+    lines = split_lines(TEXT, offset=0)
+
+    assert [line.text for line in lines][:3] == ["Jane Doe", "SKILLS", "Python, Go"]
+    assert all(TEXT[line.start:line.end] == line.text for line in lines)
+    assert split_lines("  a\n\n b ", offset=10) == [Line("a", 12, 13), Line("b", 16, 17)]
+
+
+def test_line_strip_moves_the_span():
+    line = Line("- item -", 5, 13)
+
+    assert line.lstrip("- ") == Line("item -", 7, 13)
+    assert line.rstrip("- ") == Line("- item", 5, 11)
+    assert line.strip("- ").span == [7, 11]
+    assert line.prefix(3) == Line("- i", 5, 8)
+    assert line.prefix(50) == line
+
+
+@pytest.fixture
+def document():
+    return ResumeDocument(TEXT)
+
+
+def test_sections_match_detect_sections():
+    # Equal for cleaned text, whose lines are already stripped; a slice
+    # of raw text keeps the indentation inside a section.
+    stripped = "\n".join(line.strip() for line in TEXT.split("\n"))
+
+    assert ResumeDocument(stripped).section_texts() == detect_sections(stripped)
+
+
+def test_section_text_is_one_slice_of_the_text(document):
+    start, end = document.section_span("projects")
+
+    assert TEXT[start:end] == document.section_text("projects")
+    assert document.section_text("projects").startswith("Expense Tracker")
+    assert document.section_text("projects").endswith("and Node.js")
+
+
+def test_missing_section(document):
+    assert document.section_span("education") is None
+    assert document.section_text("education") == ""
+    assert document.lines("education") == []
+
+
+def test_section_lines_exclude_the_header(document):
+    assert [line.text for line in document.lines("skills")] == ["Python, Go"]
+    assert len(document) == len(document.lines()) == 9
+
+
+def test_text_at_joins_spans_with_spaces(document):
+    lines = document.lines("projects")
+
+    assert document.text_at([lines[1].span, lines[2].span]) == "- Budgeting app built with React and Node.js"
+
+
+def test_map_offsets_crosses_line_joins():
+    text = "ab\ncd"
+    spans = [[0, 2], [3, 5]]
+
+    # Joined text is "ab cd"; "b c" spans both lines but not the join.
+    assert map_offsets(spans, 1, 4) == [[1, 2], [3, 4]]
+    assert map_offsets(spans, 3, 5) == [[3, 5]]
+    assert map_offsets(spans, 2, 3) == []
+    assert [text[s:e] for s, e in map_offsets(spans, 0, 5)] == ["ab", "cd"]
+
+
+def test_provenance_points_back_at_each_field():
+    nlp = parse_resume_nlp(TEXT)
+    document = nlp["document"]
+
+    for skill, spans in nlp["provenance"]["skills"].items():
+        assert all(TEXT[start:end].lower() == skill.lower() for start, end in spans)
+
+    project = nlp["projects"][0]
+    project_spans = nlp["provenance"]["projects"][0]
+    assert document.text_at(project_spans["name"]) == project["name"]
+    assert document.text_at(project_spans["description"]) == project["description"]
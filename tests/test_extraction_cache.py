@@ -0,0 +1,114 @@
+import io
+import hashlib
+import os
+
+import pytest
+
+from extractor import cache as cache_module
+from extractor.cache import ExtractionCache, copy_and_hash, extract_cached
+
+
+@pytest.mark.parametrize("size", [0, 1, cache_module.CHUNK_SIZE, 3 * cache_module.CHUNK_SIZE + 7])
+def test_copy_and_hash_copies_every_byte(size):
+    data = os.urandom(size)
+    out = io.BytesIO()
+
+    digest = copy_and_hash(io.BytesIO(data), out, chunk_size=cache_module.CHUNK_SIZE)
+
+    assert out.getvalue() == data
+    assert digest == hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(str(tmp_path / "extraction"), max_bytes=10 ** 9)
+
+
+def test_put_and_get_round_trip(cache):
+    cache.put("k", {"cleaned_text": "Jane"})
+
+    assert cache.get("k")["cleaned_text"] == "Jane"
+    assert cache.get("other") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_version_bump_misses_old_entries(monkeypatch, cache):
+    cache.put("k", {"cleaned_text": "old"})
+    monkeypatch.setattr(cache_module, "EXTRACTION_CACHE_VERSION", "next")
+
+    assert cache.get("k") is None
+
+
+def test_corrupt_entry_is_a_miss(cache):
+    with open(cache._path("k"), "w") as f:
+        f.write("{not json")
+
+    assert cache.get("k") is None
+
+
+def set_mtime(cache, key: str, mtime: float) -> None:
+    os.utime(cache._path(key), (mtime, mtime))
+
+
+def test_evict_drops_least_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=10 ** 9)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, {"cleaned_text": "x" * 100})
+        set_mtime(cache, key, 1000 + i)
+    cache.get("a")
+    # One file over the limit: only the least recently used one goes.
+    cache.max_bytes = sum(os.path.getsize(cache._path(key)) for key in "abc") - 1
+
+    cache.evict()
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_eviction_runs_every_n_writes(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache_module, "_EVICT_EVERY", 3)
+    cache = ExtractionCache(str(tmp_path), max_bytes=1)
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: scans.append(1) or evict())
+
+    for i in range(7):
+        cache.put(str(i), {"cleaned_text": "x"})
+
+    assert len(scans) == 2
+    # The last eviction emptied the over-full directory; one write since.
+    assert os.listdir(tmp_path) == [os.path.basename(cache._path("6"))]
+
+
+def test_errors_are_not_cached(monkeypatch, tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=10 ** 9)
+    monkeypatch.setattr(cache_module, "extraction_cache", cache)
+    monkeypatch.setattr(cache_module, "EXTRACTION_CACHE_ENABLED", True)
+    documents = iter([
+        {"text": "", "engine": "tesseract", "pages": 1, "error": "OCR failed"},
+        {"text": "Jane Doe", "engine": "tesseract", "pages": 1},
+    ])
+    monkeypatch.setattr(cache_module, "extract_resume_document", lambda *args: next(documents))
+
+    assert extract_cached(b"img", "d", filename="a.png")["error"] == "OCR failed"
+    assert extract_cached(b"img", "d", filename="a.png")["cleaned_text"] == "Jane Doe"
+    assert extract_cached(b"img", "d", filename="a.png")["cleaned_text"] == "Jane Doe"
+
+
+def test_key_includes_the_pdf_tier(monkeypatch, tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=10 ** 9)
+    monkeypatch.setattr(cache_module, "extraction_cache", cache)
+    monkeypatch.setattr(cache_module, "EXTRACTION_CACHE_ENABLED", True)
+    calls = []
+
+    def extract(source, filename, pdf_tier):
+        calls.append(pdf_tier)
+        return {"text": pdf_tier, "engine": pdf_tier, "pages": 1}
+    monkeypatch.setattr(cache_module, "extract_resume_document", extract)
+
+    for tier in ("fast", "pdfminer", "fast"):
+        extract_cached(b"pdf", "d", filename="a.pdf", pdf_tier=tier)
+
+    assert calls == ["fast", "pdfminer"]
@@ -0,0 +1,127 @@
+import hashlib
+import io
+import json
+import os
+
+import pytest
+
+from extractor.extractor import extract_resume_document, extract_resume_text
+
+RESUME_LINES = [
+    "SKILLS",
+    "Python, Go, Docker",
+    "EXPERIENCE",
+    "Software Engineer at Acme Corp",
+    "Built payment APIs",
+]
+
+
+def make_pdf(pages: list) -> bytes:
+    """
+    Minimal PDF with one Helvetica text line per entry of each page.
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        ops = ["BT", "/F1 11 Tf", "14 TL", "50 780 Td"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({escaped}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops)
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content = len(objects)
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+@pytest.fixture
+def pdf_bytes():
+    return make_pdf([RESUME_LINES])
+
+
+def test_path_bytes_and_stream_extract_the_same_text(tmp_path, pdf_bytes):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(pdf_bytes)
+    stream = io.BytesIO(pdf_bytes)
+    stream.seek(0, io.SEEK_END)
+
+    texts = [
+        extract_resume_text(str(path)),
+        extract_resume_text(pdf_bytes, filename="resume.pdf"),
+        extract_resume_text(stream, filename="resume.pdf"),
+    ]
+
+    assert texts[0] == texts[1] == texts[2]
+    assert "Software Engineer at Acme Corp" in texts[0]
+
+
+def test_format_comes_from_the_stream_name(tmp_path, pdf_bytes):
+    path = tmp_path / "resume.PDF"
+    path.write_bytes(pdf_bytes)
+
+    with open(path, "rb") as f:
+        document = extract_resume_document(f)
+
+    assert document["pages"] == 1
+
+
+def test_bytes_without_a_filename_are_rejected(pdf_bytes):
+    with pytest.raises(ValueError):
+        extract_resume_document(pdf_bytes)
+
+
+def test_unsupported_format_is_rejected():
+    with pytest.raises(ValueError):
+        extract_resume_document(b"text", filename="resume.docx")
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    import app as app_module
+
+    monkeypatch.setattr(app_module, "UPLOAD_FOLDER", str(tmp_path / "uploads"))
+    os.makedirs(app_module.UPLOAD_FOLDER)
+    return app_module, app_module.app.test_client()
+
+
+def parse(client, data: bytes):
+    return client.post(
+        "/resume_parser?mode=fast",
+        data={"resume": (io.BytesIO(data), "resume.pdf")}
+    )
+
+
+def test_upload_is_parsed_without_touching_disk(client, pdf_bytes):
+    app_module, http = client
+
+    response = parse(http, pdf_bytes)
+
+    assert response.status_code == 200
+    assert "Python" in json.loads(response.data)["skills"]
+    assert os.listdir(app_module.UPLOAD_FOLDER) == []
+
+
+def test_archived_upload_is_named_by_content_hash(monkeypatch, client, pdf_bytes):
+    app_module, http = client
+    monkeypatch.setattr(app_module, "ARCHIVE_UPLOADS", True)
+
+    assert parse(http, pdf_bytes).status_code == 200
+    assert parse(http, pdf_bytes).status_code == 200
+
+    assert os.listdir(app_module.UPLOAD_FOLDER) == [hashlib.sha256(pdf_bytes).hexdigest() + ".pdf"]
@@ -0,0 +1,151 @@
+import random
+
+import pytest
+
+from NLP_PARSER import grounding
+from NLP_PARSER.grounding import (
+    GroundingIndex,
+    SuffixAutomaton,
+    grounding_decision,
+    score_projects,
+    score_resume
+)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_automaton_finds_what_str_find_finds(seed):
+    rng = random.Random(seed)
+    text = "".join(rng.choice("abc") for _ in range(60))
+    automaton = SuffixAutomaton(text)
+
+    for _ in range(300):
+        length = rng.randint(1, 8)
+        query = "".join(rng.choice("abcd") for _ in range(length))
+        expected = text.find(query)
+        assert automaton.find(query) == (expected if expected >= 0 else None)
+
+
+def test_automaton_walk_stops_at_the_longest_match():
+    automaton = SuffixAutomaton("resume parser")
+
+    assert automaton.walk("parsing")[0] == 4
+    assert automaton.walk("xparse", 1)[0] == 5
+
+
+def test_index_find_ignores_case_whitespace_and_dashes():
+    text = "Built   a Budgeting\n App — React"
+    index = GroundingIndex(text)
+
+    start, end = index.find("budgeting app - react")
+
+    assert text[start:end] == "Budgeting\n App — React"
+    assert index.find("budgeting tool") is None
+    assert index.find("") is None
+
+
+def test_runs_keep_long_verbatim_stretches():
+    index = GroundingIndex("designed a payment reconciliation service")
+
+    query = "built a payment reconciliation service in go"
+
+    ((query_start, text_start, length),) = index.runs(query)
+
+    assert query[query_start:query_start + length] == " a payment reconciliation service"
+    assert index.normalized[text_start:text_start + length] == " a payment reconciliation service"
+
+
+def test_mentions_resolve_aliases_on_token_boundaries():
+    index = GroundingIndex("Used postgres and C++ with k8s")
+
+    assert index.mentions("PostgreSQL")
+    assert index.mentions("Kubernetes")
+    assert index.mentions("C++")
+    assert not index.mentions("C")
+    assert not index.mentions("Docker")
+
+
+def test_unknown_items_must_appear_verbatim():
+    index = GroundingIndex("Deployed with Acme Deployer")
+
+    assert index.mentions("acme deployer")
+    assert not index.mentions("Acme Shipper")
+
+
+SECTION = "\n".join([
+    "Expense Tracker",
+    "- Budgeting app built with React and Node.js",
+    "Movie Recommender",
+    "- Collaborative filtering model in Python",
+])
+
+VERBATIM = [
+    {"name": "Expense Tracker", "description": "Budgeting app built with React and Node.js",
+     "techstack": ["React", "Node.js"]},
+    {"name": "Movie Recommender", "description": "Collaborative filtering model in Python",
+     "techstack": ["Python"]},
+]
+
+HALLUCINATED = [
+    {"name": "Expense Tracker", "description": "Cloud-native fintech platform serving millions",
+     "techstack": ["Kubernetes", "Go"]},
+]
+
+
+def test_verbatim_projects_outscore_invented_ones():
+    grounded = score_projects(SECTION, VERBATIM)
+    invented = score_projects(SECTION, HALLUCINATED)
+
+    assert grounded["grounded"] == 1.0
+    assert grounded["structure"] == 1.0
+    assert grounded["coverage"] > 0.9
+    assert invented["grounded"] < 0.5
+    assert "kubernetes" in invented["ungrounded"]
+    assert grounded["score"] - invented["score"] >= grounding.GROUNDING_MARGIN
+
+
+def test_malformed_projects_lose_structure():
+    assert score_projects(SECTION, "not a list")["structure"] == 0.0
+    assert score_projects(SECTION, [{"title": "Expense Tracker"}])["structure"] == 0.0
+
+
+def test_resume_report_checks_every_section():
+    text = "SKILLS\nPython\nEXPERIENCE\nEngineer at Acme\nACHIEVEMENTS\nWon a hackathon"
+    resume = {
+        "skills": ["Python"],
+        "experience": [{"role": "Engineer", "company": "Acme", "duration": ""}],
+        "projects": [],
+        "achievements": ["Won a hackathon"]
+    }
+
+    report = score_resume(text, resume)
+
+    assert report["grounded"] == 1.0
+    assert report["structure"] == 1.0
+    assert score_resume(text, "garbage")["structure"] == 0.0
+
+
+def report(score: float) -> dict:
+    return {"score": score}
+
+
+@pytest.mark.parametrize("nlp, llm, approach", [
+    (0.9, 0.5, "nlp_heuristic"),
+    (0.5, 0.9, "llm_extraction"),
+    (0.95, 0.96, "llm_extraction"),
+    (0.95, 0.95, "nlp_heuristic"),
+    (0.7, 0.75, None),
+])
+def test_decision(nlp, llm, approach):
+    decision = grounding_decision("projects", report(nlp), report(llm))
+
+    if approach is None:
+        assert decision is None
+    else:
+        assert decision["selected_approach"] == approach
+        assert f"nlp {nlp:.2f}" in decision["reason"]
+
+
+def test_disabled_grounding_defers_to_the_examiner(monkeypatch):
+    monkeypatch.setattr(grounding, "GROUNDING_ENABLED", False)
+
+    assert grounding_decision("projects", report(1.0), report(0.0)) is None
@@ -0,0 +1,130 @@
+import time
+
+import pytest
+
+import jobs
+from jobs import JobQueue, validate_callback_url
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"))
+
+
+def test_claim_takes_the_oldest_queued_job(queue):
+    first = queue.submit("a.pdf", b"a")
+    queue.submit("b.pdf", b"b")
+
+    job = queue.claim()
+
+    assert job["id"] == first
+    assert job["payload"] == b"a"
+    assert queue.get(first)["status"] == "running"
+    assert queue.get(first)["attempts"] == 1
+
+
+def test_claimed_job_is_not_claimed_twice(queue):
+    queue.submit("a.pdf", b"a")
+
+    assert queue.claim() is not None
+    assert queue.claim() is None
+
+
+def test_expired_lease_is_claimed_again(monkeypatch, queue):
+    job_id = queue.submit("a.pdf", b"a")
+    monkeypatch.setattr(jobs, "JOB_LEASE_SECONDS", -1)
+    queue.claim()
+
+    job = queue.claim()
+
+    assert job["id"] == job_id
+    assert queue.get(job_id)["attempts"] == 2
+
+
+def test_live_lease_is_not_reclaimed(monkeypatch, queue):
+    monkeypatch.setattr(jobs, "JOB_LEASE_SECONDS", 60)
+    queue.submit("a.pdf", b"a")
+    queue.claim()
+
+    assert queue.claim() is None
+
+
+def test_job_fails_after_max_attempts(monkeypatch, queue):
+    monkeypatch.setattr(jobs, "JOB_LEASE_SECONDS", -1)
+    monkeypatch.setattr(jobs, "JOB_MAX_ATTEMPTS", 2)
+    stuck = queue.submit("stuck.pdf", b"a")
+    time.sleep(0.01)
+    waiting = queue.submit("next.pdf", b"b")
+
+    assert queue.claim()["id"] == stuck
+    assert queue.claim()["id"] == stuck
+    # The third claim gives up on the stuck job and moves on.
+    assert queue.claim()["id"] == waiting
+
+    job = queue.get(stuck)
+    assert job["status"] == "failed"
+    assert job["error"] == "Worker lease expired too many times."
+
+
+def test_finished_jobs_drop_the_payload(queue):
+    done = queue.submit("a.pdf", b"a")
+    failed = queue.submit("b.pdf", b"b")
+    queue.complete(done, {"skills": ["Go"]})
+    queue.fail(failed, "boom")
+
+    assert queue.get(done)["result"] == {"skills": ["Go"]}
+    assert queue.get(failed)["error"] == "boom"
+    assert queue.claim() is None
+    rows = queue._connect().execute("SELECT payload FROM jobs").fetchall()
+    assert [row["payload"] for row in rows] == [None, None]
+
+
+def test_unknown_job_is_none(queue):
+    assert queue.get("missing") is None
+
+
+@pytest.fixture
+def callback_hosts(monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_CALLBACK_HOSTS", ["hooks.example.org", ".example.com"])
+
+
+@pytest.mark.parametrize("url", [
+    "https://hooks.example.org/done",
+    "http://HOOKS.example.org:8080/done",
+    "https://api.example.com/cb",
+    "https://a.b.example.com/cb",
+])
+def test_allowed_callback_urls(callback_hosts, url):
+    assert validate_callback_url(url) == url
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/cb",
+    "https://evilexample.com/cb",
+    "https://hooks.example.org.evil.net/cb",
+    "https://evil.net/?hooks.example.org",
+    "https://hooks.example.org@evil.net/cb",
+    "http://127.0.0.1/admin",
+    "http://169.254.169.254/latest/meta-data",
+    "ftp://hooks.example.org/done",
+    "file:///etc/passwd",
+    "hooks.example.org/done",
+    "",
+    None,
+])
+def test_rejected_callback_urls(callback_hosts, url):
+    with pytest.raises(ValueError):
+        validate_callback_url(url)
+
+
+def test_empty_allowlist_disables_callbacks(monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_CALLBACK_HOSTS", [])
+
+    with pytest.raises(ValueError):
+        validate_callback_url("https://hooks.example.org/done")
+
+
+def test_submit_rejects_disallowed_callback(callback_hosts, queue):
+    with pytest.raises(ValueError):
+        queue.submit("a.pdf", b"a", callback_url="http://127.0.0.1/admin")
+    assert queue.claim() is None
@@ -0,0 +1,179 @@
+import pytest
+
+from LLM_PARSER.json_recovery import recover_json
+from LLM_PARSER.json_stream import JSONObjectScanner
+
+
+NAMES = {"names": list}
+PROJECTS = {"projects": list}
+
+
+def feed_by_char(text: str) -> JSONObjectScanner:
+    scanner = JSONObjectScanner()
+    for ch in text:
+        if scanner.feed(ch):
+            break
+    return scanner
+
+
+# recover_json
+
+def test_braces_inside_strings():
+    text = '{"names": ["a {b}", "c}", "{{"], "note": "}"}'
+
+    assert recover_json(text, NAMES)["names"] == ["a {b}", "c}", "{{"]
+
+
+def test_escaped_quotes_inside_strings():
+    text = r'{"names": ["say \"}\" twice"]}'
+
+    assert recover_json(text, NAMES)["names"] == ['say "}" twice']
+
+
+def test_single_quoted_dict():
+    assert recover_json("{'names': ['a', 'b']}", NAMES) == {"names": ["a", "b"]}
+
+
+def test_trailing_commas():
+    text = '{"names": ["a", "b",], "extra": {"x": 1,},}'
+
+    assert recover_json(text, NAMES) == {"names": ["a", "b"], "extra": {"x": 1}}
+
+
+def test_trailing_comma_inside_string_is_kept():
+    text = '{"names": ["a,]", "b",]}'
+
+    assert recover_json(text, NAMES)["names"] == ["a,]", "b"]
+
+
+@pytest.mark.parametrize("text", [
+    '```json\n{"names": ["a"]}\n```',
+    '```\n{"names": ["a"]}\n```',
+    'Here is the JSON:\n```json\n{"names": ["a"]}\n```\nHope this helps.',
+])
+def test_code_fences(text):
+    assert recover_json(text, NAMES) == {"names": ["a"]}
+
+
+def test_first_object_matching_schema_wins():
+    text = 'Example: {"x": 1}\nAnswer: {"names": ["z"]} and {"names": ["later"]}'
+
+    assert recover_json(text, NAMES) == {"names": ["z"]}
+
+
+def test_first_object_used_when_none_matches():
+    data = recover_json('{"x": 1} {"y": 2}', NAMES)
+
+    assert data == {"x": 1, "names": []}
+
+
+def test_truncated_array_keeps_complete_values():
+    assert recover_json('{"names": ["a", "b", "c', NAMES) == {"names": ["a", "b"]}
+
+
+def test_truncated_object_drops_partial_entry():
+    text = (
+        '{"projects": [{"name": "A", "description": "x"}, '
+        '{"name": "B", "descr'
+    )
+
+    assert recover_json(text, PROJECTS) == {"projects": [{"name": "A", "description": "x"}]}
+
+
+def test_truncated_before_any_value():
+    assert recover_json('{"names": [', NAMES) == {"names": []}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"names": ["a", "b"}', {"names": ["a", "b"]}),
+    ('{"names": ["a"]]}', {"names": ["a"]}),
+    ('{"meta": {"k": [1, 2}, "names": ["x"]}', {"meta": {"k": [1, 2]}, "names": ["x"]}),
+])
+def test_mismatched_closers(text, expected):
+    assert recover_json(text, NAMES) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "   ", "garbage", "}}}{{{", '{"names": nope}', "[1, 2]"])
+def test_empty_or_garbage_input(text):
+    assert recover_json(text, NAMES) == {"names": []}
+
+
+def test_no_schema_returns_empty_dict_for_garbage():
+    assert recover_json("no json here") == {}
+
+
+def test_wrong_types_are_conformed():
+    assert recover_json('{"names": "a"}', NAMES) == {"names": []}
+
+
+def test_dict_input_is_conformed():
+    assert recover_json({"other": 1}, NAMES) == {"other": 1, "names": []}
+
+
+# JSONObjectScanner
+
+def test_scanner_stops_when_object_closes():
+    scanner = JSONObjectScanner()
+    chunks = ['prose {"names": ', '["a"]', '} trailing ', '{"names": ["b"]}']
+
+    done = [scanner.feed(chunk) for chunk in chunks[:3]]
+
+    assert done == [False, False, True]
+    assert scanner.result() == '{"names": ["a"]}'
+    assert scanner.text[scanner.start:scanner.end] == scanner.result()
+
+
+def test_scanner_char_by_char_ignores_braces_in_strings():
+    scanner = feed_by_char('{"names": ["}", "{"]} rest')
+
+    assert scanner.complete
+    assert scanner.result() == '{"names": ["}", "{"]}'
+
+
+def test_scanner_keeps_invalid_object_as_candidate():
+    scanner = feed_by_char("{'names': ['a']} then nothing")
+
+    assert not scanner.complete
+    assert scanner.candidate == "{'names': ['a']}"
+
+
+def test_scanner_skips_invalid_object_for_later_valid_one():
+    scanner = feed_by_char("{'x': 1} {\"names\": [\"a\"]}")
+
+    assert scanner.complete
+    assert scanner.result() == '{"names": ["a"]}'
+    assert scanner.candidate == "{'x': 1}"
+
+
+def test_scanner_partial_closes_open_brackets():
+    scanner = feed_by_char('{"names": ["a", "b", "c')
+
+    assert scanner.partial() == '{"names": ["a", "b"]}'
+
+
+def test_scanner_partial_is_none_before_any_value():
+    scanner = feed_by_char('{"names": ["unfinished')
+
+    assert scanner.partial() is None
+    assert scanner.result() == '{"names": ["unfinished'
+
+
+def test_scanner_ignores_stray_closer_before_object():
+    scanner = feed_by_char('] } {"names": []}')
+
+    assert scanner.result() == '{"names": []}'
+
+
+def test_required_keys_are_not_filled():
+    schema = {"selected_approach": str, "reason": str}
+
+    data = recover_json('{"selected_approach": "x"}', schema, required=("reason",))
+
+    assert data == {"selected_approach": "x"}
+
+
+def test_required_keys_still_pick_the_object():
+    schema = {"reason": str}
+    text = '{"x": 1} {"reason": "found"}'
+
+    assert recover_json(text, schema, required=("reason",)) == {"reason": "found"}
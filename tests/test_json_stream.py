@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from LLM_PARSER.json_stream import JSONObjectScanner
+
+
+def feed_chars(text: str) -> JSONObjectScanner:
+    scanner = JSONObjectScanner()
+    for ch in text:
+        if scanner.feed(ch):
+            break
+    return scanner
+
+
+def test_object_closes_without_reading_past_it():
+    text = 'Sure! ```json\n{"names": ["A {b}", "C \\"}\\""]}\n``` and more {"x": 1}'
+
+    scanner = feed_chars(text)
+
+    assert scanner.complete
+    assert json.loads(scanner.result()) == {"names": ["A {b}", 'C "}"']}
+    assert scanner.text.endswith("]}")
+
+
+def test_chunks_split_anywhere():
+    text = '{"a": {"b": [1, 2]}, "c": "}"}'
+    for cut in range(len(text)):
+        scanner = JSONObjectScanner()
+        scanner.feed(text[:cut])
+        assert scanner.feed(text[cut:])
+        assert scanner.result() == text
+
+
+def test_invalid_object_is_skipped_for_a_valid_one():
+    scanner = feed_chars("{'a': 1} then {\"a\": 2}")
+
+    assert scanner.complete
+    assert scanner.result() == '{"a": 2}'
+    assert scanner.candidate == "{'a': 1}"
+
+
+def test_invalid_object_is_the_fallback():
+    scanner = feed_chars("{'a': 1} and nothing else")
+
+    assert not scanner.complete
+    assert scanner.result() == "{'a': 1}"
+
+
+@pytest.mark.parametrize("text, repaired", [
+    ('{"names": ["A", "B", "C', '{"names": ["A", "B"]}'),
+    ('{"projects": [{"name": "A"}, {"name": "B", "descr', '{"projects": [{"name": "A"}]}'),
+    ('{"reason": "cut mid', None),
+    ('no json at all', None),
+])
+def test_truncated_stream_is_cut_back_to_the_last_complete_value(text, repaired):
+    scanner = feed_chars(text)
+
+    assert not scanner.complete
+    assert scanner.partial() == repaired
+    assert scanner.result() == (repaired if repaired else text)
+
+
+def test_feed_after_completion_is_a_no_op():
+    scanner = JSONObjectScanner()
+    assert scanner.feed('{"a": 1}')
+
+    assert scanner.feed('{"b": 2}')
+    assert scanner.result() == '{"a": 1}'
@@ -0,0 +1,43 @@
+import pytest
+
+from NLP_PARSER.keyword_matcher import KeywordMatcher
+
+
+@pytest.fixture
+def matcher():
+    return KeywordMatcher({"c": "C", "c++": "C++", "java": "Java", "javascript": "JavaScript",
+                           "node.js": "Node", "machine learning": "ML", "learning": "L"})
+
+
+def found(matcher, text):
+    return [(m.keyword, m.payload, m.start, m.end) for m in matcher.find_all(text)]
+
+
+def test_overlapping_keywords_are_all_reported(matcher):
+    assert found(matcher, "Machine Learning") == [
+        ("machine learning", "ML", 0, 16),
+        ("learning", "L", 8, 16),
+    ]
+
+
+def test_matches_respect_token_boundaries(matcher):
+    assert found(matcher, "C++ and JavaScript") == [
+        ("c++", "C++", 0, 3),
+        ("javascript", "JavaScript", 8, 18),
+    ]
+    assert found(matcher, "cat, javas, ABC") == []
+
+
+def test_punctuation_ends_a_token(matcher):
+    assert found(matcher, "Used Node.js.") == [("node.js", "Node", 5, 12)]
+    assert found(matcher, "(C)") == [("c", "C", 1, 2)]
+
+
+def test_scan_recovers_after_a_partial_match(matcher):
+    assert found(matcher, "javac, java") == [("java", "Java", 7, 11)]
+    assert found(matcher, "machine learn learning") == [("learning", "L", 14, 22)]
+
+
+def test_empty_text_and_empty_matcher():
+    assert KeywordMatcher({}).find_all("anything") == []
+    assert KeywordMatcher({"go": 1}).find_all("") == []
@@ -0,0 +1,190 @@
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from LLM_PARSER import client
+from LLM_PARSER.schemas import ProjectNames, response_schema
+from loadtest.driver import Recorder, load_corpus, percentile, run_load
+from loadtest.stub_server import CANNED_RESPONSES, parse_latency, start_stub_server
+
+
+def test_fixed_latency():
+    assert parse_latency("fixed:2")(random.Random(0)) == 2.0
+
+
+def test_lognormal_latency_follows_the_log_parameters():
+    sample = parse_latency("lognormal:0:0.5")
+    rng = random.Random(0)
+    draws = sorted(sample(rng) for _ in range(2001))
+
+    assert all(draw > 0 for draw in draws)
+    # The median of a lognormal is exp(mu).
+    assert 0.9 < draws[1000] < 1.1
+
+
+def test_negative_draws_are_clamped():
+    assert parse_latency("normal:-5:0")(random.Random(0)) == 0.0
+
+
+@pytest.mark.parametrize("spec", ["fixed", "fixed:1:2", "lognormal:0", "gamma:1:1", "uniform:a:b", ""])
+def test_bad_latency_is_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_latency(spec)
+
+
+@pytest.mark.parametrize("pct, expected", [(50, 5), (95, 10), (99, 10), (10, 1)])
+def test_nearest_rank_percentile(pct, expected):
+    assert percentile(list(range(1, 11)), pct) == expected
+
+
+def test_percentile_of_nothing():
+    assert percentile([], 50) is None
+
+
+def test_report_counts_only_successes_in_latency():
+    recorder = Recorder()
+    for latency in (0.1, 0.2, 0.3):
+        recorder.record(latency, 200, engine="pymupdf")
+    recorder.record(9.0, 503)
+    recorder.record(9.0, error="ConnectionError")
+
+    report = recorder.report(elapsed=2.0)
+
+    assert report["requests"] == 5
+    assert report["ok"] == 3
+    assert report["error_rate"] == 0.4
+    assert report["throughput_rps"] == 1.5
+    assert report["latency_seconds"]["p50"] == 0.2
+    assert report["latency_seconds"]["max"] == 0.3
+    assert report["status_codes"] == {"200": 3, "503": 1}
+    assert report["client_errors"] == {"ConnectionError": 1}
+    assert report["extraction_engines"] == {"pymupdf": 3}
+
+
+def test_load_corpus_keeps_resume_files(tmp_path):
+    (tmp_path / "a.pdf").write_bytes(b"%PDF")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "b.png").write_bytes(b"png")
+    (tmp_path / "notes.txt").write_text("skip")
+
+    corpus = load_corpus([str(tmp_path)])
+
+    assert sorted((name, content_type) for name, _, content_type in corpus) == [
+        ("a.pdf", "application/pdf"),
+        ("b.png", "image/png"),
+    ]
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**config):
+        server, url = start_stub_server(**config)
+        servers.append(server)
+        return server, url
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+@pytest.fixture
+def backend_at(monkeypatch):
+    def use(url):
+        monkeypatch.setattr(client, "_backend", client.OpenAICompatibleBackend(base_url=url, model="stub"))
+    return use
+
+
+def names(stream_json: bool) -> str:
+    return client.chat_completion(
+        [{"role": "user", "content": "names?"}],
+        max_tokens=64,
+        temperature=0.0,
+        stream_json=stream_json,
+        response_model=ProjectNames,
+        stage="test"
+    )
+
+
+@pytest.mark.parametrize("stream_json", [False, True])
+def test_stub_replies_by_schema_name(stub, backend_at, stream_json):
+    server, url = stub()
+    backend_at(url)
+
+    assert json.loads(names(stream_json)) == CANNED_RESPONSES["ProjectNames"]
+    stats = server.RequestHandlerClass.config.snapshot()
+    assert stats["requests"] == 1
+    assert stats["streamed"] == (1 if stream_json else 0)
+    assert stats["by_schema"] == {"ProjectNames": 1}
+
+
+def test_stub_failures_carry_retry_after(stub):
+    _, url = stub(error_rate=1.0, error_status=429, retry_after=1.5)
+
+    response = requests.post(f"{url}/v1/chat/completions", json={"messages": []})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1.5"
+    assert requests.get(f"{url}/stats").json()["errors"] == 1
+
+
+def test_stub_echo_mode(stub):
+    _, url = stub(mode="echo")
+    name, schema = response_schema(ProjectNames)
+
+    response = requests.post(f"{url}/v1/chat/completions", json={
+        "messages": [{"role": "user", "content": "first"}, {"role": "user", "content": "last"}],
+        "response_format": {"type": "json_schema", "json_schema": {"name": name, "schema": schema}}
+    })
+
+    assert response.json()["choices"][0]["message"]["content"] == "last"
+
+
+class ParserHandler(BaseHTTPRequestHandler):
+    # Stands in for /resume_parser: every third request fails.
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    seen = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with self.lock:
+            type(self).seen += 1
+            status = 500 if self.seen % 3 == 0 else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.send_header("X-Extraction-Engine", "pymupdf")
+        self.end_headers()
+
+
+@pytest.fixture
+def parser_url():
+    handler = type("Handler", (ParserHandler,), {"seen": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/resume_parser"
+    server.shutdown()
+
+
+@pytest.mark.parametrize("rps", [None, 200])
+def test_run_load_sends_the_requested_number(parser_url, rps):
+    corpus = [("a.pdf", b"%PDF", "application/pdf")]
+
+    report = run_load(parser_url, corpus, concurrency=3, rps=rps, requests_total=9)
+
+    assert report["requests"] == 9
+    assert report["ok"] == 6
+    assert report["status_codes"] == {"200": 6, "500": 3}
+    assert report["extraction_engines"] == {"pymupdf": 6}
+
+
+def test_run_load_needs_a_stopping_condition(parser_url):
+    with pytest.raises(ValueError):
+        run_load(parser_url, [("a.pdf", b"%PDF", "application/pdf")])
@@ -0,0 +1,114 @@
+import pytest
+
+import app as app_module
+import metrics
+from LLM_PARSER.response_cache import ResponseCache
+from metrics import Counter, Histogram
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # Metrics made by a test render alone, not next to the real ones.
+    monkeypatch.setattr(metrics, "_registry", [])
+    return metrics._registry
+
+
+def test_counter_adds_per_label_values(registry):
+    counter = Counter("test_events_total", "Events.", ("kind",))
+
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    counter.inc(kind="b")
+
+    assert counter._values == {("a",): 3, ("b",): 1}
+
+
+def test_counter_render(registry):
+    counter = Counter("test_events_total", "Events.", ("kind",))
+    counter.inc(kind='say "hi"\n')
+
+    assert counter.render() == [
+        "# HELP test_events_total Events.",
+        "# TYPE test_events_total counter",
+        'test_events_total{kind="say \\"hi\\"\\n"} 1',
+    ]
+
+
+def test_unlabelled_counter_renders_without_braces(registry):
+    counter = Counter("test_events_total", "Events.")
+    counter.inc(0.5)
+
+    assert counter.render()[-1] == "test_events_total 0.5"
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = Histogram("test_seconds", "Time.", ("stage",), buckets=(1, 5))
+    for value in (0.5, 2, 3, 10):
+        histogram.observe(value, stage="s")
+
+    assert histogram.render()[2:] == [
+        'test_seconds_bucket{stage="s",le="1"} 1',
+        'test_seconds_bucket{stage="s",le="5"} 3',
+        'test_seconds_bucket{stage="s",le="+Inf"} 4',
+        'test_seconds_sum{stage="s"} 15.5',
+        'test_seconds_count{stage="s"} 4',
+    ]
+
+
+def test_disabled_metrics_record_nothing(registry, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+    counter = Counter("test_events_total", "Events.")
+    histogram = Histogram("test_seconds", "Time.")
+
+    counter.inc()
+    histogram.observe(1.0)
+
+    assert counter._values == {}
+    assert histogram._values == {}
+
+
+def test_render_includes_cache_gauges(registry):
+    Counter("test_events_total", "Events.").inc()
+
+    text = metrics.render({"extraction": {"hits": 2, "misses": 1}})
+
+    assert text.endswith("\n")
+    assert "test_events_total 1" in text
+    assert 'extraction_cache_events{event="hits"} 2' in text
+    assert 'extraction_cache_events{event="misses"} 1' in text
+
+
+def test_stage_times_are_collected_per_request():
+    token = metrics.start_request()
+    try:
+        metrics.record_stage("parse", 0.25)
+        metrics.record_stage("parse", 0.25)
+        metrics.record_extraction("pymupdf", 0.1)
+        timings = metrics.request_timings()
+    finally:
+        metrics.end_request(token)
+
+    assert timings == {"parse": 0.5, "extract_text": 0.1}
+    assert metrics.request_timings() == {}
+
+
+def test_server_timing_header():
+    header = metrics.server_timing_header({"extract_text": 0.0123, "pipeline": 1.5})
+
+    assert header == "extract_text;dur=12.3, pipeline;dur=1500.0"
+    assert metrics.server_timing_header({}) == ""
+
+
+def test_metrics_endpoint(monkeypatch, tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm.sqlite3"), ttl=3600, max_entries=10)
+    monkeypatch.setattr(app_module, "get_response_cache", lambda: cache)
+    cache.get("missing")
+
+    response = app_module.app.test_client().get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = response.get_data(as_text=True)
+    assert "# TYPE resume_stage_seconds histogram" in text
+    assert 'llm_response_cache_events{event="misses"} 1' in text
+    assert 'extraction_cache_events{event="hits"}' in text
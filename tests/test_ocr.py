@@ -0,0 +1,143 @@
+import io
+
+import pytest
+from PIL import Image, ImageDraw
+
+from extractor import ocr
+from extractor.ocr import normalize_image, ocr_image, ocr_pages, rasterize_pdf
+
+
+def png(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def blank_pdf(pages: int) -> bytes:
+    pdfium = pytest.importorskip("pypdfium2")
+    document = pdfium.PdfDocument.new()
+    for _ in range(pages):
+        document.new_page(144, 72)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def no_deskew(monkeypatch):
+    monkeypatch.setattr(ocr, "OCR_DESKEW", False)
+
+
+def test_normalize_converts_to_grayscale(no_deskew):
+    image = normalize_image(Image.new("RGB", (100, 50), "red"))
+
+    assert image.mode == "L"
+    assert image.size == (100, 50)
+
+
+def test_normalize_downscales_to_ocr_dpi(monkeypatch, no_deskew):
+    monkeypatch.setattr(ocr, "OCR_DPI", 300)
+    image = Image.new("L", (1200, 600), 255)
+    image.info["dpi"] = (600, 600)
+
+    assert normalize_image(image).size == (600, 300)
+
+
+def test_normalize_caps_images_without_dpi(monkeypatch, no_deskew):
+    monkeypatch.setattr(ocr, "OCR_MAX_DIMENSION", 500)
+
+    assert normalize_image(Image.new("L", (2000, 1000), 255)).size == (500, 250)
+    assert normalize_image(Image.new("L", (400, 200), 255)).size == (400, 200)
+
+
+def test_normalize_never_upscales_low_dpi(monkeypatch, no_deskew):
+    monkeypatch.setattr(ocr, "OCR_DPI", 300)
+    image = Image.new("L", (300, 150), 255)
+    image.info["dpi"] = (72, 72)
+
+    assert normalize_image(image).size == (300, 150)
+
+
+def text_rows(angle: float) -> Image.Image:
+    image = Image.new("L", (600, 400), 255)
+    draw = ImageDraw.Draw(image)
+    for y in range(40, 360, 30):
+        draw.rectangle((50, y, 550, y + 8), fill=0)
+    return image.rotate(angle, fillcolor=255)
+
+
+@pytest.mark.parametrize("angle", [0.0, 2.0, -3.0])
+def test_deskew_finds_the_rotation(angle):
+    pytest.importorskip("numpy")
+
+    assert ocr._deskew_angle(text_rows(angle)) == -angle
+
+
+def test_deskew_straightens_the_image(monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(ocr, "OCR_DESKEW", True)
+
+    assert normalize_image(text_rows(2.0)).size != (600, 400)
+    assert normalize_image(text_rows(0.0)).size == (600, 400)
+
+
+def test_rasterize_renders_pages_at_ocr_dpi(monkeypatch):
+    monkeypatch.setattr(ocr, "OCR_DPI", 144)
+
+    pages, total = rasterize_pdf(io.BytesIO(blank_pdf(2)))
+
+    assert total == 2
+    assert len(pages) == 2
+    image = Image.open(io.BytesIO(pages[0]))
+    assert image.format == "PNG"
+    assert image.size == (288, 144)
+
+
+def test_rasterize_stops_at_the_page_cap():
+    pages, total = rasterize_pdf(blank_pdf(3), max_pages=1)
+
+    assert (len(pages), total) == (1, 3)
+
+
+def test_rasterize_without_pdfium_raises(monkeypatch):
+    monkeypatch.setattr(ocr, "pdfium", None)
+
+    with pytest.raises(RuntimeError):
+        rasterize_pdf(io.BytesIO(b"%PDF"))
+
+
+@pytest.fixture
+def tesseract_times_out(monkeypatch, no_deskew):
+    def image_to_string(image, timeout=0):
+        raise RuntimeError("Tesseract process timeout")
+    monkeypatch.setattr(ocr.pytesseract, "image_to_string", image_to_string)
+
+
+def test_image_timeout_returns_empty_result_with_error(tesseract_times_out):
+    document = ocr_image(io.BytesIO(png(Image.new("L", (50, 50), 255))))
+
+    assert document["text"] == ""
+    assert document["pages"] == 1
+    assert document["error"] == "OCR failed: Tesseract process timeout"
+
+
+def test_single_page_timeout_returns_error(tesseract_times_out):
+    text, error = ocr_pages([png(Image.new("L", (50, 50), 255))], deadline=1)
+
+    assert text == ""
+    assert error == "OCR failed on page 1: Tesseract process timeout"
+
+
+def test_image_text_is_returned_without_error(monkeypatch, no_deskew):
+    monkeypatch.setattr(ocr.pytesseract, "image_to_string", lambda image, timeout=0: "Jane Doe")
+
+    document = ocr_image(io.BytesIO(png(Image.new("L", (50, 50), 255))))
+
+    assert (document["text"], document["error"]) == ("Jane Doe", None)
+
+
+def test_exhausted_deadline_reads_nothing():
+    assert ocr_pages([b"page"], deadline=0) == (
+        "", "OCR deadline exhausted before any page was processed"
+    )
+    assert ocr_pages([]) == ("", None)
@@ -0,0 +1,139 @@
+import pytest
+
+import pipeline
+from pipeline import AUTO_CONFIDENCE_THRESHOLD, run_pipeline
+
+
+HIGH = AUTO_CONFIDENCE_THRESHOLD + 0.05
+LOW = AUTO_CONFIDENCE_THRESHOLD - 0.2
+
+LLM_RESUME = {
+    "skills": ["llm skill"],
+    "experience": [{"company": "llm co", "role": "", "duration": "", "description": ""}],
+    "projects": [{"name": "llm project", "description": "", "techstack": []}],
+    "achievements": ["llm achievement"]
+}
+LLM_PROJECTS = [{"name": "llm extracted project", "description": "", "techstack": []}]
+
+
+def nlp_result(**confidence) -> dict:
+    scores = {"skills": HIGH, "experience": HIGH, "projects": HIGH, "achievements": HIGH}
+    scores.update(confidence)
+    return {
+        "sections": {"projects": "Projects\nNLP project"},
+        "skills": ["nlp skill"],
+        "experience": [{"company": "nlp co", "role": "", "duration": "", "description": ""}],
+        "projects": [{"name": "nlp project", "description": "", "techstack": []}],
+        "achievements": ["nlp achievement"],
+        "confidence": scores
+    }
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    """
+    Replace every LLM stage in the pipeline with a recorder; returns
+    the list of stage names called.
+    """
+    called = []
+
+    def stage(name, result):
+        def run(*args, **kwargs):
+            called.append(name)
+            return result
+        return run
+
+    monkeypatch.setattr(pipeline, "parse_resume_with_llm", stage("parse_resume_llm", LLM_RESUME))
+    monkeypatch.setattr(pipeline, "refine_projects_with_llm", stage("refine_projects", []))
+    monkeypatch.setattr(pipeline, "extract_projects_with_llm", stage("extract_projects", LLM_PROJECTS))
+    monkeypatch.setattr(pipeline, "examine_project_outputs", stage(
+        "examine_projects", {"selected_approach": "llm_extraction", "reason": "test"}
+    ))
+    monkeypatch.setattr(pipeline, "examine_resume_outputs", stage(
+        "examine_resume", {"selected_approach": "nlp_heuristic", "reason": "test"}
+    ))
+    return called
+
+
+def with_nlp(monkeypatch, nlp: dict) -> None:
+    monkeypatch.setattr(pipeline, "parse_resume_nlp", lambda text: nlp)
+
+
+def test_auto_keeps_high_confidence_sections_without_llm_calls(monkeypatch, stages):
+    with_nlp(monkeypatch, nlp_result())
+
+    resume = run_pipeline("text", mode="auto")
+
+    assert stages == []
+    assert resume["skills"] == ["nlp skill"]
+    assert resume["projects"][0]["name"] == "nlp project"
+
+
+def test_auto_takes_low_confidence_section_from_full_llm_parse(monkeypatch, stages):
+    with_nlp(monkeypatch, nlp_result(skills=LOW))
+
+    resume = run_pipeline("text", mode="auto")
+
+    assert stages == ["parse_resume_llm"]
+    assert resume["skills"] == ["llm skill"]
+    assert resume["experience"][0]["company"] == "nlp co"
+    assert resume["achievements"] == ["nlp achievement"]
+
+
+def test_auto_sends_low_confidence_projects_through_project_stages(monkeypatch, stages):
+    with_nlp(monkeypatch, nlp_result(projects=LOW))
+
+    resume = run_pipeline("text", mode="auto")
+
+    assert sorted(stages) == ["examine_projects", "extract_projects", "refine_projects"]
+    assert resume["projects"] == LLM_PROJECTS
+    assert resume["skills"] == ["nlp skill"]
+
+
+def test_auto_keeps_nlp_section_when_llm_parse_has_nothing_for_it(monkeypatch, stages):
+    with_nlp(monkeypatch, nlp_result(achievements=LOW))
+    monkeypatch.setattr(pipeline, "parse_resume_with_llm", lambda text: dict(LLM_RESUME, achievements=[]))
+
+    resume = run_pipeline("text", mode="auto")
+
+    assert resume["achievements"] == ["nlp achievement"]
+
+
+def test_auto_does_not_escalate_missing_section(monkeypatch, stages):
+    with_nlp(monkeypatch, nlp_result(achievements=None))
+
+    run_pipeline("text", mode="auto")
+
+    assert stages == []
+
+
+def test_threshold_is_inclusive(monkeypatch, stages):
+    with_nlp(monkeypatch, nlp_result(skills=AUTO_CONFIDENCE_THRESHOLD))
+
+    run_pipeline("text", mode="auto")
+
+    assert stages == []
+
+
+def test_fast_makes_no_llm_calls_at_any_confidence(monkeypatch, stages):
+    with_nlp(monkeypatch, nlp_result(skills=LOW, projects=LOW))
+
+    resume = run_pipeline("text", mode="fast")
+
+    assert stages == []
+    assert resume["skills"] == ["nlp skill"]
+
+
+def test_accurate_runs_every_stage_at_any_confidence(monkeypatch, stages):
+    with_nlp(monkeypatch, nlp_result())
+
+    run_pipeline("text", mode="accurate", concurrent=True)
+
+    assert sorted(stages) == sorted([
+        "parse_resume_llm", "refine_projects", "extract_projects", "examine_projects", "examine_resume"
+    ])
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        run_pipeline("text", mode="thorough")
@@ -0,0 +1,109 @@
+import io
+
+import pytest
+
+from extractor import pdf
+from extractor.pdf import assess_text_quality, extract_pdf
+from tests.test_extractor import RESUME_LINES, make_pdf
+
+# Enough text per page for the fast tier's quality check to pass.
+LONG_RESUME = RESUME_LINES + [
+    "Designed and shipped a payment reconciliation service in Go",
+    "Migrated batch jobs to Kubernetes and cut infrastructure cost",
+    "Mentored three junior engineers through code review",
+]
+
+
+def good_text(pages: int = 1) -> str:
+    return "\n".join(["EXPERIENCE"] + ["Built and operated backend services"] * 8 * pages)
+
+
+def test_quality_accepts_a_clean_text_layer():
+    quality = assess_text_quality(good_text(), 1)
+
+    assert quality["ok"]
+    assert quality["printable_ratio"] == 1.0
+    assert quality["section_headers"] == 1
+
+
+def test_quality_is_per_page():
+    assert assess_text_quality(good_text(), 1)["ok"]
+    assert not assess_text_quality(good_text(), 3)["ok"]
+
+
+def test_quality_rejects_garbled_text():
+    garbled = good_text().replace("e", "�")
+
+    quality = assess_text_quality(garbled, 1)
+
+    assert quality["printable_ratio"] < pdf.MIN_PRINTABLE_RATIO
+    assert not quality["ok"]
+
+
+def test_quality_requires_a_section_header():
+    quality = assess_text_quality(good_text().replace("EXPERIENCE", "Jane Doe"), 1)
+
+    assert quality["section_headers"] == 0
+    assert not quality["ok"]
+
+
+def test_quality_of_empty_text():
+    assert assess_text_quality("", 0) == {
+        "chars_per_page": 0.0, "printable_ratio": 0.0, "section_headers": 0, "ok": False
+    }
+
+
+@pytest.fixture
+def min_chars(monkeypatch):
+    monkeypatch.setattr(pdf, "MIN_CHARS_PER_PAGE", 100)
+
+
+def test_auto_keeps_a_good_fast_tier(min_chars):
+    document = extract_pdf(io.BytesIO(make_pdf([LONG_RESUME])), "auto")
+
+    assert document["engine"] == "pypdf2"
+    assert document["quality"]["ok"]
+    assert document["pages"] == 1
+
+
+def test_auto_falls_back_to_pdfminer(monkeypatch):
+    monkeypatch.setattr(pdf, "MIN_CHARS_PER_PAGE", 10_000)
+
+    document = extract_pdf(io.BytesIO(make_pdf([LONG_RESUME])), "auto")
+
+    assert document["engine"] == "pdfminer"
+    assert not document["quality"]["ok"]
+    assert "Acme Corp" in document["text"]
+
+
+def test_auto_falls_back_when_the_fast_tier_fails(monkeypatch, min_chars):
+    def broken(stream):
+        raise ValueError("bad xref")
+    monkeypatch.setattr(pdf, "_fast_extract", broken)
+
+    document = extract_pdf(io.BytesIO(make_pdf([LONG_RESUME])), "auto")
+
+    assert document["engine"] == "pdfminer"
+    assert document["quality"]["chars_per_page"] == 0
+
+
+@pytest.mark.parametrize("tier, engine", [("fast", "pypdf2"), ("pdfminer", "pdfminer")])
+def test_forced_tier_uses_one_engine(monkeypatch, tier, engine):
+    monkeypatch.setattr(pdf, "MIN_CHARS_PER_PAGE", 10_000)
+
+    document = extract_pdf(io.BytesIO(make_pdf([LONG_RESUME, ["PROJECTS"]])), tier)
+
+    assert document["engine"] == engine
+    assert document["quality"] is None
+    assert document["pages"] == 2
+
+
+def test_without_pypdf2_pdfminer_is_used(monkeypatch):
+    monkeypatch.setattr(pdf, "PdfReader", None)
+
+    assert extract_pdf(io.BytesIO(make_pdf([LONG_RESUME])), "auto")["engine"] == "pdfminer"
+
+
+def test_unknown_tier_is_rejected():
+    with pytest.raises(ValueError):
+        extract_pdf(io.BytesIO(b""), "ocr")
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+import pipeline
+from metrics import stage_fallbacks
+from tests.test_parse_modes import LLM_RESUME, nlp_result
+
+
+def fallbacks(stage: str, reason: str) -> float:
+    return stage_fallbacks._values.get((stage, reason), 0)
+
+
+@pytest.fixture
+def release():
+    # Stages blocked on this event are let go when the test ends.
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def timeouts(monkeypatch):
+    def set_timeouts(seconds: float) -> None:
+        monkeypatch.setattr(pipeline, "STAGE_TIMEOUTS", {name: seconds for name in pipeline.STAGE_TIMEOUTS})
+    return set_timeouts
+
+
+def stub_stages(monkeypatch, parse_llm) -> None:
+    monkeypatch.setattr(pipeline, "parse_resume_nlp", lambda text: nlp_result(skills=0.1))
+    monkeypatch.setattr(pipeline, "parse_resume_with_llm", parse_llm)
+
+
+def test_timed_out_stage_falls_back(monkeypatch, timeouts, release):
+    timeouts(0.2)
+    stub_stages(monkeypatch, lambda text: release.wait(5) and LLM_RESUME)
+    before = fallbacks("parse_resume_llm", "timeout")
+
+    started = time.monotonic()
+    resume = pipeline.run_pipeline("text", mode="auto")
+    elapsed = time.monotonic() - started
+
+    assert resume["skills"] == ["nlp skill"]
+    assert elapsed < 1.0
+    assert fallbacks("parse_resume_llm", "timeout") == before + 1
+
+
+def test_failed_stage_falls_back(monkeypatch):
+    def fail(text):
+        raise RuntimeError("backend down")
+    stub_stages(monkeypatch, fail)
+
+    resume = pipeline.run_pipeline("text", mode="auto")
+
+    assert resume["skills"] == ["nlp skill"]
+
+
+def test_stage_clock_starts_when_the_stage_runs(monkeypatch, timeouts):
+    # With one thread the second stage waits for the first; queueing
+    # must not eat into its own deadline.
+    monkeypatch.setattr(pipeline, "PIPELINE_MAX_WORKERS", 1)
+    timeouts(0.3)
+
+    def slow(value):
+        def run(*args, **kwargs):
+            time.sleep(0.2)
+            return value
+        return run
+
+    with pipeline._stage_pool() as pool:
+        first = pipeline._Stage(pool, "refine_projects", slow("first"))
+        second = pipeline._Stage(pool, "extract_projects", slow("second"))
+
+        assert first.result(fallback=None) == "first"
+        assert second.result(fallback=None) == "second"
+
+
+def test_stage_runs_with_a_call_deadline(monkeypatch, timeouts):
+    from LLM_PARSER import client
+
+    timeouts(0.5)
+    with pipeline._stage_pool() as pool:
+        stage = pipeline._Stage(pool, "refine_projects", client._remaining)
+        remaining = stage.result(fallback=None)
+
+    assert 0 < remaining <= 0.5
+
+
+def test_concurrent_requests_do_not_queue_behind_each_other(monkeypatch, timeouts):
+    timeouts(0.5)
+
+    def llm(text):
+        time.sleep(0.3)
+        return LLM_RESUME
+    stub_stages(monkeypatch, llm)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pipeline.run_pipeline("text", mode="auto")))
+        for _ in range(12)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    assert len(results) == 12
+    assert all(resume["skills"] == ["llm skill"] for resume in results)
+    assert elapsed < 1.5
+
+
+def test_request_does_not_wait_for_timed_out_stage(monkeypatch, timeouts, release):
+    timeouts(0.1)
+    finished = threading.Event()
+
+    def hangs(text):
+        release.wait(5)
+        finished.set()
+        return LLM_RESUME
+    stub_stages(monkeypatch, hangs)
+
+    pipeline.run_pipeline("text", mode="auto")
+
+    assert not finished.is_set()
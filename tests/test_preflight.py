@@ -0,0 +1,160 @@
+import threading
+
+import pytest
+
+from LLM_PARSER import preflight
+from LLM_PARSER.preflight import (
+    count_tokens,
+    fits_context,
+    size_max_tokens,
+    split_at_sections
+)
+
+
+class WordTokenizer:
+    """
+    One token per word; fails if two threads encode at once, like a
+    fast tokenizer's "Already borrowed".
+    """
+
+    def __init__(self):
+        self._busy = threading.Lock()
+
+    def encode(self, text, add_special_tokens=False):
+        if not self._busy.acquire(blocking=False):
+            raise RuntimeError("Already borrowed")
+        try:
+            return text.split()
+        finally:
+            self._busy.release()
+
+
+@pytest.fixture
+def tokenizer_state(monkeypatch):
+    # Each test starts with no tokenizer and no load in flight.
+    monkeypatch.setattr(preflight, "_tokenizer", None)
+    monkeypatch.setattr(preflight, "_tokenizer_thread", None)
+
+
+def test_estimate_is_used_while_the_tokenizer_loads(monkeypatch, tokenizer_state):
+    release = threading.Event()
+
+    def slow_load():
+        release.wait(5)
+        preflight._tokenizer = WordTokenizer()
+    monkeypatch.setattr(preflight, "load_tokenizer", slow_load)
+
+    assert count_tokens("one two three four five") == 6
+    release.set()
+    preflight._tokenizer_thread.join(5)
+
+    assert count_tokens("one two three four five") == 5
+
+
+def test_load_starts_only_once(monkeypatch, tokenizer_state):
+    loads = []
+    monkeypatch.setattr(preflight, "load_tokenizer", lambda: loads.append(1))
+
+    for _ in range(5):
+        count_tokens("text")
+    preflight._tokenizer_thread.join(5)
+
+    assert loads == [1]
+
+
+def test_failed_load_falls_back_to_estimate(monkeypatch, tokenizer_state):
+    import builtins
+
+    real_import = builtins.__import__
+
+    def no_transformers(name, *args, **kwargs):
+        if name == "transformers":
+            raise ImportError("no transformers")
+        return real_import(name, *args, **kwargs)
+    monkeypatch.setattr(builtins, "__import__", no_transformers)
+
+    assert preflight.load_tokenizer() is None
+    assert preflight._tokenizer is None
+
+
+def test_estimate_rounds_up():
+    assert count_tokens("") == 0
+    assert count_tokens("abcde") == 2
+
+
+def test_tokenizer_is_not_entered_concurrently(monkeypatch, tokenizer_state):
+    monkeypatch.setattr(preflight, "_tokenizer", WordTokenizer())
+    monkeypatch.setattr(preflight, "_tokenizer_thread", threading.current_thread())
+    errors = []
+
+    def count():
+        try:
+            for _ in range(200):
+                count_tokens("a b c " * 50)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=count) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+
+def test_fits_context_rejects_output_over_the_cap(monkeypatch):
+    monkeypatch.setattr(preflight, "LLM_MAX_OUTPUT_TOKENS", 100)
+    messages = [{"role": "user", "content": "x"}]
+
+    assert fits_context(messages, 76)
+    assert not fits_context(messages, 77)
+
+
+def test_fits_context_rejects_prompt_over_the_window(monkeypatch):
+    monkeypatch.setattr(preflight, "LLM_CONTEXT_TOKENS", 200)
+
+    assert fits_context([{"role": "user", "content": "x" * 400}], 10)
+    assert not fits_context([{"role": "user", "content": "x" * 800}], 10)
+
+
+def test_size_max_tokens_clamps(monkeypatch):
+    monkeypatch.setattr(preflight, "LLM_CONTEXT_TOKENS", 1000)
+    messages = [{"role": "user", "content": "x" * 400}]
+
+    assert size_max_tokens("test", messages, 1) == preflight.LLM_MIN_OUTPUT_TOKENS
+    assert size_max_tokens("test", messages, 100) == 130
+    assert size_max_tokens("test", messages, 10_000) == 1000 - 108
+
+
+def is_header(line: str) -> bool:
+    return line.isupper()
+
+
+def test_split_at_header_nearest_the_middle():
+    text = "\n".join(["EXPERIENCE", "a", "b", "c", "PROJECTS", "d", "e", "SKILLS", "f"])
+
+    first, second = split_at_sections(text, is_header)
+
+    assert first.split("\n") == ["EXPERIENCE", "a", "b", "c"]
+    assert second.split("\n")[0] == "PROJECTS"
+
+
+def test_split_without_headers_cuts_at_the_middle_line():
+    first, second = split_at_sections("\n".join("abcdef"), is_header)
+
+    assert (first, second) == ("a\nb\nc", "d\ne\nf")
+
+
+def test_split_ignores_headers_far_from_the_middle():
+    text = "\n".join(["a", "HEADER", "b", "c", "d", "e", "f", "g"])
+
+    first, second = split_at_sections(text, is_header)
+
+    assert first.split("\n") == ["a", "HEADER", "b", "c"]
+
+
+def test_split_drops_blank_lines_and_stops_at_one_line():
+    assert split_at_sections("only line\n\n  \n", is_header) == ()
+    assert split_at_sections("", is_header) == ()
+    assert split_at_sections("a\n\nb", is_header) == ("a", "b")
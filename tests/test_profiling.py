@@ -0,0 +1,136 @@
+import json
+import os
+import pstats
+import threading
+import tracemalloc
+
+import pytest
+
+import profiling
+from profiling import _prune, profile_request
+
+
+@pytest.fixture
+def profile_dir(monkeypatch, tmp_path):
+    directory = tmp_path / "profiles"
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(directory))
+    return directory
+
+
+def make_profile(directory, name: str, mtime: float, size: int = 10) -> None:
+    for ext in (".prof", ".json"):
+        path = directory / (name + ext)
+        path.write_bytes(b"x" * size)
+        os.utime(path, (mtime, mtime))
+
+
+def names(directory) -> set:
+    return {os.path.splitext(entry)[0] for entry in os.listdir(directory)}
+
+
+def test_prune_keeps_the_newest_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_MAX_FILES", 2)
+    for i, name in enumerate(["old", "middle", "new"]):
+        make_profile(tmp_path, name, mtime=1000 + i)
+    (tmp_path / "notes.txt").write_text("kept")
+
+    _prune(str(tmp_path))
+
+    assert names(tmp_path) == {"middle", "new", "notes"}
+
+
+def test_prune_keeps_within_max_bytes(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_MAX_BYTES", 250)
+    for i, name in enumerate(["old", "middle", "new"]):
+        make_profile(tmp_path, name, mtime=1000 + i, size=60)
+
+    _prune(str(tmp_path))
+
+    assert names(tmp_path) == {"middle", "new"}
+
+
+def test_prune_removes_a_half_written_pair(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_MAX_FILES", 1)
+    make_profile(tmp_path, "new", mtime=2000)
+    (tmp_path / "orphan.prof").write_bytes(b"x")
+    os.utime(tmp_path / "orphan.prof", (1000, 1000))
+
+    _prune(str(tmp_path))
+
+    assert names(tmp_path) == {"new"}
+
+
+def test_profile_writes_stats_and_report(profile_dir):
+    with profile_request(force=True, filename="resume.pdf", mode="fast") as run:
+        run.digest = "ab" * 32
+        sum(range(1000))
+
+    assert run.name.endswith("-" + "ab" * 8)
+    stats = pstats.Stats(str(profile_dir / (run.name + ".prof")))
+    assert stats.total_calls > 0
+
+    report = json.loads((profile_dir / (run.name + ".json")).read_text())
+    assert report["digest"] == "ab" * 32
+    assert report["filename"] == "resume.pdf"
+    assert report["mode"] == "fast"
+    assert report["error"] is None
+    assert report["elapsed_seconds"] >= 0
+
+
+def test_memory_is_not_traced_by_default(profile_dir):
+    with profile_request(force=True) as run:
+        assert not tracemalloc.is_tracing()
+
+    report = json.loads((profile_dir / (run.name + ".json")).read_text())
+    assert report["peak_memory_bytes"] is None
+    assert report["top_allocations"] is None
+
+
+def test_traced_memory_is_reported(profile_dir):
+    with profile_request(force=True, trace_memory=True) as run:
+        data = [bytes(1024) for _ in range(100)]
+
+    assert not tracemalloc.is_tracing()
+    report = json.loads((profile_dir / (run.name + ".json")).read_text())
+    assert report["peak_memory_bytes"] >= 100 * 1024
+    assert report["top_allocations"]
+    del data
+
+
+def test_failed_block_is_recorded_and_reraised(profile_dir):
+    with pytest.raises(ValueError):
+        with profile_request(force=True) as run:
+            raise ValueError("bad upload")
+
+    report = json.loads((profile_dir / (run.name + ".json")).read_text())
+    assert report["error"] == "ValueError('bad upload')"
+
+
+def test_unrequested_request_is_not_profiled(monkeypatch, profile_dir):
+    monkeypatch.setattr(profiling, "PROFILE_ALLOW_REQUESTS", False)
+    monkeypatch.setattr(profiling, "PROFILE_SAMPLE_RATE", 0)
+
+    with profile_request(requested=True) as run:
+        assert run is None
+    assert not profile_dir.exists()
+
+
+def test_only_one_request_is_profiled_at_a_time(profile_dir):
+    inside, release = threading.Event(), threading.Event()
+
+    def first():
+        with profile_request(force=True):
+            inside.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    inside.wait(5)
+    try:
+        with profile_request(force=True) as run:
+            assert run is None
+    finally:
+        release.set()
+        thread.join()
+
+    assert len(os.listdir(profile_dir)) == 2
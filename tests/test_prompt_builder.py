@@ -0,0 +1,152 @@
+import logging
+import threading
+
+import pytest
+
+from LLM_PARSER import preflight, prompt_builder
+from LLM_PARSER.prompt_builder import (
+    SAME_AS_NLP,
+    JsonPart,
+    ResumeTextPart,
+    TextPart,
+    build_prompt,
+    dedupe_against,
+    template
+)
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # 4 characters per token, without loading a tokenizer.
+    monkeypatch.setattr(preflight, "_tokenizer", None)
+    monkeypatch.setattr(preflight, "_tokenizer_thread", threading.current_thread())
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    def set_budget(tokens: int) -> None:
+        monkeypatch.setitem(prompt_builder.PROMPT_BUDGETS, "parse_resume", tokens)
+    return set_budget
+
+
+def test_template_drops_rules_and_repeated_blanks():
+    text = """
+        Extract projects.
+        -----------------
+
+
+        Return JSON.   
+    """
+
+    assert template(text) == "Extract projects.\n\nReturn JSON."
+
+
+def test_text_part_trims_from_the_end():
+    part = TextPart("first line\n\nsecond line\nthird line")
+
+    removed = part.trim(5)
+
+    assert part.render() == "first line\nsecond line"
+    assert removed == len("third line") + 1
+
+
+def test_text_part_cuts_a_long_last_line_to_the_minimum():
+    part = TextPart("x" * 200)
+
+    part.trim(1000)
+
+    assert part.render() == "x" * prompt_builder.MIN_STRING_CHARS
+
+
+RESUME = "\n".join([
+    "Jane Doe",
+    "jane@example.com",
+    "SUMMARY",
+    "Engineer with ten years of experience",
+    "SKILLS",
+    "Python",
+    "EDUCATION",
+    "BSc Computer Science",
+])
+
+
+def test_resume_part_drops_unextracted_sections_only():
+    part = ResumeTextPart(RESUME)
+
+    part.trim(10_000)
+
+    assert part.render() == "SKILLS\nPython"
+
+
+def test_resume_part_drops_only_as_much_as_needed():
+    part = ResumeTextPart(RESUME)
+
+    part.trim(5)
+
+    assert part.render().startswith("SUMMARY\n")
+    assert "jane@example.com" not in part.render()
+
+
+def test_resume_part_without_known_sections_is_kept():
+    part = ResumeTextPart("Jane Doe\nEngineer at Acme")
+
+    assert part.trim(10_000) == 0
+    assert part.priority == 2
+
+
+def test_json_part_halves_the_longest_string():
+    part = JsonPart({"name": "A", "description": "d" * 300})
+
+    part.trim(10)
+
+    assert part.data["description"] == "d" * 150 + "…"
+    assert part.data["name"] == "A"
+
+
+def test_json_part_does_not_cut_short_strings():
+    part = JsonPart(["x" * prompt_builder.MIN_STRING_CHARS])
+
+    assert part.trim(100) == 0
+
+
+def test_dedupe_replaces_values_equal_to_the_reference():
+    nlp = {"skills": ["Python"], "projects": [], "achievements": ["Won"]}
+    llm = {"skills": ["Python"], "projects": [], "achievements": ["Lost"], "experience": []}
+
+    assert dedupe_against(nlp, llm) == {
+        "skills": SAME_AS_NLP,
+        "projects": [],
+        "achievements": ["Lost"],
+        "experience": []
+    }
+    assert dedupe_against(nlp, "not a dict") == "not a dict"
+
+
+def test_prompt_within_budget_is_unchanged(budget):
+    budget(1000)
+
+    prompt = build_prompt("parse_resume", "Text:\n{text}\nNote: {note}", text=TextPart("a\nb"), note="keep")
+
+    assert prompt == "Text:\na\nb\nNote: keep"
+
+
+def test_lowest_priority_part_is_trimmed_first(budget):
+    budget(60)
+    low = TextPart("\n".join(f"low line {i}" for i in range(30)), priority=0)
+    high = TextPart("\n".join(f"high line {i}" for i in range(10)), priority=1)
+
+    prompt = build_prompt("parse_resume", "{low}\n{high}", low=low, high=high)
+
+    assert preflight.count_tokens(prompt) <= 60
+    assert "high line 9" in prompt
+    assert "low line 29" not in prompt
+
+
+def test_untrimmable_prompt_is_sent_whole(budget, caplog):
+    budget(5)
+
+    with caplog.at_level(logging.WARNING):
+        prompt = build_prompt("parse_resume", "{text}", text="x" * 100)
+
+    assert prompt == "x" * 100
+    assert "cannot be trimmed" in caplog.text
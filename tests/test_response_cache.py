@@ -0,0 +1,72 @@
+import pytest
+
+from LLM_PARSER import response_cache
+from LLM_PARSER.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "llm.sqlite3"), ttl=3600, max_entries=100)
+
+
+def test_hit_and_miss_are_counted(cache):
+    cache.put("k", "model", "reply")
+
+    assert cache.get("k") == "reply"
+    assert cache.get("other") is None
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_rejected_row_is_a_miss_and_is_deleted(cache):
+    cache.put("k", "model", "garbage")
+
+    assert cache.get("k", validate=lambda content: content != "garbage") is None
+    assert cache.stats() == {"hits": 0, "misses": 1}
+    assert cache.get("k") is None
+
+
+def test_accepted_row_is_a_hit(cache):
+    cache.put("k", "model", "reply")
+
+    assert cache.get("k", validate=lambda content: True) == "reply"
+    assert cache.stats() == {"hits": 1, "misses": 0}
+
+
+def test_expired_row_is_a_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm.sqlite3"), ttl=-1, max_entries=100)
+    cache.put("k", "model", "reply")
+
+    assert cache.get("k") is None
+
+
+def test_eviction_keeps_most_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm.sqlite3"), ttl=3600, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, "model", key)
+    cache.get("a")
+
+    cache.evict()
+
+    assert cache.get("a") == "a"
+    assert cache.get("c") == "c"
+    assert cache.get("b") is None
+
+
+def test_eviction_runs_every_n_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, "_EVICT_EVERY", 2)
+    cache = ResponseCache(str(tmp_path / "llm.sqlite3"), ttl=3600, max_entries=1)
+
+    cache.put("a", "model", "a")
+    cache.put("b", "model", "b")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "b"
+
+
+def test_key_depends_on_model_messages_and_params():
+    messages = [{"role": "user", "content": "hi"}]
+    key = ResponseCache.make_key("m", messages, temperature=0)
+
+    assert key == ResponseCache.make_key("m", list(messages), temperature=0)
+    assert key != ResponseCache.make_key("other", messages, temperature=0)
+    assert key != ResponseCache.make_key("m", messages, temperature=0.5)
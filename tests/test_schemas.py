@@ -0,0 +1,79 @@
+import pytest
+
+from LLM_PARSER.schemas import (
+    Decision,
+    ParsedResume,
+    ProjectList,
+    ProjectNames,
+    conforms,
+    response_schema,
+    validate_response
+)
+
+
+def test_decision_missing_required_reason_is_rejected():
+    assert validate_response('{"selected_approach": "llm_extraction"}', Decision) is None
+
+
+@pytest.mark.parametrize("text", [
+    '{"reason": "looks right"}',
+    '{"selected_approach": "both", "reason": "x"}',
+    '{"selected_approach": "llm_extraction", "reason": 5}',
+    "no verdict here",
+])
+def test_invalid_decisions_are_rejected(text):
+    assert validate_response(text, Decision) is None
+
+
+@pytest.mark.parametrize("text", [
+    'Example: {"x": 1}\nVerdict: {"selected_approach": "nlp_heuristic", "reason": "grounded"}',
+    "{'selected_approach': 'nlp_heuristic', 'reason': 'grounded',}",
+])
+def test_decision_is_recovered_from_prose_and_python_literals(text):
+    assert validate_response(text, Decision) == {"selected_approach": "nlp_heuristic", "reason": "grounded"}
+
+
+def test_optional_fields_are_filled_with_empty_values():
+    data = validate_response('{"skills": ["Python"]}', ParsedResume)
+
+    assert data == {"experience": [], "projects": [], "skills": ["Python"], "achievements": []}
+
+
+def test_invalid_list_entries_are_dropped_not_the_reply():
+    text = '{"projects": [{"name": "A", "techstack": ["Go"]}, {"name": ["not", "a", "string"]}]}'
+
+    data = validate_response(text, ProjectList)
+
+    assert [project["name"] for project in data["projects"]] == ["A"]
+
+
+def test_tech_stack_alias_is_accepted():
+    data = validate_response('{"projects": [{"name": "A", "tech_stack": ["Go"]}]}', ProjectList)
+
+    assert data["projects"][0]["techstack"] == ["Go"]
+
+
+def test_unknown_entry_keys_are_kept():
+    data = validate_response('{"projects": [{"name": "A", "url": "x"}]}', ProjectList)
+
+    assert data["projects"][0]["url"] == "x"
+
+
+def test_response_schema_names_the_model():
+    name, schema = response_schema(ProjectNames)
+
+    assert name == "ProjectNames"
+    assert schema["properties"]["names"]["type"] == "array"
+
+
+@pytest.mark.parametrize("text, model, expected", [
+    ('{"names": ["A"]}', ProjectNames, True),
+    ('{"names": []}', ProjectNames, True),
+    ('{"other": 1}', ProjectNames, False),
+    ('{"names": "A"}', ProjectNames, False),
+    ("garbage", ParsedResume, False),
+    ('{"selected_approach": "llm_extraction"}', Decision, False),
+    ('{"selected_approach": "llm_extraction", "reason": "x"}', Decision, True),
+])
+def test_conforms(text, model, expected):
+    assert conforms(text, model) is expected
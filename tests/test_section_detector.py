@@ -0,0 +1,60 @@
+import pytest
+
+from NLP_PARSER.section_detector import detect_sections, match_section_header
+
+
+@pytest.mark.parametrize("line, section", [
+    ("Skills", "skills"),
+    ("WORK EXPERIENCE", "experience"),
+    ("Projects:", "projects"),
+    ("PROJECTS / PERSONAL WORK", "projects"),
+    ("Educat1on", "education"),
+    ("EDUCAT1ON", "education"),
+    ("PR0JECTS", "projects"),
+    ("Porjects", "projects"),
+    ("Projcts", "projects"),
+    ("Experiance", "experience"),
+    ("Achievments", "achievements"),
+    ("Technical Skils", "skills"),
+])
+def test_headers_and_typos_match(line, section):
+    assert match_section_header(line) == section
+
+
+@pytest.mark.parametrize("line", [
+    "Objective-C",
+    "Products",
+    "Protects",
+    "Tool",
+    "Prefile",
+    "Summery",
+    "Built a budgeting tool with React",
+])
+def test_body_lines_are_not_headers(line):
+    assert match_section_header(line) is None
+
+
+def test_skill_line_does_not_split_section():
+    text = "\n".join(["Skills", "Python, Swift", "Objective-C", "Experience", "Engineer at Acme"])
+
+    sections = detect_sections(text)
+
+    assert sections["skills"] == "Python, Swift\nObjective-C"
+    assert "summary" not in sections
+
+
+def test_taxonomy_is_only_consulted_for_fuzzy_matches(monkeypatch):
+    from NLP_PARSER import section_detector
+
+    lookups = []
+
+    class Taxonomy:
+        def find_all(self, line):
+            lookups.append(line)
+            return []
+    monkeypatch.setattr(section_detector, "get_taxonomy", Taxonomy)
+
+    for line in ["Skills", "PROJECTS / PERSONAL WORK", "Python Developer", "Acme Corp", "Porjects"]:
+        match_section_header(line)
+
+    assert lookups == ["Porjects"]
@@ -0,0 +1,43 @@
+from NLP_PARSER.projects import extract_tech_stack, match_tech_stack
+from NLP_PARSER.skills import extract_skills, match_skills
+
+
+def test_skills_are_canonical_sorted_and_unique():
+    text = "Languages: C++, C#, C, Golang, JavaScript (ES6), reactjs, node.js\nAlso: Go, React"
+
+    assert extract_skills(text) == ["C", "C#", "C++", "Go", "JavaScript", "Node.js", "React"]
+
+
+def test_skills_do_not_match_inside_words():
+    assert extract_skills("Cobra, ongoing, cgo, Javanese") == []
+
+
+def test_match_skills_reports_aliases_and_offsets():
+    text = "Skilled in golang and React.js"
+
+    matches = match_skills(text)
+
+    # "." ends a token, so "react" matches inside "react.js" as well.
+    assert [(m["skill"], m["alias"], text[m["start"]:m["end"]]) for m in matches] == [
+        ("Go", "golang", "golang"),
+        ("React", "react", "React"),
+        ("React", "react.js", "React.js"),
+    ]
+    assert "programming_languages" in matches[0]["categories"]
+
+
+def test_empty_text_has_no_skills():
+    assert match_skills("") == []
+    assert extract_skills(None) == []
+
+
+def test_tech_stack_skips_non_technical_skills():
+    text = "Built with React and Node.js; strong communication and team leadership"
+
+    assert extract_tech_stack(text) == ["Node.js", "React"]
+
+
+def test_tech_stack_keeps_the_first_occurrence():
+    text = "Python service, then more Python"
+
+    assert match_tech_stack(text) == [("Python", 0, 6)]
@@ -0,0 +1,137 @@
+import os
+
+import pytest
+
+from NLP_PARSER import taxonomy
+from NLP_PARSER.taxonomy import SkillTaxonomy, build_index, get_taxonomy, write_index
+
+TSV = "\n".join([
+    "# comment",
+    "Python\tprogramming_languages\tpython3|py3",
+    "Go\tprogramming_languages\tgolang",
+    "Docker\tdevops\t",
+    "Docker\tcloud\tdocker compose",
+    "",
+])
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "taxonomy.tsv"
+    path.write_text(TSV, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def fresh(monkeypatch, source, tmp_path):
+    # Point the shared taxonomy at the test TSV and a private index.
+    index = tmp_path / "index" / "taxonomy.idx"
+    monkeypatch.setattr(taxonomy, "SKILL_TAXONOMY_PATH", str(source))
+    monkeypatch.setattr(taxonomy, "SKILL_TAXONOMY_INDEX_PATH", str(index))
+    monkeypatch.setattr(taxonomy, "_taxonomy", None)
+    return index
+
+
+def test_find_all_resolves_aliases_to_canonicals(source):
+    skills = SkillTaxonomy(build_index(str(source)))
+
+    matches = skills.find_all("Python3, Golang and Docker Compose")
+
+    assert [(m["skill"], m["alias"]) for m in matches] == [
+        ("Python", "python3"),
+        ("Go", "golang"),
+        ("Docker", "docker"),
+        ("Docker", "docker compose"),
+    ]
+    assert matches[-1]["categories"] == ["devops", "cloud"]
+    assert len(skills) == 3
+
+
+def test_mmap_index_matches_in_memory_build(source, tmp_path):
+    index = tmp_path / "taxonomy.idx"
+    write_index(str(source), str(index))
+
+    loaded = SkillTaxonomy.load(str(index))
+
+    assert loaded.find_all("py3 and go") == SkillTaxonomy(build_index(str(source))).find_all("py3 and go")
+    assert [loaded.canonical(cid) for cid in range(len(loaded))] == ["Python", "Go", "Docker"]
+
+
+def test_index_is_built_once_and_reused(fresh):
+    get_taxonomy()
+    built = os.stat(fresh).st_mtime_ns
+    taxonomy._taxonomy = None
+
+    get_taxonomy()
+
+    assert os.stat(fresh).st_mtime_ns == built
+
+
+def test_changed_source_rebuilds_the_index(fresh, source):
+    assert get_taxonomy().find_all("rust") == []
+    source.write_text(TSV + "Rust\tprogramming_languages\trustlang\n", encoding="utf-8")
+    taxonomy._taxonomy = None
+
+    assert [m["skill"] for m in get_taxonomy().find_all("rust")] == ["Rust"]
+
+
+@pytest.mark.parametrize("contents", [b"", b"SKIX", b"not an index at all"])
+def test_corrupt_index_is_rebuilt(fresh, contents):
+    fresh.parent.mkdir()
+    fresh.write_bytes(contents)
+
+    assert [m["skill"] for m in get_taxonomy().find_all("golang")] == ["Go"]
+
+
+def test_unwritable_index_is_used_from_memory(monkeypatch, fresh):
+    def fail(source_path, index_path):
+        raise PermissionError("read-only")
+    monkeypatch.setattr(taxonomy, "write_index", fail)
+
+    assert [m["skill"] for m in get_taxonomy().find_all("py3")] == ["Python"]
+    assert not fresh.exists()
+
+
+def test_malformed_row_is_rejected(tmp_path):
+    path = tmp_path / "bad.tsv"
+    path.write_text("Python\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="bad.tsv:1"):
+        build_index(str(path))
+
+
+def test_shipped_taxonomy_has_no_conflicting_aliases(caplog):
+    canonicals, categories, canonical_categories, aliases = taxonomy.read_taxonomy(
+        taxonomy.SKILL_TAXONOMY_PATH
+    )
+
+    assert "already maps to" not in caplog.text
+    assert all(canonical_categories)
+    assert all(aliases[name.lower()] == cid for cid, name in enumerate(canonicals))
+
+
+def test_canonical_listed_twice_has_both_categories():
+    skills = SkillTaxonomy(build_index(taxonomy.SKILL_TAXONOMY_PATH))
+
+    (match,) = skills.find_all("ES6")
+
+    assert match["skill"] == "JavaScript"
+    assert match["categories"] == ["programming_languages", "frontend_technologies"]
+
+
+def test_first_canonical_keeps_a_shared_alias(tmp_path, caplog):
+    path = tmp_path / "taxonomy.tsv"
+    path.write_text("Go\tprogramming_languages\tgo lang\nGoLand\ttools_platforms\tgo lang\n", encoding="utf-8")
+
+    skills = SkillTaxonomy(build_index(str(path)))
+
+    assert {(m["skill"], m["alias"]) for m in skills.find_all("go lang")} == {("Go", "go"), ("Go", "go lang")}
+    assert "already maps to 'Go'" in caplog.text
+
+
+def test_index_header_records_the_source(source):
+    skills = SkillTaxonomy(build_index(str(source)))
+
+    assert skills.header["version"] == taxonomy.INDEX_VERSION
+    assert skills.header["source_sha256"] == taxonomy._file_sha256(str(source))
+    assert skills.header["aliases"] == 7
@@ -0,0 +1,13 @@
+"""
+WSGI entry point:
+
+    gunicorn wsgi:app
+
+Importing app.py starts nothing; this module starts each worker
+process's job workers and tokenizer load before it serves. Do not use
+gunicorn's --preload: threads started in the master do not survive the
+fork into workers.
+"""
+from app import app, start_background
+
+start_background()